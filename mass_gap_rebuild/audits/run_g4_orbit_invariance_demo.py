@@ -10,11 +10,15 @@ from __future__ import annotations
 
 import csv
 import json
+import sys
 from dataclasses import dataclass, asdict
 from pathlib import Path
 
 import numpy as np
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from lattice import avg_plaquette, gauge_transform, random_gauge_field, random_su2, wilson_loop  # noqa: E402
+
 
 ROOT = Path(__file__).resolve().parents[1]
 REPORTS = ROOT / "reports"
@@ -41,100 +45,6 @@ class CaseRow:
     abs_diff_w33: float
 
 
-def su2_from_quaternion(q: np.ndarray) -> np.ndarray:
-    """Map normalized quaternion q=(a,b,c,d) to SU(2) matrix."""
-    a, b, c, d = q
-    return np.array(
-        [
-            [a + 1j * d, c + 1j * b],
-            [-c + 1j * b, a - 1j * d],
-        ],
-        dtype=np.complex128,
-    )
-
-
-def random_su2(rng: np.random.Generator) -> np.ndarray:
-    q = rng.normal(size=4)
-    q = q / np.linalg.norm(q)
-    return su2_from_quaternion(q)
-
-
-def generate_links(L: int, dims: int, rng: np.random.Generator) -> np.ndarray:
-    shape = (L,) * dims + (dims, 2, 2)
-    U = np.zeros(shape, dtype=np.complex128)
-    for idx in np.ndindex((L,) * dims):
-        for mu in range(dims):
-            U[idx + (mu,)] = random_su2(rng)
-    return U
-
-
-def generate_gauge_field(L: int, dims: int, rng: np.random.Generator) -> np.ndarray:
-    shape = (L,) * dims + (2, 2)
-    G = np.zeros(shape, dtype=np.complex128)
-    for idx in np.ndindex((L,) * dims):
-        G[idx] = random_su2(rng)
-    return G
-
-
-def shift_idx(idx: tuple[int, ...], mu: int, step: int, L: int) -> tuple[int, ...]:
-    out = list(idx)
-    out[mu] = (out[mu] + step) % L
-    return tuple(out)
-
-
-def gauge_transform_links(U: np.ndarray, G: np.ndarray, L: int, dims: int) -> np.ndarray:
-    U2 = np.zeros_like(U)
-    for idx in np.ndindex((L,) * dims):
-        gx = G[idx]
-        for mu in range(dims):
-            xp = shift_idx(idx, mu, 1, L)
-            U2[idx + (mu,)] = gx @ U[idx + (mu,)] @ G[xp].conj().T
-    return U2
-
-
-def plaquette_trace(U: np.ndarray, x: tuple[int, ...], mu: int, nu: int, L: int) -> complex:
-    x_mu = shift_idx(x, mu, 1, L)
-    x_nu = shift_idx(x, nu, 1, L)
-    U1 = U[x + (mu,)]
-    U2 = U[x_mu + (nu,)]
-    U3 = U[x_nu + (mu,)].conj().T
-    U4 = U[x + (nu,)].conj().T
-    return np.trace(U1 @ U2 @ U3 @ U4)
-
-
-def avg_plaquette(U: np.ndarray, L: int, dims: int) -> float:
-    vals = []
-    for x in np.ndindex((L,) * dims):
-        for mu in range(dims):
-            for nu in range(mu + 1, dims):
-                vals.append(np.real(plaquette_trace(U, x, mu, nu, L)) / 2.0)
-    return float(np.mean(vals))
-
-
-def wilson_rect_plane01(U: np.ndarray, L: int, dims: int, R: int, T: int) -> float:
-    """Average rectangular Wilson loop in plane (0,1)."""
-    if dims < 2:
-        raise ValueError("Need dims >= 2")
-    vals = []
-    for x in np.ndindex((L,) * dims):
-        W = np.eye(2, dtype=np.complex128)
-        cur = x
-        for _ in range(R):
-            W = W @ U[cur + (0,)]
-            cur = shift_idx(cur, 0, 1, L)
-        for _ in range(T):
-            W = W @ U[cur + (1,)]
-            cur = shift_idx(cur, 1, 1, L)
-        for _ in range(R):
-            cur = shift_idx(cur, 0, -1, L)
-            W = W @ U[cur + (0,)].conj().T
-        for _ in range(T):
-            cur = shift_idx(cur, 1, -1, L)
-            W = W @ U[cur + (1,)].conj().T
-        vals.append(np.real(np.trace(W)) / 2.0)
-    return float(np.mean(vals))
-
-
 def run_cases() -> list[CaseRow]:
     rows: list[CaseRow] = []
     # Keep this small and fast.
@@ -147,16 +57,17 @@ def run_cases() -> list[CaseRow]:
         rng = np.random.default_rng(seed)
         for L in L_values:
             for i in range(n_cfg):
-                U = generate_links(L, dims, rng)
-                G = generate_gauge_field(L, dims, rng)
-                U2 = gauge_transform_links(U, G, L, dims)
-
-                p1 = avg_plaquette(U, L, dims)
-                p2 = avg_plaquette(U2, L, dims)
-                w22_1 = wilson_rect_plane01(U, L, dims, 2, 2)
-                w22_2 = wilson_rect_plane01(U2, L, dims, 2, 2)
-                w33_1 = wilson_rect_plane01(U, L, dims, 3, 3)
-                w33_2 = wilson_rect_plane01(U2, L, dims, 3, 3)
+                U = random_su2(rng, "matrix", (L,) * dims + (dims,))
+                G = random_gauge_field(L, rng, "matrix", dims)
+                U2 = gauge_transform(U, G)
+
+                p1 = avg_plaquette(U)
+                p2 = avg_plaquette(U2)
+                # R along direction 0, T along direction 1
+                w22_1 = wilson_loop(U, 2, 2, 0, 1)
+                w22_2 = wilson_loop(U2, 2, 2, 0, 1)
+                w33_1 = wilson_loop(U, 3, 3, 0, 1)
+                w33_2 = wilson_loop(U2, 3, 3, 0, 1)
 
                 rows.append(
                     CaseRow(
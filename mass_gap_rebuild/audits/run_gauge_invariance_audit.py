@@ -6,10 +6,13 @@ from __future__ import annotations
 import csv
 import json
 import math
+import sys
 from dataclasses import dataclass, asdict
 from pathlib import Path
 from statistics import mean
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from lattice import list_configs, read_header  # noqa: E402
 
 ROOT = Path(__file__).resolve().parents[1]
 DATA = ROOT / "data"
@@ -19,6 +22,7 @@ L2 = DATA / "L2_gauge_covariant.csv"
 L4 = DATA / "L4_continuum_scaling.csv"
 L5 = DATA / "L5_glueball_spectrum.csv"
 WILSON_PROXY = DATA / "delta_wilson_creutz_proxy.csv"
+CONFIG_DIR = DATA / "su2_configs"
 
 OUT_JSON = REPORTS / "gauge_invariance_audit_report.json"
 OUT_MD = REPORTS / "gauge_invariance_audit_report.md"
@@ -138,6 +142,9 @@ def check_g4_orbit_blocker() -> GateResult:
     config_files = []
     for pattern in config_patterns:
         config_files.extend(DATA.glob(pattern))
+    # Measured configurations only: checkpoint link files are chain state, not an ensemble.
+    if CONFIG_DIR.is_dir():
+        config_files.extend(p for p in list_configs(CONFIG_DIR) if not read_header(p).get("checkpoint"))
     return GateResult(
         gate="G4_orbit_invariance",
         status="READY" if config_files else "BLOCKED",
@@ -152,7 +159,7 @@ def check_g4_orbit_blocker() -> GateResult:
         details={
             "required_inputs": ["raw gauge-link configurations per run"],
             "found_files_count": len(config_files),
-            "found_files": [p.name for p in config_files],
+            "found_files": [str(p.relative_to(DATA)) for p in config_files],
         },
     )
 
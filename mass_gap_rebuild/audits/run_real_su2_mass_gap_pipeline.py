@@ -5,18 +5,79 @@ Produces:
 - ensemble observables (plaquette, Wilson loops, Creutz proxy)
 - gauge-orbit invariance receipt on measured observables
 - connected glueball-like correlator and effective-mass estimate
+- Polyakov loop and its correlator over all spatial separations
 """
 
 from __future__ import annotations
 
+import argparse
 import csv
 import json
-import math
-from dataclasses import dataclass, asdict
+import os
+import sys
+import time
+from dataclasses import asdict, dataclass, fields
 from pathlib import Path
 
 import numpy as np
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from lattice import (  # noqa: E402
+    TUNABLE_SWEEPS,
+    ArrayLog,
+    BinningAccumulator,
+    HMCLog,
+    PhaseTimer,
+    RecordLog,
+    Welford,
+    add_measurement_args,
+    add_storage_args,
+    add_update_args,
+    as_precision,
+    avg_plaquette,
+    block_size,
+    blocked_jackknife,
+    bootstrap_gevp_masses,
+    checkpoint_path,
+    config_path,
+    connected_correlator_from_ensemble,
+    correlator_matrix,
+    creutz_ratios,
+    effective_mass_cosh,
+    gauge_transform,
+    gevp_masses,
+    hmc_diagnostics,
+    hmc_options_from_args,
+    hmc_reversibility,
+    init_links,
+    integrated_autocorr,
+    link_layout,
+    load_checkpoint,
+    make_sweep,
+    max_autocorr_time,
+    measure_wilson_loops,
+    momentum_label,
+    plateau_mass,
+    plaquette_chain,
+    polyakov_correlator,
+    polyakov_loop,
+    precision_agreement,
+    radial_average,
+    random_gauge_field,
+    read_record_column,
+    read_records,
+    reunitarize,
+    save_checkpoint,
+    smeared_timeslice_operators,
+    smearing_from_args,
+    stream_path,
+    tune_eps,
+    unitarity_violation,
+    wilson_loop_plane01,
+    write_chrome_trace,
+    write_config,
+)
+
 
 ROOT = Path(__file__).resolve().parents[1]
 REPORTS = ROOT / "reports"
@@ -25,198 +86,27 @@ DATA = ROOT / "data"
 OUT_ENSEMBLE = REPORTS / "real_su2_ensemble_observables.csv"
 OUT_GAUGE = REPORTS / "real_su2_gauge_orbit_receipt.csv"
 OUT_CORR = REPORTS / "real_su2_glueball_correlator.csv"
+OUT_WILSON = REPORTS / "real_su2_wilson_loops.csv"
+OUT_SMEAR_BASIS = REPORTS / "real_su2_glueball_smearing_basis.csv"
+OUT_POLYAKOV = REPORTS / "real_su2_polyakov_correlator.csv"
 OUT_SUMMARY_JSON = REPORTS / "real_su2_pipeline_summary.json"
 OUT_SUMMARY_MD = REPORTS / "real_su2_pipeline_summary.md"
+# Wall times vary from run to run, so they stay out of the (reproducible) summary.
+OUT_TIMING_JSON = REPORTS / "real_su2_pipeline_timing.json"
+CONFIG_DIR = DATA / "su2_configs"
+CHECKPOINT_DIR = DATA / "checkpoints"
+STREAM_DIR = DATA / "streams"
 
+# Summary run_type per --sweep; the per-site and checkerboard sweeps are both Metropolis.
+RUN_TYPES = {
+    "site": "real_su2_metropolis",
+    "checkerboard": "real_su2_metropolis",
+    "heatbath": "real_su2_heatbath",
+    "hmc": "real_su2_hmc",
+}
 
-def su2_from_quaternion(q: np.ndarray) -> np.ndarray:
-    a, b, c, d = q
-    return np.array(
-        [
-            [a + 1j * d, c + 1j * b],
-            [-c + 1j * b, a - 1j * d],
-        ],
-        dtype=np.complex128,
-    )
-
-
-def random_su2(rng: np.random.Generator) -> np.ndarray:
-    q = rng.normal(size=4)
-    q = q / np.linalg.norm(q)
-    return su2_from_quaternion(q)
-
-
-def random_su2_near_identity(rng: np.random.Generator, eps: float) -> np.ndarray:
-    v = rng.normal(size=3)
-    n = np.linalg.norm(v)
-    if n < 1e-12:
-        axis = np.array([1.0, 0.0, 0.0])
-    else:
-        axis = v / n
-    theta = eps * rng.uniform(-1.0, 1.0)
-    a = math.cos(theta)
-    s = math.sin(theta)
-    b, c, d = axis * s
-    return su2_from_quaternion(np.array([a, b, c, d]))
-
-
-def shift_idx(x: tuple[int, int, int, int], mu: int, step: int, L: int) -> tuple[int, int, int, int]:
-    y = list(x)
-    y[mu] = (y[mu] + step) % L
-    return tuple(y)  # type: ignore[return-value]
-
-
-def init_links(L: int) -> np.ndarray:
-    U = np.zeros((L, L, L, L, 4, 2, 2), dtype=np.complex128)
-    I = np.eye(2, dtype=np.complex128)
-    U[...] = I
-    return U
-
-
-def staple(U: np.ndarray, x: tuple[int, int, int, int], mu: int, L: int) -> np.ndarray:
-    st = np.zeros((2, 2), dtype=np.complex128)
-    for nu in range(4):
-        if nu == mu:
-            continue
-        # forward staple
-        x_nu = shift_idx(x, nu, +1, L)
-        x_mu = shift_idx(x, mu, +1, L)
-        term_f = U[x + (nu,)] @ U[x_nu + (mu,)] @ U[x_mu + (nu,)].conj().T
-
-        # backward staple
-        x_mnu = shift_idx(x, nu, -1, L)
-        x_mnu_mu = shift_idx(x_mnu, mu, +1, L)
-        term_b = U[x_mnu + (nu,)].conj().T @ U[x_mnu + (mu,)] @ U[x_mnu_mu + (nu,)]
-        st += term_f + term_b
-    return st
-
-
-def metropolis_sweep(U: np.ndarray, beta: float, eps: float, rng: np.random.Generator) -> tuple[int, int]:
-    L = U.shape[0]
-    accepted = 0
-    total = 0
-    for x in np.ndindex((L, L, L, L)):
-        for mu in range(4):
-            x4 = (x[0], x[1], x[2], x[3])
-            old = U[x4 + (mu,)]
-            V = staple(U, x4, mu, L)
-            R = random_su2_near_identity(rng, eps)
-            cand = R @ old
-            dS = -(beta / 2.0) * np.real(np.trace((cand - old) @ V))
-            total += 1
-            if dS <= 0.0 or rng.uniform() < np.exp(-dS):
-                U[x4 + (mu,)] = cand
-                accepted += 1
-    return accepted, total
-
-
-def plaquette_trace(U: np.ndarray, x: tuple[int, int, int, int], mu: int, nu: int, L: int) -> complex:
-    x_mu = shift_idx(x, mu, +1, L)
-    x_nu = shift_idx(x, nu, +1, L)
-    return np.trace(
-        U[x + (mu,)] @ U[x_mu + (nu,)] @ U[x_nu + (mu,)].conj().T @ U[x + (nu,)].conj().T
-    )
-
-
-def avg_plaquette(U: np.ndarray) -> float:
-    L = U.shape[0]
-    vals = []
-    for x in np.ndindex((L, L, L, L)):
-        x4 = (x[0], x[1], x[2], x[3])
-        for mu in range(4):
-            for nu in range(mu + 1, 4):
-                vals.append(np.real(plaquette_trace(U, x4, mu, nu, L)) / 2.0)
-    return float(np.mean(vals))
-
-
-def wilson_loop_plane01(U: np.ndarray, R: int, T: int) -> float:
-    L = U.shape[0]
-    vals = []
-    for x in np.ndindex((L, L, L, L)):
-        cur = (x[0], x[1], x[2], x[3])
-        W = np.eye(2, dtype=np.complex128)
-        for _ in range(R):
-            W = W @ U[cur + (1,)]
-            cur = shift_idx(cur, 1, +1, L)
-        for _ in range(T):
-            W = W @ U[cur + (0,)]
-            cur = shift_idx(cur, 0, +1, L)
-        for _ in range(R):
-            cur = shift_idx(cur, 1, -1, L)
-            W = W @ U[cur + (1,)].conj().T
-        for _ in range(T):
-            cur = shift_idx(cur, 0, -1, L)
-            W = W @ U[cur + (0,)].conj().T
-        vals.append(np.real(np.trace(W)) / 2.0)
-    return float(np.mean(vals))
-
-
-def gauge_transform(U: np.ndarray, G: np.ndarray) -> np.ndarray:
-    L = U.shape[0]
-    out = np.zeros_like(U)
-    for x in np.ndindex((L, L, L, L)):
-        x4 = (x[0], x[1], x[2], x[3])
-        gx = G[x4]
-        for mu in range(4):
-            xp = shift_idx(x4, mu, +1, L)
-            out[x4 + (mu,)] = gx @ U[x4 + (mu,)] @ G[xp].conj().T
-    return out
-
-
-def random_gauge_field(L: int, rng: np.random.Generator) -> np.ndarray:
-    G = np.zeros((L, L, L, L, 2, 2), dtype=np.complex128)
-    for x in np.ndindex((L, L, L, L)):
-        G[x] = random_su2(rng)
-    return G
-
-
-def timeslice_spatial_plaquette_sum(U: np.ndarray, t: int) -> float:
-    L = U.shape[0]
-    # spatial directions 1,2,3
-    sdirs = [1, 2, 3]
-    total = 0.0
-    count = 0
-    for x1 in range(L):
-        for x2 in range(L):
-            for x3 in range(L):
-                x = (t, x1, x2, x3)
-                for i in range(3):
-                    for j in range(i + 1, 3):
-                        mu = sdirs[i]
-                        nu = sdirs[j]
-                        total += np.real(plaquette_trace(U, x, mu, nu, L)) / 2.0
-                        count += 1
-    return total / max(count, 1)
-
-
-def connected_correlator_from_ensemble(ops: np.ndarray) -> np.ndarray:
-    # ops shape: (n_cfg, Lt)
-    n_cfg, Lt = ops.shape
-    mu = np.mean(ops)
-    C = np.zeros(Lt, dtype=float)
-    for dt in range(Lt):
-        acc = 0.0
-        n = 0
-        for c in range(n_cfg):
-            for t in range(Lt):
-                acc += (ops[c, t] - mu) * (ops[c, (t + dt) % Lt] - mu)
-                n += 1
-        C[dt] = acc / max(n, 1)
-    return C
-
-
-def effective_mass_cosh(C: np.ndarray) -> np.ndarray:
-    vals = []
-    for t in range(1, len(C) - 1):
-        if C[t] <= 0:
-            vals.append(np.nan)
-            continue
-        arg = (C[t - 1] + C[t + 1]) / (2.0 * C[t])
-        if arg < 1.0:
-            vals.append(np.nan)
-            continue
-        vals.append(float(np.arccosh(arg)))
-    return np.array(vals)
+# Lowest non-zero spatial momenta, p = 2 pi / L_i along each spatial axis.
+P1_MOMENTA = ((1, 0, 0), (0, 1, 0), (0, 0, 1))
 
 
 @dataclass
@@ -226,63 +116,375 @@ class ObsRow:
     w11: float
     w22: float
     creutz_22: float
+    polyakov: float
 
 
 def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--lattice",
+        type=int,
+        nargs=4,
+        default=[6, 6, 6, 6],
+        metavar=("LT", "LX", "LY", "LZ"),
+        help="Lattice extents, time first; a long LT gives more timeslices for the correlators.",
+    )
+    add_update_args(parser)
+    add_measurement_args(parser)
+    parser.add_argument(
+        "--gevp-t0",
+        type=int,
+        default=1,
+        help="Reference timeslice of the GEVP over the smearing basis.",
+    )
+    parser.add_argument(
+        "--gevp-boot",
+        type=int,
+        default=200,
+        help="Bootstrap samples for the GEVP masses.",
+    )
+    add_storage_args(parser)
+    parser.add_argument(
+        "--precision-check",
+        action="store_true",
+        help="Run an independent chain at the other precision and compare plaquette means.",
+    )
+    parser.add_argument(
+        "--wilson-max",
+        type=int,
+        default=3,
+        help="Measure the full W(R, T) and Creutz-ratio grid up to R, T <= this.",
+    )
+    parser.add_argument(
+        "--config-dir",
+        type=Path,
+        default=CONFIG_DIR,
+        help="Directory receiving one binary configuration file per measurement.",
+    )
+    parser.add_argument(
+        "--no-save-configs",
+        action="store_true",
+        help="Do not write measured configurations to --config-dir.",
+    )
+    parser.add_argument(
+        "--checkpoint-every",
+        type=int,
+        default=10,
+        help="Checkpoint every N thermalization sweeps and every N measurements (0 disables).",
+    )
+    parser.add_argument(
+        "--checkpoint-dir",
+        type=Path,
+        default=CHECKPOINT_DIR,
+        help="Directory holding the run checkpoint.",
+    )
+    parser.add_argument(
+        "--stream-dir",
+        type=Path,
+        default=STREAM_DIR,
+        help="Directory receiving the per-configuration operator arrays and the running-statistics file.",
+    )
+    parser.add_argument(
+        "--flush-every",
+        type=int,
+        default=10,
+        help="Flush per-configuration records and running statistics to disk every N measurements.",
+    )
+    parser.add_argument(
+        "--trace",
+        type=Path,
+        default=None,
+        help="Also write every timed phase as a Chrome trace-event file (chrome://tracing, Perfetto).",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue bit-exactly from the checkpoint in --checkpoint-dir, if there is one.",
+    )
+    args = parser.parse_args()
+    run_start = time.perf_counter()
+    timer = PhaseTimer(trace=args.trace is not None)
+
     REPORTS.mkdir(parents=True, exist_ok=True)
     DATA.mkdir(parents=True, exist_ok=True)
 
-    rng = np.random.default_rng(121)
-    L = 6
+    seed = 121
+    rng = np.random.default_rng(seed)
+    shape = tuple(args.lattice)
+    Lt = shape[0]
     beta = 2.3
-    eps = 0.25
+    eps = args.eps
+    adapt = args.adaptive_eps and args.sweep in TUNABLE_SWEEPS
     n_therm = 25
     n_cfg = 30
     sweeps_between = 3
+    hmc_options = hmc_options_from_args(args)
+    hmc_log = HMCLog()  # equilibrium trajectories only
+    sweep = make_sweep(args.sweep, args.overrelax, **hmc_options, log=hmc_log)
+    # From the cold start HMC would reject nearly everything, so thermalize without accept/reject.
+    therm_sweep = make_sweep(args.sweep, args.overrelax, **hmc_options, accept_reject=False)
+
+    U = init_links(shape, args.links, precision=args.precision)
+    n_links = int(np.prod(shape)) * len(shape)  # link updates per sweep, for the throughput
+    acc_sum = tot_sum = 0  # measurement sweeps only
+    # HMC thermalizes without accept/reject, so only the other sweeps count here.
+    therm_acc = therm_tot = 0
+    therm_done = 0
+    n_measured = 0
+    smearing = smearing_from_args(args)
+    wilson_max = max(args.wilson_max, 2)
+    r_poly = radial_average(np.zeros(shape[1:]))[0]
+    # Running statistics of the scalar observables; per-config data is streamed to disk below.
+    scalar_names = ("plaquette", "creutz22", "polyakov_abs")
+    running = {name: Welford() for name in scalar_names}
+    binned = {name: BinningAccumulator() for name in scalar_names}
+    drift = 0.0  # largest max|U^dag U - 1| seen before a reunitarization or at a measurement
+
+    ckpt = checkpoint_path(args.checkpoint_dir, "real_su2_pipeline", shape, beta, seed)
+    params = {
+        "lattice_shape": list(shape),
+        "beta": beta,
+        "eps": eps,
+        "adaptive_eps": adapt,
+        "target_acceptance": args.target_acceptance if adapt else None,
+        "n_therm": n_therm,
+        "sweeps_between": sweeps_between,
+        "sweep": args.sweep,
+        "n_overrelax": args.overrelax,
+        "hmc": hmc_options if args.sweep == "hmc" else None,
+        "link_layout": args.links,
+        "precision": args.precision,
+        "reunitarize_every": args.reunitarize_every,
+        "wilson_max": args.wilson_max,
+        "loop_estimator": args.loop_estimator,
+        "multilevel_sub": args.multilevel_sub,
+        "smearing": smearing,
+    }
+    if args.resume and ckpt.exists():
+        U, state = load_checkpoint(ckpt, params)
+        rng.bit_generator.state = state["rng_state"]
+        acc_sum, tot_sum = state["accepted"], state["proposed"]
+        therm_acc, therm_tot = state["therm_accepted"], state["therm_proposed"]
+        therm_done = state["therm_done"]
+        eps = state["eps"]
+        hmc_log = HMCLog.from_state(state["hmc_log"])
+        sweep = make_sweep(args.sweep, args.overrelax, **hmc_options, log=hmc_log)
+        n_measured = state["n_measured"]
+        running = {name: Welford.from_state(st) for name, st in state["running"].items()}
+        binned = {name: BinningAccumulator.from_state(st) for name, st in state["binned"].items()}
+        drift = state["unitarity_drift_max"]
+        print(f"Resumed from {ckpt} at sweep {state['sweep_index']}")
+
+    # Append-only per-config records, truncated to the checkpointed count on resume.
+    tuning_path = stream_path(args.stream_dir, "real_su2_pipeline", shape, beta, seed, "eps_trajectory.csv")
+    tuning = None
+    if adapt:
+        tuning = RecordLog(tuning_path, ["sweep", "eps", "acceptance"], args.flush_every, keep=therm_done)
+    records = RecordLog(
+        OUT_ENSEMBLE, [f.name for f in fields(ObsRow)], flush_every=args.flush_every, keep=n_measured
+    )
+    row_shapes = {
+        "timeslice_ops": (Lt,),
+        "momentum_ops": (2 * len(P1_MOMENTA), Lt),
+        "basis_ops": (len(smearing["levels"]), Lt),
+        "wilson_tables": (wilson_max, wilson_max),
+        "polyakov_corrs": (len(r_poly),),
+    }
+    streams = {
+        name: ArrayLog(
+            stream_path(args.stream_dir, "real_su2_pipeline", shape, beta, seed, f"{name}.f64"),
+            row_shape,
+            flush_every=args.flush_every,
+            keep=n_measured,
+        )
+        for name, row_shape in row_shapes.items()
+    }
+    progress_path = stream_path(args.stream_dir, "real_su2_pipeline", shape, beta, seed, "progress.json")
+
+    def running_stats() -> dict:
+        return {
+            name: {
+                "n": running[name].n,
+                "mean": float(running[name].mean),
+                "std": float(running[name].std),
+                "binned_err": binned[name].error(),
+                "binned_tau_int": binned[name].tau_int(),
+            }
+            for name in scalar_names
+        }
+
+    def flush_streams() -> None:
+        for log in streams.values():
+            log.flush()
+        records.flush()
+        progress = {"n_measured": n_measured, "n_configs": n_cfg, **running_stats()}
+        progress_path.write_text(json.dumps(progress, indent=2))
+
+    def checkpoint() -> None:
+        if tuning is not None:
+            tuning.flush()
+        save_checkpoint(
+            ckpt,
+            U,
+            rng,
+            params=params,
+            L=shape,
+            beta=beta,
+            seed=seed,
+            sweep_index=therm_done + n_measured * sweeps_between,
+            accepted=acc_sum,
+            proposed=tot_sum,
+            therm_accepted=therm_acc,
+            therm_proposed=therm_tot,
+            therm_done=therm_done,
+            eps=eps,
+            hmc_log=hmc_log.state(),
+            n_measured=n_measured,
+            running={name: acc.state() for name, acc in running.items()},
+            binned={name: acc.state() for name, acc in binned.items()},
+            unitarity_drift_max=drift,
+        )
 
-    U = init_links(L)
+    def reunitarize_due(sweep_index: int) -> bool:
+        every = args.reunitarize_every
+        return every > 0 and sweep_index % every == 0
 
     # Thermalization
-    acc_sum = 0
-    tot_sum = 0
-    for _ in range(n_therm):
-        a, t = metropolis_sweep(U, beta=beta, eps=eps, rng=rng)
-        acc_sum += a
-        tot_sum += t
+    while therm_done < n_therm:
+        with timer.phase("thermalization", n_links):
+            a, t = therm_sweep(U, beta=beta, eps=eps, rng=rng)
+        if reunitarize_due(therm_done + 1):
+            with timer.phase("reunitarize"):
+                drift = max(drift, unitarity_violation(U))
+                reunitarize(U)
+        if args.sweep != "hmc":
+            therm_acc += a
+            therm_tot += t
+        therm_done += 1
+        if adapt:
+            tuning.append({"sweep": therm_done, "eps": eps, "acceptance": a / max(t, 1)})
+            eps = tune_eps(eps, a / max(t, 1), args.target_acceptance)
+        if args.checkpoint_every > 0 and therm_done % args.checkpoint_every == 0:
+            with timer.phase("checkpoint"):
+                checkpoint()
 
     # Measurement ensemble
-    rows: list[ObsRow] = []
-    timeslice_ops = []
-    for i in range(n_cfg):
-        for _ in range(sweeps_between):
-            a, t = metropolis_sweep(U, beta=beta, eps=eps, rng=rng)
+    for i in range(n_measured, n_cfg):
+        for j in range(sweeps_between):
+            with timer.phase("updates", n_links):
+                a, t = sweep(U, beta=beta, eps=eps, rng=rng)
             acc_sum += a
             tot_sum += t
-
-        p = avg_plaquette(U)
-        w11 = wilson_loop_plane01(U, 1, 1)
-        w22 = wilson_loop_plane01(U, 2, 2)
-        w12 = wilson_loop_plane01(U, 1, 2)
-        ratio = (w22 * w11) / max(w12 * w12, 1e-15)
-        creutz = -math.log(max(abs(ratio), 1e-15))
-        rows.append(ObsRow(cfg_index=i, plaquette=p, w11=w11, w22=w22, creutz_22=creutz))
-
-        op_t = np.array([timeslice_spatial_plaquette_sum(U, t0) for t0 in range(L)], dtype=float)
-        timeslice_ops.append(op_t)
-
-    # Save ensemble observables
-    with OUT_ENSEMBLE.open("w", newline="") as f:
-        writer = csv.DictWriter(f, fieldnames=list(asdict(rows[0]).keys()))
+            if reunitarize_due(n_therm + i * sweeps_between + j + 1):
+                with timer.phase("reunitarize"):
+                    drift = max(drift, unitarity_violation(U))
+                    reunitarize(U)
+        drift = max(drift, unitarity_violation(U))
+
+        M = as_precision(U, "double")  # observables are accumulated in float64
+        p = avg_plaquette(M)
+        start = time.perf_counter()
+        W = measure_wilson_loops(
+            M,
+            wilson_max,
+            estimator=args.loop_estimator,
+            beta=beta,
+            rng=rng,
+            n_sub=args.multilevel_sub,
+        )
+        streams["wilson_tables"].append(W)
+        creutz = float(creutz_ratios(W)[1, 1])
+        timer.record("wilson_loops", start)
+        with timer.phase("polyakov"):
+            streams["polyakov_corrs"].append(radial_average(polyakov_correlator(M))[1])
+        row = ObsRow(
+            cfg_index=i,
+            plaquette=p,
+            w11=float(W[0, 0]),
+            w22=float(W[1, 1]),
+            creutz_22=creutz,
+            polyakov=polyakov_loop(M),
+        )
+        records.append(asdict(row))
+        for name, value in zip(scalar_names, (row.plaquette, row.creutz_22, abs(row.polyakov))):
+            running[name].push(value)
+            binned[name].push(value)
+
+        start = time.perf_counter()
+        basis = smeared_timeslice_operators(
+            M, smearing["levels"], smearing["method"], smearing["alpha"], P1_MOMENTA
+        )
+        streams["basis_ops"].append(np.stack([b["plaq_sum"] for b in basis]))
+        ts = basis[-1]
+        streams["timeslice_ops"].append(ts["plaq_sum"])
+        parts = [ts[momentum_label(n) + part] for n in P1_MOMENTA for part in ("_re", "_im")]
+        streams["momentum_ops"].append(np.stack(parts))
+        timer.record("timeslice_operators", start)
+        n_measured += 1
+
+        if not args.no_save_configs:
+            start = time.perf_counter()
+            sweep_index = n_therm + (i + 1) * sweeps_between
+            write_config(
+                config_path(args.config_dir, shape, beta, seed, sweep_index),
+                U,
+                L=shape,
+                beta=beta,
+                seed=seed,
+                sweep_index=sweep_index,
+                cfg_index=i,
+                layout=link_layout(U),
+                sweep=args.sweep,
+                source="real_su2_mass_gap_pipeline",
+            )
+            timer.record("config_io", start)
+
+        checkpoint_due = args.checkpoint_every > 0 and n_measured % args.checkpoint_every == 0
+        if checkpoint_due or n_measured % max(args.flush_every, 1) == 0:
+            with timer.phase("checkpoint"):
+                flush_streams()  # a checkpointed count must never exceed the records on disk
+                if checkpoint_due:
+                    checkpoint()
+
+    flush_streams()
+    records.close()
+    eps_trajectory = []
+    if tuning is not None:
+        tuning.close()
+        eps_trajectory = [{**r, "sweep": int(r["sweep"])} for r in read_records(tuning_path)]
+    # The per-config series are read back from disk: bootstrap, jackknife and GEVP need all of them.
+    ops, mops, bops, tables, corrs = (streams[name].load() for name in row_shapes)
+
+    # Full Wilson-loop and Creutz-ratio grid
+    start = time.perf_counter()
+    chis = np.array([creutz_ratios(W) for W in tables])
+    with OUT_WILSON.open("w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=["R", "T", "W_mean", "W_std", "creutz_mean", "creutz_std"])
         writer.writeheader()
-        for r in rows:
-            writer.writerow(asdict(r))
+        for (r, t), w_mean in np.ndenumerate(tables.mean(axis=0)):
+            chi = chis[:, r, t]
+            writer.writerow(
+                {
+                    "R": r + 1,
+                    "T": t + 1,
+                    "W_mean": float(w_mean),
+                    "W_std": float(tables[:, r, t].std()),
+                    "creutz_mean": float(chi.mean()) if r and t else "",
+                    "creutz_std": float(chi.std()) if r and t else "",
+                }
+            )
+
+    timer.record("wilson_grid", start)
 
     # Gauge-orbit invariance test on final configuration
-    G = random_gauge_field(L, rng)
-    U2 = gauge_transform(U, G)
-    p1, p2 = avg_plaquette(U), avg_plaquette(U2)
-    w11_1, w11_2 = wilson_loop_plane01(U, 1, 1), wilson_loop_plane01(U2, 1, 1)
-    w22_1, w22_2 = wilson_loop_plane01(U, 2, 2), wilson_loop_plane01(U2, 2, 2)
+    start = time.perf_counter()
+    M = as_precision(U, "double")
+    G = random_gauge_field(shape, rng, args.links)
+    U2 = gauge_transform(M, G)
+    p1, p2 = avg_plaquette(M), avg_plaquette(U2)
+    w11_1, w11_2 = wilson_loop_plane01(M, 1, 1), wilson_loop_plane01(U2, 1, 1)
+    w22_1, w22_2 = wilson_loop_plane01(M, 2, 2), wilson_loop_plane01(U2, 2, 2)
+    pl_1, pl_2 = polyakov_loop(M), polyakov_loop(U2)
     with OUT_GAUGE.open("w", newline="") as f:
         writer = csv.DictWriter(
             f,
@@ -297,52 +499,269 @@ def main() -> None:
         writer.writerow({"observable": "plaquette", "before": p1, "after": p2, "abs_diff": abs(p1 - p2)})
         writer.writerow({"observable": "W11", "before": w11_1, "after": w11_2, "abs_diff": abs(w11_1 - w11_2)})
         writer.writerow({"observable": "W22", "before": w22_1, "after": w22_2, "abs_diff": abs(w22_1 - w22_2)})
+        writer.writerow({"observable": "polyakov", "before": pl_1, "after": pl_2, "abs_diff": abs(pl_1 - pl_2)})
+
+    timer.record("gauge_check", start)
 
     # Correlator from ensemble
-    ops = np.array(timeslice_ops)  # (n_cfg, Lt=L)
+    start = time.perf_counter()
+    # ops: (n_cfg, Lt), mops: (n_cfg, 2 * len(P1_MOMENTA), Lt), bops: (n_cfg, n_levels, Lt)
     C = connected_correlator_from_ensemble(ops)
     meff = effective_mass_cosh(C)
-    meff_clean = meff[np.isfinite(meff)]
-    m_est = float(np.mean(meff_clean)) if meff_clean.size >= 1 else float("nan")
+    m_est = float(plateau_mass(meff))
+    # |p| = 2 pi / L_i: Re<O_p(t) O_p(t+dt)^*>, averaged over the spatial axes
+    C_p1 = sum(connected_correlator_from_ensemble(mops[:, k]) for k in range(mops.shape[1])) / len(P1_MOMENTA)
+    Eeff_p1 = effective_mass_cosh(C_p1)
+    E_p1_est = float(plateau_mass(Eeff_p1))
+    # GEVP over the smearing basis: principal correlators and per-state effective masses
+    lam, meff_gevp, m_gevp = gevp_masses(correlator_matrix(bops), args.gevp_t0)
+    gevp_block = block_size(max_autocorr_time(ops), len(ops))
+    timer.record("correlators", start)
+    with timer.phase("bootstrap"):
+        m_gevp_boot, m_gevp_std, m_gevp_halfwidth = bootstrap_gevp_masses(
+            bops, rng, n_boot=args.gevp_boot, block=gevp_block, t0=args.gevp_t0
+        )
+    start = time.perf_counter()
+    n_states = lam.shape[0]
+    gevp_fields = [f"{name}_{n}" for n in range(n_states) for name in ("gevp_lambda", "gevp_m_eff")]
     with OUT_CORR.open("w", newline="") as f:
-        writer = csv.DictWriter(f, fieldnames=["dt", "C_dt", "m_eff_cosh"])
+        writer = csv.DictWriter(
+            f, fieldnames=["dt", "C_dt", "m_eff_cosh", "C_dt_p1", "E_eff_cosh_p1", *gevp_fields]
+        )
         writer.writeheader()
-        for dt in range(L):
-            mval = meff[dt - 1] if 1 <= dt <= L - 2 else np.nan
-            writer.writerow({"dt": dt, "C_dt": float(C[dt]), "m_eff_cosh": float(mval) if np.isfinite(mval) else ""})
+        for dt in range(Lt):
+            mval = meff[dt - 1] if 1 <= dt <= Lt - 2 else np.nan
+            eval_p1 = Eeff_p1[dt - 1] if 1 <= dt <= Lt - 2 else np.nan
+            row = {
+                "dt": dt,
+                "C_dt": float(C[dt]),
+                "m_eff_cosh": float(mval) if np.isfinite(mval) else "",
+                "C_dt_p1": float(C_p1[dt]),
+                "E_eff_cosh_p1": float(eval_p1) if np.isfinite(eval_p1) else "",
+            }
+            for n in range(n_states):
+                gval = meff_gevp[n, dt - 1] if 1 <= dt <= Lt - 2 else np.nan
+                row[f"gevp_lambda_{n}"] = float(lam[n, dt])
+                row[f"gevp_m_eff_{n}"] = float(gval) if np.isfinite(gval) else ""
+            writer.writerow(row)
+
+    # Zero-momentum correlator at every smearing level of the basis
+    m_by_level = {}
+    with OUT_SMEAR_BASIS.open("w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=["smear_level", "dt", "C_dt", "m_eff_cosh"])
+        writer.writeheader()
+        for k, level in enumerate(smearing["levels"]):
+            C_k = connected_correlator_from_ensemble(bops[:, k])
+            meff_k = effective_mass_cosh(C_k)
+            m_by_level[str(level)] = float(plateau_mass(meff_k))
+            for dt in range(Lt):
+                mval = meff_k[dt - 1] if 1 <= dt <= Lt - 2 else np.nan
+                writer.writerow(
+                    {
+                        "smear_level": level,
+                        "dt": dt,
+                        "C_dt": float(C_k[dt]),
+                        "m_eff_cosh": float(mval) if np.isfinite(mval) else "",
+                    }
+                )
+
+    timer.record("correlators", start)
 
     acc_rate = acc_sum / max(tot_sum, 1)
-    plaquettes = [r.plaquette for r in rows]
-    creutz_vals = [r.creutz_22 for r in rows]
+    # HMC thermalizes without accept/reject, so it has no thermalization acceptance to report.
+    therm_rate = therm_acc / therm_tot if therm_tot else None
+    start = time.perf_counter()
+    plaquettes = read_record_column(OUT_ENSEMBLE, "plaquette")
+    creutz_vals = read_record_column(OUT_ENSEMBLE, "creutz_22")
+    polyakov_vals = read_record_column(OUT_ENSEMBLE, "polyakov")
+    polyakov_abs = np.abs(polyakov_vals)
+    errors = {}
+    series_by_name = (("plaquette", plaquettes), ("creutz22", creutz_vals), ("polyakov_abs", polyakov_abs))
+    for name, series in series_by_name:
+        tau, tau_err, window = integrated_autocorr(series)
+        block = block_size(tau, len(series))
+        errors[name] = {
+            f"{name}_err": blocked_jackknife(series, block)[1],
+            f"{name}_tau_int": tau,
+            f"{name}_tau_int_err": tau_err,
+            f"{name}_tau_window": window,
+            f"{name}_block_size": block,
+        }
+
+    # Polyakov-loop correlator C(r) = <P(x) P(x + r)>, averaged over shells of equal |r|
+    # corrs: (n_cfg, n_shells)
+    poly_block = errors["polyakov_abs"]["polyakov_abs_block_size"]
+    with OUT_POLYAKOV.open("w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=["r", "C_r", "C_r_err", "V_eff"])
+        writer.writeheader()
+        for k, r in enumerate(r_poly):
+            c_mean, c_err = blocked_jackknife(corrs[:, k], poly_block)
+            writer.writerow(
+                {
+                    "r": float(r),
+                    "C_r": c_mean,
+                    "C_r_err": c_err,
+                    "V_eff": float(-np.log(c_mean) / Lt) if c_mean > 0 else "",
+                }
+            )
+
+    timer.record("statistics", start)
+
+    # Forward/backward MD on the final configuration: should return to it at rounding level.
+    reversibility = None
+    if args.sweep == "hmc":
+        with timer.phase("hmc_reversibility"):
+            reversibility = hmc_reversibility(U, beta, rng, **hmc_options)
+
+    # Independent chain at the other precision: plaquette means must agree within errors.
+    precision_check = None
+    if args.precision_check:
+        other = "double" if args.precision == "single" else "single"
+        start = time.perf_counter()
+        reference = plaquette_chain(
+            shape,
+            beta,
+            make_sweep(args.sweep, args.overrelax, **hmc_options),
+            np.random.default_rng(seed + 1),
+            n_therm,
+            n_cfg,
+            sweeps_between,
+            layout=args.links,
+            precision=other,
+            reunitarize_every=args.reunitarize_every,
+            eps=eps,
+            therm_sweep=make_sweep(args.sweep, args.overrelax, **hmc_options, accept_reject=False),
+        )
+        timer.record("precision_check", start, n_links * (n_therm + n_cfg * sweeps_between))
+        precision_check = {"reference_precision": other, **precision_agreement(plaquettes, reference)}
 
     summary = {
-        "run_type": "real_su2_metropolis",
-        "lattice_size": L,
+        "run_type": RUN_TYPES[args.sweep],
+        "lattice_size": shape[1],
+        "lattice_shape": list(shape),
         "beta": beta,
         "proposal_eps": eps,
+        "proposal_eps_initial": args.eps,
+        "adaptive_eps": adapt,
+        "target_acceptance": args.target_acceptance if adapt else None,
+        "eps_trajectory": eps_trajectory,
+        "sweep": args.sweep,
+        "n_overrelax": args.overrelax if args.sweep == "heatbath" else 0,
+        "hmc": params["hmc"],
+        **hmc_diagnostics(hmc_log),
+        "hmc_reversibility": reversibility,
+        "link_layout": args.links,
+        "precision": args.precision,
+        "reunitarize_every": args.reunitarize_every,
+        "unitarity_drift_max": drift,
+        "precision_check": precision_check,
         "n_thermal_sweeps": n_therm,
         "n_configs": n_cfg,
         "sweeps_between": sweeps_between,
+        "wilson_max": wilson_max,
+        "loop_estimator": args.loop_estimator,
+        "multilevel_sub": args.multilevel_sub if args.loop_estimator == "multilevel" else 0,
         "acceptance_rate": acc_rate,
+        "thermalization_acceptance_rate": therm_rate,
         "plaquette_mean": float(np.mean(plaquettes)),
         "plaquette_std": float(np.std(plaquettes)),
+        **errors["plaquette"],
         "creutz22_mean": float(np.mean(creutz_vals)),
         "creutz22_std": float(np.std(creutz_vals)),
-        "gauge_abs_diff_max": float(max(abs(p1 - p2), abs(w11_1 - w11_2), abs(w22_1 - w22_2))),
+        **errors["creutz22"],
+        "polyakov_mean": float(np.mean(polyakov_vals)),
+        "polyakov_abs_mean": float(np.mean(polyakov_abs)),
+        **errors["polyakov_abs"],
+        "polyakov_susceptibility": float(
+            np.prod(shape[1:]) * (np.mean(polyakov_vals**2) - np.mean(polyakov_abs) ** 2)
+        ),
+        "timeslice_tau_int": max_autocorr_time(ops),
+        "stream_dir": str(args.stream_dir),
+        "flush_every": args.flush_every,
+        "streaming": running_stats(),
+        "gauge_abs_diff_max": float(
+            max(abs(p1 - p2), abs(w11_1 - w11_2), abs(w22_1 - w22_2), abs(pl_1 - pl_2))
+        ),
+        "config_dir": None if args.no_save_configs else str(args.config_dir),
         "m_eff_cosh_estimate": m_est,
+        "smearing": smearing,
+        "m_eff_cosh_by_smear_level": m_by_level,
+        "gevp_t0": args.gevp_t0,
+        "gevp_block_size": gevp_block,
+        "gevp_states": [
+            {
+                "state": n,
+                "m_eff_plateau": float(m_gevp[n]),
+                "m_boot_mean": float(m_gevp_boot[n]),
+                "m_boot_std": float(m_gevp_std[n]),
+                "m_boot_ci68_halfwidth": float(m_gevp_halfwidth[n]),
+            }
+            for n in range(n_states)
+        ],
         "m_eff_positive": bool(np.isfinite(m_est) and m_est > 0),
+        "E_eff_cosh_p1_estimate": E_p1_est,
     }
     OUT_SUMMARY_JSON.write_text(json.dumps(summary, indent=2))
+    timing = {
+        # Wall time of this process only: a resumed run does not include the earlier part.
+        "wall_time_s": time.perf_counter() - run_start,
+        "timing": timer.summary(),
+        "trace": None if args.trace is None else str(args.trace),
+    }
+    OUT_TIMING_JSON.write_text(json.dumps(timing, indent=2))
     md = [
         "# Real SU(2) Pipeline Summary",
         "",
-        f"- Lattice: `L={L}` (4D)",
+        f"- Lattice: `{'x'.join(map(str, shape))}` (Lt x Lx x Ly x Lz)",
         f"- Beta: `{beta}`",
-        f"- Acceptance rate: `{acc_rate:.4f}`",
+        f"- Sweep: `{args.sweep}` ({args.links} links, {args.precision} precision)",
+        f"- Wilson-loop estimator: `{args.loop_estimator}`",
+        f"- Acceptance rate: `{acc_rate:.4f}`"
+        + ("" if therm_rate is None else f" (thermalization `{therm_rate:.4f}`)"),
+        f"- Proposal eps: `{eps:.4f}`" + (f" (tuned from `{args.eps}`)" if adapt else ""),
+        *(
+            [
+                f"- HMC: `{args.integrator}`, step `{args.hmc_step}` x `{args.hmc_steps}`;"
+                f" <exp(-dH)> = `{summary['hmc_exp_minus_dH_mean']:.4f}"
+                f" ± {summary['hmc_exp_minus_dH_err']:.4f}`, max |dH| `{summary['hmc_dH_abs_max']:.3e}`",
+                f"- HMC reversibility: |dH| roundtrip `{abs(reversibility['dH_roundtrip']):.3e}`,"
+                f" max link deviation `{reversibility['max_link_deviation']:.3e}`",
+            ]
+            if reversibility
+            else []
+        ),
+        *(
+            [
+                f"- Precision check vs {precision_check['reference_precision']}: plaquette"
+                f" `{precision_check['reference_mean']:.6f} ± {precision_check['reference_err']:.6f}`,"
+                f" z = `{precision_check['z']:.2f}` ({'agree' if precision_check['agree'] else 'DISAGREE'})",
+            ]
+            if precision_check
+            else []
+        ),
         f"- Plaquette mean ± std: `{summary['plaquette_mean']:.6f} ± {summary['plaquette_std']:.6f}`",
+        f"- Plaquette blocked-jackknife error: `{summary['plaquette_err']:.6f}`"
+        f" (block `{summary['plaquette_block_size']}`)",
+        f"- Plaquette tau_int (configs): `{summary['plaquette_tau_int']:.2f}"
+        f" ± {summary['plaquette_tau_int_err']:.2f}`",
+        f"- Timeslice-operator tau_int (max over t): `{summary['timeslice_tau_int']:.2f}`",
+        f"- Plaquette binned error (streaming): `{summary['streaming']['plaquette']['binned_err']:.6f}`"
+        f" (tau_int `{summary['streaming']['plaquette']['binned_tau_int']:.2f}`)",
         f"- Creutz(2,2) mean ± std: `{summary['creutz22_mean']:.6f} ± {summary['creutz22_std']:.6f}`",
+        f"- Polyakov loop <|P|>: `{summary['polyakov_abs_mean']:.6f} ± {summary['polyakov_abs_err']:.6f}`,"
+        f" susceptibility `{summary['polyakov_susceptibility']:.4f}`",
         f"- Gauge-orbit max |delta|: `{summary['gauge_abs_diff_max']:.3e}`",
+        f"- Unitarity drift max|U^dag U - 1|: `{drift:.3e}`"
+        f" (reunitarized every `{args.reunitarize_every}` sweeps)",
+        f"- Operator smearing: `{args.smear}`, alpha `{args.smear_alpha}`, levels `{smearing['levels']}`",
         f"- Glueball-like m_eff(cosh) estimate: `{summary['m_eff_cosh_estimate']}`",
+        "- m_eff(cosh) by smearing level: "
+        + ", ".join(f"{level}: `{m:.4f}`" for level, m in m_by_level.items()),
+        f"- GEVP masses (t0 = {args.gevp_t0}, bootstrap): "
+        + ", ".join(
+            f"E{s['state']} `{s['m_boot_mean']:.4f} ± {s['m_boot_std']:.4f}`" for s in summary["gevp_states"]
+        ),
+        f"- |p| = 2pi/L_i energy E_eff(cosh) estimate: `{summary['E_eff_cosh_p1_estimate']}`",
         f"- Positive mass estimate: `{summary['m_eff_positive']}`",
     ]
     OUT_SUMMARY_MD.write_text("\n".join(md))
@@ -350,8 +769,15 @@ def main() -> None:
     print(f"Wrote: {OUT_ENSEMBLE}")
     print(f"Wrote: {OUT_GAUGE}")
     print(f"Wrote: {OUT_CORR}")
+    print(f"Wrote: {OUT_WILSON}")
+    print(f"Wrote: {OUT_SMEAR_BASIS}")
+    print(f"Wrote: {OUT_POLYAKOV}")
     print(f"Wrote: {OUT_SUMMARY_JSON}")
     print(f"Wrote: {OUT_SUMMARY_MD}")
+    print(f"Wrote: {OUT_TIMING_JSON} (wall time {timing['wall_time_s']:.1f} s)")
+    if args.trace is not None:
+        write_chrome_trace(args.trace, timer.events, {os.getpid(): "real_su2_mass_gap_pipeline"})
+        print(f"Wrote: {args.trace}")
 
 
 if __name__ == "__main__":
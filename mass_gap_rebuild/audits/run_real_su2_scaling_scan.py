@@ -3,322 +3,975 @@
 
 from __future__ import annotations
 
+import argparse
 import csv
 import json
-import math
+import sys
+import time
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 
 import numpy as np
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from lattice import (  # noqa: E402
+    TUNABLE_SWEEPS,
+    ArrayLog,
+    HMCLog,
+    PhaseTimer,
+    RecordLog,
+    add_measurement_args,
+    add_storage_args,
+    add_update_args,
+    as_precision,
+    avg_plaquette,
+    block_size,
+    blocked_jackknife,
+    bootstrap_mass,
+    checkpoint_path,
+    config_path,
+    creutz_ratios,
+    gauge_transform,
+    hmc_diagnostics,
+    hmc_options_from_args,
+    init_links,
+    integrated_autocorr_time,
+    lattice_shape,
+    link_layout,
+    load_checkpoint,
+    make_sweep,
+    mass_from_ops,
+    max_autocorr_time,
+    measure_wilson_loops,
+    plaquette_action,
+    polyakov_loop,
+    propose_swaps,
+    random_gauge_field,
+    read_record_column,
+    read_records,
+    reunitarize,
+    save_checkpoint,
+    smear_links,
+    smearing_from_args,
+    stream_path,
+    timeslice_operators,
+    tune_eps,
+    unitarity_violation,
+    wilson_loop_plane01,
+    write_chrome_trace,
+    write_config,
+)
+
 
 ROOT = Path(__file__).resolve().parents[1]
 REPORTS = ROOT / "reports"
+DATA = ROOT / "data"
 
 OUT_CSV = REPORTS / "real_su2_scaling_scan.csv"
 OUT_JSON = REPORTS / "real_su2_scaling_scan_summary.json"
 OUT_MD = REPORTS / "real_su2_scaling_scan_summary.md"
+OUT_REPLICAS_CSV = REPORTS / "real_su2_scaling_scan_replicas.csv"
+# Wall times vary from run to run, so they stay out of the (reproducible) summary.
+OUT_TIMING_JSON = REPORTS / "real_su2_scaling_scan_timing.json"
+CONFIG_DIR = DATA / "su2_configs"
+CHECKPOINT_DIR = DATA / "checkpoints"
+STREAM_DIR = DATA / "streams"
 
+# The (L, beta) grid of the scan; each case is one chain (or one set of replicas).
+L_VALUES = (4, 6, 8)
+BETAS = (2.1, 2.3)
 
-def su2_from_quaternion(q: np.ndarray) -> np.ndarray:
-    a, b, c, d = q
-    return np.array([[a + 1j * d, c + 1j * b], [-c + 1j * b, a - 1j * d]], dtype=np.complex128)
+TAU_KEYS = ("plaquette_tau_int", "creutz22_tau_int", "polyakov_abs_tau_int", "timeslice_tau_int")
+STREAM_FIELDS = ["cfg_index", "plaquette", "creutz", "polyakov"]
+TUNING_FIELDS = ["sweep", "eps", "acceptance"]
 
 
-def random_su2(rng: np.random.Generator) -> np.ndarray:
-    q = rng.normal(size=4)
-    q = q / np.linalg.norm(q)
-    return su2_from_quaternion(q)
+def chain_budget(L: int) -> tuple[int, int, int]:
+    """(n_therm, n_cfg, sweeps_between) of the chains at spatial size L."""
+    # Keep runtime controlled as L grows.
+    if L <= 6:
+        return 20, 20, 2
+    return 14, 14, 1
 
 
-def random_su2_near_identity(rng: np.random.Generator, eps: float) -> np.ndarray:
-    v = rng.normal(size=3)
-    n = np.linalg.norm(v)
-    axis = np.array([1.0, 0.0, 0.0]) if n < 1e-12 else v / n
-    th = eps * rng.uniform(-1.0, 1.0)
-    a = math.cos(th)
-    s = math.sin(th)
-    b, c, d = axis * s
-    return su2_from_quaternion(np.array([a, b, c, d]))
+def measure_config(
+    U: np.ndarray,
+    beta: float,
+    rng: np.random.Generator,
+    loop_estimator: str = "plain",
+    multilevel_sub: int = 10,
+    smearing: dict | None = None,
+    timer: PhaseTimer | None = None,
+) -> dict:
+    """Plaquette, Creutz(2,2), Polyakov loop and glueball timeslice operator of one configuration."""
+    timer = PhaseTimer() if timer is None else timer
+    M = as_precision(U, "double")  # observables are accumulated in float64
+    with timer.phase("wilson_loops"):
+        W = measure_wilson_loops(M, 2, estimator=loop_estimator, beta=beta, rng=rng, n_sub=multilevel_sub)
+    with timer.phase("polyakov"):
+        polyakov = polyakov_loop(M)
+    with timer.phase("timeslice_operators"):
+        V = M
+        if smearing is not None:
+            V = smear_links(M, smearing["method"], smearing["alpha"], max(smearing["levels"]))
+        ts_op = timeslice_operators(V)["plaq_sum"]
+    return {
+        "plaquette": avg_plaquette(M),
+        "creutz": float(creutz_ratios(W)[1, 1]),
+        "polyakov": polyakov,
+        "ts_op": ts_op,
+    }
 
 
-def shift_idx(x: tuple[int, int, int, int], mu: int, step: int, L: int) -> tuple[int, int, int, int]:
-    y = list(x)
-    y[mu] = (y[mu] + step) % L
-    return tuple(y)  # type: ignore[return-value]
+def open_streams(
+    stream_dir: Path,
+    run: str,
+    shape: tuple[int, ...],
+    beta: float,
+    seed: int,
+    replica: int = 0,
+    flush_every: int = 10,
+    keep: int = 0,
+) -> tuple[RecordLog, ArrayLog]:
+    """Append-only per-config records of one chain: scalars as CSV, timeslice operators raw."""
+    tag = (stream_dir, run, shape, beta, seed)
+    return (
+        RecordLog(stream_path(*tag, "obs.csv", replica), STREAM_FIELDS, flush_every, keep),
+        ArrayLog(stream_path(*tag, "ts_ops.f64", replica), (shape[0],), flush_every, keep),
+    )
 
 
-def init_links(L: int) -> np.ndarray:
-    U = np.zeros((L, L, L, L, 4, 2, 2), dtype=np.complex128)
-    U[...] = np.eye(2, dtype=np.complex128)
-    return U
+def record_measurement(records: RecordLog, ts_log: ArrayLog, obs: dict) -> None:
+    records.append({"cfg_index": records.count, **{k: obs[k] for k in STREAM_FIELDS[1:]}})
+    ts_log.append(obs["ts_op"])
 
 
-def staple(U: np.ndarray, x: tuple[int, int, int, int], mu: int, L: int) -> np.ndarray:
-    st = np.zeros((2, 2), dtype=np.complex128)
-    for nu in range(4):
-        if nu == mu:
-            continue
-        x_nu = shift_idx(x, nu, +1, L)
-        x_mu = shift_idx(x, mu, +1, L)
-        term_f = U[x + (nu,)] @ U[x_nu + (mu,)] @ U[x_mu + (nu,)].conj().T
-        x_mnu = shift_idx(x, nu, -1, L)
-        x_mnu_mu = shift_idx(x_mnu, mu, +1, L)
-        term_b = U[x_mnu + (nu,)].conj().T @ U[x_mnu + (mu,)] @ U[x_mnu_mu + (nu,)]
-        st += term_f + term_b
-    return st
-
-
-def metropolis_sweep(U: np.ndarray, beta: float, eps: float, rng: np.random.Generator) -> tuple[int, int]:
-    L = U.shape[0]
-    acc = 0
-    tot = 0
-    for x in np.ndindex((L, L, L, L)):
-        x4 = (x[0], x[1], x[2], x[3])
-        for mu in range(4):
-            old = U[x4 + (mu,)]
-            V = staple(U, x4, mu, L)
-            cand = random_su2_near_identity(rng, eps) @ old
-            dS = -(beta / 2.0) * np.real(np.trace((cand - old) @ V))
-            tot += 1
-            if dS <= 0.0 or rng.uniform() < np.exp(-dS):
-                U[x4 + (mu,)] = cand
-                acc += 1
-    return acc, tot
-
-
-def plaquette_trace(U: np.ndarray, x: tuple[int, int, int, int], mu: int, nu: int, L: int) -> complex:
-    x_mu = shift_idx(x, mu, +1, L)
-    x_nu = shift_idx(x, nu, +1, L)
-    return np.trace(U[x + (mu,)] @ U[x_mu + (nu,)] @ U[x_nu + (mu,)].conj().T @ U[x + (nu,)].conj().T)
-
-
-def avg_plaquette(U: np.ndarray) -> float:
-    L = U.shape[0]
-    vals = []
-    for x in np.ndindex((L, L, L, L)):
-        x4 = (x[0], x[1], x[2], x[3])
-        for mu in range(4):
-            for nu in range(mu + 1, 4):
-                vals.append(np.real(plaquette_trace(U, x4, mu, nu, L)) / 2.0)
-    return float(np.mean(vals))
-
-
-def wilson_loop_plane01(U: np.ndarray, R: int, T: int) -> float:
-    L = U.shape[0]
-    vals = []
-    for x in np.ndindex((L, L, L, L)):
-        cur = (x[0], x[1], x[2], x[3])
-        W = np.eye(2, dtype=np.complex128)
-        for _ in range(R):
-            W = W @ U[cur + (1,)]
-            cur = shift_idx(cur, 1, +1, L)
-        for _ in range(T):
-            W = W @ U[cur + (0,)]
-            cur = shift_idx(cur, 0, +1, L)
-        for _ in range(R):
-            cur = shift_idx(cur, 1, -1, L)
-            W = W @ U[cur + (1,)].conj().T
-        for _ in range(T):
-            cur = shift_idx(cur, 0, -1, L)
-            W = W @ U[cur + (0,)].conj().T
-        vals.append(np.real(np.trace(W)) / 2.0)
-    return float(np.mean(vals))
-
-
-def random_gauge_field(L: int, rng: np.random.Generator) -> np.ndarray:
-    G = np.zeros((L, L, L, L, 2, 2), dtype=np.complex128)
-    for x in np.ndindex((L, L, L, L)):
-        G[x] = random_su2(rng)
-    return G
-
-
-def gauge_transform(U: np.ndarray, G: np.ndarray) -> np.ndarray:
-    L = U.shape[0]
-    out = np.zeros_like(U)
-    for x in np.ndindex((L, L, L, L)):
-        x4 = (x[0], x[1], x[2], x[3])
-        gx = G[x4]
-        for mu in range(4):
-            xp = shift_idx(x4, mu, +1, L)
-            out[x4 + (mu,)] = gx @ U[x4 + (mu,)] @ G[xp].conj().T
-    return out
-
-
-def timeslice_spatial_plaquette_sum(U: np.ndarray, t: int) -> float:
-    L = U.shape[0]
-    sdirs = [1, 2, 3]
-    total = 0.0
-    n = 0
-    for x1 in range(L):
-        for x2 in range(L):
-            for x3 in range(L):
-                x = (t, x1, x2, x3)
-                for i in range(3):
-                    for j in range(i + 1, 3):
-                        total += np.real(plaquette_trace(U, x, sdirs[i], sdirs[j], L)) / 2.0
-                        n += 1
-    return total / max(n, 1)
-
-
-def connected_correlator_from_ensemble(ops: np.ndarray) -> np.ndarray:
-    n_cfg, Lt = ops.shape
-    mu = np.mean(ops)
-    C = np.zeros(Lt, dtype=float)
-    for dt in range(Lt):
-        acc = 0.0
-        n = 0
-        for c in range(n_cfg):
-            for t in range(Lt):
-                acc += (ops[c, t] - mu) * (ops[c, (t + dt) % Lt] - mu)
-                n += 1
-        C[dt] = acc / max(n, 1)
-    return C
-
-
-def effective_mass_cosh(C: np.ndarray) -> np.ndarray:
-    out = []
-    for t in range(1, len(C) - 1):
-        if C[t] <= 0:
-            out.append(np.nan)
-            continue
-        arg = (C[t - 1] + C[t + 1]) / (2.0 * C[t])
-        if arg < 1.0:
-            out.append(np.nan)
-            continue
-        out.append(float(np.arccosh(arg)))
-    return np.array(out)
+def read_streams(records: RecordLog, ts_log: ArrayLog) -> dict:
+    """Close a chain's record files and read its measurement series back from disk."""
+    records.close()
+    ts_ops = ts_log.load()
+    ts_log.close()
+    return {
+        "plaquettes": read_record_column(records.path, "plaquette"),
+        "creutz": read_record_column(records.path, "creutz"),
+        "polyakov_abs": np.abs(read_record_column(records.path, "polyakov")),
+        "ts_ops": ts_ops,
+    }
 
 
-def mass_from_ops(ops: np.ndarray) -> float:
-    C = connected_correlator_from_ensemble(ops)
-    meff = effective_mass_cosh(C)
-    valid = meff[np.isfinite(meff)]
-    return float(np.mean(valid)) if valid.size > 0 else float("nan")
+def read_tuning(tuning: RecordLog | None) -> list[dict]:
+    """Close a chain's eps-tuning record file (if it has one) and read the trajectory back."""
+    if tuning is None:
+        return []
+    tuning.close()
+    return [{**r, "sweep": int(r["sweep"])} for r in read_records(tuning.path)]
 
 
-def bootstrap_mass(ops: np.ndarray, rng: np.random.Generator, n_boot: int = 100) -> tuple[float, float, float]:
-    n_cfg = ops.shape[0]
-    masses = []
-    for _ in range(n_boot):
-        idx = rng.integers(0, n_cfg, size=n_cfg)
-        m = mass_from_ops(ops[idx])
-        if np.isfinite(m):
-            masses.append(m)
-    if not masses:
-        return float("nan"), float("nan"), float("nan")
-    arr = np.array(masses)
-    lo, hi = np.quantile(arr, [0.16, 0.84])
-    return float(np.mean(arr)), float(np.std(arr)), float(0.5 * (hi - lo))
+def gauge_check(U: np.ndarray, rng: np.random.Generator) -> float:
+    """Largest change of the plaquette, W(1,1) and W(2,2) under a random gauge transformation."""
+    M = as_precision(U, "double")
+    U2 = gauge_transform(M, random_gauge_field(lattice_shape(M), rng, link_layout(M)))
+    return float(
+        max(
+            abs(avg_plaquette(M) - avg_plaquette(U2)),
+            abs(wilson_loop_plane01(M, 1, 1) - wilson_loop_plane01(U2, 1, 1)),
+            abs(wilson_loop_plane01(M, 2, 2) - wilson_loop_plane01(U2, 2, 2)),
+        )
+    )
+
+
+def run_chain(
+    L: int,
+    beta: float,
+    rng: np.random.Generator,
+    Lt: int | None = None,
+    n_therm: int = 20,
+    n_cfg: int = 20,
+    sweeps_between: int = 2,
+    sweep: str = "site",
+    layout: str = "matrix",
+    precision: str = "double",
+    reunitarize_every: int = 10,
+    n_overrelax: int = 1,
+    hmc_options: dict | None = None,
+    loop_estimator: str = "plain",
+    multilevel_sub: int = 10,
+    smearing: dict | None = None,
+    eps: float = 0.25,
+    target_acceptance: float | None = None,
+    config_dir: Path | None = None,
+    seed: int = 0,
+    replica: int = 0,
+    checkpoint: Path | None = None,
+    checkpoint_every: int = 10,
+    resume: bool = False,
+    stream_dir: Path = STREAM_DIR,
+    run: str = "real_su2_scan",
+    flush_every: int = 10,
+    trace: bool = False,
+) -> dict:
+    """Thermalize and measure one Markov chain on Lt x L^3 (Lt = L unless given).
+
+    Measurements are streamed to record files in `stream_dir` and read back at the end;
+    `checkpoint`/`resume` make the chain restartable bit-exactly. The returned dict holds
+    the raw series, acceptance counters and a PhaseTimer under "timer".
+    """
+    shape = (L if Lt is None else Lt, L, L, L)
+    U = init_links(shape, layout, precision=precision)
+    timer = PhaseTimer(trace=trace, tid=replica)
+    n_links = int(np.prod(shape)) * len(shape)  # link updates per sweep, for the throughput
+    hmc_log = HMCLog()  # equilibrium trajectories only
+    # From the cold start HMC would reject nearly everything, so thermalize without accept/reject.
+    therm_update = make_sweep(sweep, n_overrelax, **(hmc_options or {}), accept_reject=False)
+    adapt = target_acceptance is not None and sweep in TUNABLE_SWEEPS
+
+    acc = tot = 0  # measurement sweeps only
+    # HMC thermalizes without accept/reject, so only the other sweeps count here.
+    therm_acc = therm_tot = 0
+    therm_done = 0
+    n_measured = 0
+    drift = 0.0
+
+    params = {
+        "L": L,
+        "Lt": shape[0],
+        "beta": beta,
+        "eps": eps,
+        "target_acceptance": target_acceptance if adapt else None,
+        "n_therm": n_therm,
+        "sweeps_between": sweeps_between,
+        "sweep": sweep,
+        "n_overrelax": n_overrelax,
+        "hmc": hmc_options if sweep == "hmc" else None,
+        "link_layout": layout,
+        "precision": precision,
+        "reunitarize_every": reunitarize_every,
+        "loop_estimator": loop_estimator,
+        "multilevel_sub": multilevel_sub,
+        "smearing": smearing,
+    }
+    if checkpoint is not None and resume and checkpoint.exists():
+        U, state = load_checkpoint(checkpoint, params)
+        rng.bit_generator.state = state["rng_state"]
+        acc, tot = state["accepted"], state["proposed"]
+        therm_acc, therm_tot = state["therm_accepted"], state["therm_proposed"]
+        therm_done = state["therm_done"]
+        eps = state["eps"]
+        hmc_log = HMCLog.from_state(state["hmc_log"])
+        n_measured = state["n_measured"]
+        drift = state["unitarity_drift_max"]
+    update = make_sweep(sweep, n_overrelax, **(hmc_options or {}), log=hmc_log)
+    records, ts_log = open_streams(stream_dir, run, shape, beta, seed, replica, flush_every, keep=n_measured)
+    tuning = None
+    if adapt:
+        tuning_path = stream_path(stream_dir, run, shape, beta, seed, "eps_trajectory.csv", replica)
+        tuning = RecordLog(tuning_path, TUNING_FIELDS, flush_every, keep=therm_done)
+
+    def save() -> None:
+        records.flush()  # the checkpointed count must never exceed the records on disk
+        ts_log.flush()
+        if tuning is not None:
+            tuning.flush()
+        save_checkpoint(
+            checkpoint,
+            U,
+            rng,
+            params=params,
+            L=shape,
+            beta=beta,
+            seed=seed,
+            sweep_index=therm_done + n_measured * sweeps_between,
+            accepted=acc,
+            proposed=tot,
+            therm_accepted=therm_acc,
+            therm_proposed=therm_tot,
+            therm_done=therm_done,
+            eps=eps,
+            hmc_log=hmc_log.state(),
+            n_measured=n_measured,
+            unitarity_drift_max=drift,
+        )
+
+    def reunitarize_due(sweep_index: int) -> bool:
+        return reunitarize_every > 0 and sweep_index % reunitarize_every == 0
+
+    due = checkpoint is not None and checkpoint_every > 0
+    while therm_done < n_therm:
+        with timer.phase("thermalization", n_links):
+            a, t = therm_update(U, beta, eps, rng)
+        if reunitarize_due(therm_done + 1):
+            with timer.phase("reunitarize"):
+                drift = max(drift, unitarity_violation(U))
+                reunitarize(U)
+        if sweep != "hmc":
+            therm_acc += a
+            therm_tot += t
+        therm_done += 1
+        if adapt:
+            tuning.append({"sweep": therm_done, "eps": eps, "acceptance": a / max(t, 1)})
+            eps = tune_eps(eps, a / max(t, 1), target_acceptance)
+        if due and therm_done % checkpoint_every == 0:
+            with timer.phase("checkpoint"):
+                save()
+
+    while n_measured < n_cfg:
+        for j in range(sweeps_between):
+            with timer.phase("updates", n_links):
+                a, t = update(U, beta, eps, rng)
+            acc += a
+            tot += t
+            if reunitarize_due(n_therm + n_measured * sweeps_between + j + 1):
+                with timer.phase("reunitarize"):
+                    drift = max(drift, unitarity_violation(U))
+                    reunitarize(U)
+        drift = max(drift, unitarity_violation(U))
+        obs = measure_config(U, beta, rng, loop_estimator, multilevel_sub, smearing, timer)
+        record_measurement(records, ts_log, obs)
+        n_measured += 1
+        if config_dir is not None:
+            start = time.perf_counter()
+            sweep_index = n_therm + n_measured * sweeps_between
+            write_config(
+                config_path(config_dir, shape, beta, seed, sweep_index, replica),
+                U,
+                L=shape,
+                beta=beta,
+                seed=seed,
+                sweep_index=sweep_index,
+                replica=replica,
+                layout=layout,
+                sweep=sweep,
+                source="real_su2_scaling_scan",
+            )
+            timer.record("config_io", start)
+        if due and n_measured % checkpoint_every == 0:
+            with timer.phase("checkpoint"):
+                save()
+
+    with timer.phase("gauge_check"):
+        gdiff = gauge_check(U, rng)
+    return {
+        "accepted": acc,
+        "proposed": tot,
+        "therm_accepted": therm_acc,
+        "therm_proposed": therm_tot,
+        **read_streams(records, ts_log),
+        "eps": eps,
+        "eps_trajectory": read_tuning(tuning),
+        "hmc_log": hmc_log,
+        "gauge_abs_diff_max": gdiff,
+        "unitarity_drift_max": drift,
+        "timer": timer,
+    }
+
+
+def chain_stats(chain: dict) -> dict:
+    """Per-chain means, spreads and tau_int; errors use blocks of ceil(2 tau_int) configs.
+
+    The acceptance rate covers the measurement sweeps; thermalization acceptance is reported
+    separately (None for HMC, which thermalizes without accept/reject). HMC chains also
+    report the dH diagnostics of their measurement trajectories.
+    """
+    stats = {
+        "acceptance_rate": chain["accepted"] / max(chain["proposed"], 1),
+        "thermalization_acceptance_rate": (
+            chain["therm_accepted"] / chain["therm_proposed"] if chain["therm_proposed"] else None
+        ),
+        "proposal_eps": chain["eps"],
+    }
+    series_by_name = (
+        ("plaquette", chain["plaquettes"]),
+        ("creutz22", chain["creutz"]),
+        ("polyakov_abs", chain["polyakov_abs"]),
+    )
+    for name, series in series_by_name:
+        tau = integrated_autocorr_time(series)
+        _, err = blocked_jackknife(series, block_size(tau, len(series)))
+        stats[f"{name}_mean"] = float(np.mean(series))
+        stats[f"{name}_std"] = float(np.std(series))
+        stats[f"{name}_err"] = err
+        stats[f"{name}_tau_int"] = tau
+    stats["timeslice_tau_int"] = max_autocorr_time(chain["ts_ops"])
+    stats.update(hmc_diagnostics(chain["hmc_log"]))
+    return stats
 
 
 def run_case(
     L: int,
     beta: float,
     seed: int,
+    Lt: int | None = None,
     n_therm: int = 20,
     n_cfg: int = 20,
     sweeps_between: int = 2,
     n_boot: int = 100,
+    sweep: str = "site",
+    layout: str = "matrix",
+    precision: str = "double",
+    reunitarize_every: int = 10,
+    n_overrelax: int = 1,
+    hmc_options: dict | None = None,
+    loop_estimator: str = "plain",
+    multilevel_sub: int = 10,
+    smearing: dict | None = None,
+    eps: float = 0.25,
+    target_acceptance: float | None = None,
+    n_replicas: int = 1,
+    config_dir: Path | None = None,
+    checkpoint_dir: Path | None = None,
+    checkpoint_every: int = 10,
+    resume: bool = False,
+    stream_dir: Path = STREAM_DIR,
+    flush_every: int = 10,
+    trace: bool = False,
 ) -> dict:
+    """Run one (L, beta) case as `n_replicas` independent chains and merge their statistics.
+
+    A single replica uses the case seed directly, so it reproduces the one-chain run. With
+    more, each replica gets a child of SeedSequence(seed), runs its own thermalization in a
+    separate process, and the timeslice operators of all replicas are concatenated before
+    the mass fit and bootstrap. Per-replica statistics are returned under "replicas".
+    Each replica keeps its own checkpoint file in `checkpoint_dir` and record files in
+    `stream_dir`.
+    """
     rng = np.random.default_rng(seed)
-    U = init_links(L)
-    eps = 0.25
+    Lt = L if Lt is None else Lt
+    chain_kwargs = dict(
+        Lt=Lt,
+        n_therm=n_therm,
+        n_cfg=n_cfg,
+        sweeps_between=sweeps_between,
+        sweep=sweep,
+        layout=layout,
+        precision=precision,
+        reunitarize_every=reunitarize_every,
+        n_overrelax=n_overrelax,
+        hmc_options=hmc_options,
+        loop_estimator=loop_estimator,
+        multilevel_sub=multilevel_sub,
+        smearing=smearing,
+        eps=eps,
+        target_acceptance=target_acceptance,
+        config_dir=config_dir,
+        seed=seed,
+        checkpoint_every=checkpoint_every,
+        resume=resume,
+        stream_dir=stream_dir,
+        flush_every=flush_every,
+        trace=trace,
+    )
+    # Replica 0 of a multi-replica run draws from a spawned seed, not the case seed, so the
+    # run tag keeps its checkpoints apart from single-chain ones.
+    run = "real_su2_scan" if n_replicas <= 1 else f"real_su2_scan_{n_replicas}rep"
 
-    acc = 0
-    tot = 0
-    for _ in range(n_therm):
-        a, t = metropolis_sweep(U, beta, eps, rng)
-        acc += a
-        tot += t
+    def ckpt(replica: int) -> Path | None:
+        if checkpoint_dir is None:
+            return None
+        return checkpoint_path(checkpoint_dir, run, (Lt, L, L, L), beta, seed, replica)
 
-    plaquettes = []
-    creutz = []
-    ts_ops = []
-    for _ in range(n_cfg):
-        for _ in range(sweeps_between):
-            a, t = metropolis_sweep(U, beta, eps, rng)
-            acc += a
-            tot += t
-        p = avg_plaquette(U)
-        w11 = wilson_loop_plane01(U, 1, 1)
-        w22 = wilson_loop_plane01(U, 2, 2)
-        w12 = wilson_loop_plane01(U, 1, 2)
-        ratio = (w22 * w11) / max(w12 * w12, 1e-15)
-        c = -math.log(max(abs(ratio), 1e-15))
-        plaquettes.append(p)
-        creutz.append(c)
-        ts_ops.append(np.array([timeslice_spatial_plaquette_sum(U, t0) for t0 in range(L)], dtype=float))
-
-    G = random_gauge_field(L, rng)
-    U2 = gauge_transform(U, G)
-    gdiff = max(
-        abs(avg_plaquette(U) - avg_plaquette(U2)),
-        abs(wilson_loop_plane01(U, 1, 1) - wilson_loop_plane01(U2, 1, 1)),
-        abs(wilson_loop_plane01(U, 2, 2) - wilson_loop_plane01(U2, 2, 2)),
-    )
+    if n_replicas <= 1:
+        chains = [run_chain(L, beta, rng, checkpoint=ckpt(0), run=run, **chain_kwargs)]
+    else:
+        rngs = [np.random.default_rng(s) for s in np.random.SeedSequence(seed).spawn(n_replicas)]
+        with ProcessPoolExecutor(max_workers=n_replicas) as pool:
+            futures = [
+                pool.submit(run_chain, L, beta, r, replica=i, checkpoint=ckpt(i), run=run, **chain_kwargs)
+                for i, r in enumerate(rngs)
+            ]
+            chains = [fut.result() for fut in futures]
+    return merge_chains(L, Lt, beta, seed, chains, rng, n_boot)
+
+
+def merge_chains(
+    L: int, Lt: int, beta: float, seed: int, chains: list[dict], rng: np.random.Generator, n_boot: int
+) -> dict:
+    """One scan row from the chains of an (L, beta) case: pooled mass fit and bootstrap, merged stats.
+
+    The row's "timer" holds the chains' phase timings plus those of the analysis done here.
+    """
+    timer = PhaseTimer(trace=chains[0]["timer"].trace)
+    for c in chains:
+        timer.merge(c["timer"])
+    ops_arr = np.concatenate([c["ts_ops"] for c in chains])
+    start = time.perf_counter()
+    replicas = [chain_stats(c) for c in chains]
+    # tau_int is a property of each chain; concatenated series would mix chain boundaries.
+    taus = {k: float(np.mean([r[k] for r in replicas])) for k in TAU_KEYS}
+    block = block_size(max(r["timeslice_tau_int"] for r in replicas), len(chains[0]["ts_ops"]))
+    # Each replica is cut to whole blocks before pooling, so no bootstrap block straddles two
+    # chains and every replica loses at most its own trailing partial block.
+    boot_ops = np.concatenate([c["ts_ops"][: len(c["ts_ops"]) // block * block] for c in chains])
+    timer.record("statistics", start)
+    with timer.phase("correlators"):
+        m = mass_from_ops(ops_arr)
+    with timer.phase("bootstrap"):
+        m_boot_mean, m_boot_std, m_boot_halfwidth = bootstrap_mass(boot_ops, rng, n_boot=n_boot, block=block)
 
-    ops_arr = np.array(ts_ops)
-    m = mass_from_ops(ops_arr)
-    m_boot_mean, m_boot_std, m_boot_halfwidth = bootstrap_mass(ops_arr, rng, n_boot=n_boot)
+    start = time.perf_counter()
+    merged_hmc_log = HMCLog()
+    for c in chains:
+        merged_hmc_log.merge(c["hmc_log"])
+    merged = chain_stats(
+        {
+            "accepted": sum(c["accepted"] for c in chains),
+            "proposed": sum(c["proposed"] for c in chains),
+            "therm_accepted": sum(c["therm_accepted"] for c in chains),
+            "therm_proposed": sum(c["therm_proposed"] for c in chains),
+            "plaquettes": [p for c in chains for p in c["plaquettes"]],
+            "creutz": [x for c in chains for x in c["creutz"]],
+            "polyakov_abs": [x for c in chains for x in c["polyakov_abs"]],
+            "ts_ops": ops_arr,
+            "eps": float(np.mean([c["eps"] for c in chains])),
+            "hmc_log": merged_hmc_log,
+        }
+    )
+    merged.update(taus)
+    # Independent replicas: combine per-chain blocked errors in quadrature.
+    for name in ("plaquette", "creutz22", "polyakov_abs"):
+        errs = np.array([r[f"{name}_err"] for r in replicas])
+        merged[f"{name}_err"] = float(np.sqrt(np.sum(errs**2))) / len(replicas)
+    timer.record("statistics", start)
 
     return {
         "L": L,
+        "Lt": Lt,
         "beta": beta,
         "seed": seed,
-        "acceptance_rate": acc / max(tot, 1),
-        "plaquette_mean": float(np.mean(plaquettes)),
-        "plaquette_std": float(np.std(plaquettes)),
-        "creutz22_mean": float(np.mean(creutz)),
-        "creutz22_std": float(np.std(creutz)),
-        "gauge_abs_diff_max": float(gdiff),
+        **merged,
+        "gauge_abs_diff_max": max(c["gauge_abs_diff_max"] for c in chains),
+        "unitarity_drift_max": max(c["unitarity_drift_max"] for c in chains),
         "m_eff_cosh_estimate": m,
         "m_boot_mean": m_boot_mean,
         "m_boot_std": m_boot_std,
         "m_boot_ci68_halfwidth": m_boot_halfwidth,
-        "n_cfg": n_cfg,
+        "boot_block_size": block,
+        "n_cfg": int(ops_arr.shape[0]),
+        "n_replicas": len(chains),
         "m_eff_positive": bool(np.isfinite(m) and m > 0),
+        "replicas": [{"replica": i, **r} for i, r in enumerate(replicas)],
+        "eps_trajectories": [c["eps_trajectory"] for c in chains],
+        "timer": timer,
+    }
+
+
+def tempered_segment(
+    U: np.ndarray,
+    beta: float,
+    eps: float,
+    rng: np.random.Generator,
+    n_sweeps: int,
+    sweep_offset: int,
+    therm: bool,
+    measure: bool,
+    case: dict,
+) -> dict:
+    """Advance one parallel-tempering chain by `n_sweeps` sweeps, then optionally measure.
+
+    Runs in a pool worker, so the links and generator travel in and out with the result.
+    `case` holds the run_case keyword arguments of this beta; `sweep_offset` is the chain's
+    sweep count so far, which fixes the reunitarization schedule.
+    """
+    timer = PhaseTimer(trace=case["trace"])
+    shape = lattice_shape(U)
+    n_links = int(np.prod(shape)) * len(shape)
+    hmc_log = HMCLog()
+    hmc_options = dict(case["hmc_options"] or {}, log=hmc_log, accept_reject=not therm)
+    # As in run_chain, HMC thermalizes without accept/reject.
+    update = make_sweep(case["sweep"], case["n_overrelax"], **hmc_options)
+    target = case["target_acceptance"]
+    adapt = therm and target is not None and case["sweep"] in TUNABLE_SWEEPS
+    every = case["reunitarize_every"]
+    acc = tot = 0
+    drift = 0.0
+    eps_trajectory = []
+    for n in range(sweep_offset + 1, sweep_offset + n_sweeps + 1):
+        with timer.phase("thermalization" if therm else "updates", n_links):
+            a, t = update(U, beta, eps, rng)
+        acc += a
+        tot += t
+        if every > 0 and n % every == 0:
+            with timer.phase("reunitarize"):
+                drift = max(drift, unitarity_violation(U))
+                reunitarize(U)
+        if adapt:
+            eps_trajectory.append({"sweep": n, "eps": eps, "acceptance": a / max(t, 1)})
+            eps = tune_eps(eps, a / max(t, 1), target)
+    obs = None
+    if measure:
+        drift = max(drift, unitarity_violation(U))
+        obs = measure_config(
+            U, beta, rng, case["loop_estimator"], case["multilevel_sub"], case["smearing"], timer
+        )
+    with timer.phase("action"):
+        action = plaquette_action(as_precision(U, "double"))
+    return {
+        "U": U,
+        "rng": rng,
+        "eps": eps,
+        "accepted": acc,
+        "proposed": tot,
+        "eps_trajectory": eps_trajectory,
+        "hmc_log": hmc_log,
+        "drift": drift,
+        "action": action,
+        "obs": obs,
+        "timer": timer,
     }
 
 
+def run_tempered(cases: list[dict], rungs: int = 0) -> list[dict]:
+    """Run the cases of one L, one per beta, as a parallel-tempering ensemble; rows in case order.
+
+    Each beta keeps its own chain state: generator (seeded with its case seed), proposal
+    width, counters and measurements. `rungs` extra betas, evenly spaced between each pair
+    of neighbouring case betas, join the ensemble only to carry swaps: they are simulated
+    but never measured or reported. The chains advance concurrently in a process pool,
+    `sweeps_between` sweeps per segment, and after every segment neighbouring betas propose
+    to swap configurations (see lattice.tempering). Measured configurations are written
+    before the swaps; checkpointing and multiple replicas are not supported in this mode.
+    As in run_chain, measurements go to per-beta record files rather than memory.
+    """
+    order = sorted(range(len(cases)), key=lambda i: cases[i]["beta"])
+    reported = [cases[i] for i in order]
+    swap_rng = np.random.default_rng([c["seed"] for c in reported])
+    # Slots in ensemble order; case index into `cases` for reported betas, None for rungs.
+    slots, owners = [], []
+    for n, (lo, hi) in enumerate(zip(reported, reported[1:] + [None])):
+        slots.append(lo)
+        owners.append(order[n])
+        if hi is None:
+            continue
+        for j in range(1, rungs + 1):
+            beta = lo["beta"] + (hi["beta"] - lo["beta"]) * j / (rungs + 1)
+            slots.append({**lo, "beta": beta, "seed": [lo["seed"], j], "config_dir": None})
+            owners.append(None)
+    first = slots[0]
+    L, n_therm, n_cfg, sep = first["L"], first["n_therm"], first["n_cfg"], first["sweeps_between"]
+    Lt = L if first["Lt"] is None else first["Lt"]
+    shape = (Lt, L, L, L)
+    betas = [c["beta"] for c in slots]
+    rngs = [np.random.default_rng(c["seed"]) for c in slots]
+    links = [init_links(shape, first["layout"], precision=first["precision"]) for _ in slots]
+    eps = [c["eps"] for c in slots]
+    chains = [
+        {
+            "accepted": 0,
+            "proposed": 0,
+            "therm_accepted": 0,
+            "therm_proposed": 0,
+            "hmc_log": HMCLog(),
+            "unitarity_drift_max": 0.0,
+            "timer": PhaseTimer(trace=c["trace"]),
+        }
+        for c in slots
+    ]
+    streams = [
+        open_streams(
+            c["stream_dir"], "real_su2_scan_pt", shape, c["beta"], c["seed"], flush_every=c["flush_every"]
+        )
+        if owner is not None
+        else None
+        for c, owner in zip(slots, owners)
+    ]
+
+    def tuning_log(c: dict, owner: int | None) -> RecordLog | None:
+        if owner is None or c["target_acceptance"] is None or c["sweep"] not in TUNABLE_SWEEPS:
+            return None
+        tag = (c["stream_dir"], "real_su2_scan_pt", shape, c["beta"], c["seed"])
+        return RecordLog(stream_path(*tag, "eps_trajectory.csv"), TUNING_FIELDS, c["flush_every"])
+
+    tunings = [tuning_log(c, owner) for c, owner in zip(slots, owners)]
+    swaps_proposed = [0] * (len(slots) - 1)
+    swaps_accepted = [0] * (len(slots) - 1)
+
+    # (sweeps, thermalization?, measure?) per segment; swaps follow every segment.
+    segments = [(min(sep, n_therm - n), True, False) for n in range(0, n_therm, sep)]
+    segments += [(sep, False, True)] * n_cfg
+    done = 0
+    with ProcessPoolExecutor(max_workers=len(slots)) as pool:
+        for index, (n_sweeps, therm, measure) in enumerate(segments):
+            futures = [
+                pool.submit(
+                    tempered_segment,
+                    links[k],
+                    c["beta"],
+                    eps[k],
+                    rngs[k],
+                    n_sweeps,
+                    done,
+                    therm,
+                    measure and owners[k] is not None,
+                    c,
+                )
+                for k, c in enumerate(slots)
+            ]
+            results = [fut.result() for fut in futures]
+            done += n_sweeps
+            for k, (c, res) in enumerate(zip(slots, results)):
+                links[k], rngs[k], eps[k] = res["U"], res["rng"], res["eps"]
+                chain = chains[k]
+                if not therm:
+                    chain["accepted"] += res["accepted"]
+                    chain["proposed"] += res["proposed"]
+                elif c["sweep"] != "hmc":
+                    chain["therm_accepted"] += res["accepted"]
+                    chain["therm_proposed"] += res["proposed"]
+                if tunings[k] is not None:
+                    for entry in res["eps_trajectory"]:
+                        tunings[k].append(entry)
+                if not therm:
+                    chain["hmc_log"].merge(res["hmc_log"])
+                chain["unitarity_drift_max"] = max(chain["unitarity_drift_max"], res["drift"])
+                chain["timer"].merge(res["timer"])
+                if res["obs"] is not None:
+                    record_measurement(*streams[k], res["obs"])
+                    if c["config_dir"] is not None:
+                        start = time.perf_counter()
+                        write_config(
+                            config_path(c["config_dir"], shape, c["beta"], c["seed"], done),
+                            links[k],
+                            L=shape,
+                            beta=c["beta"],
+                            seed=c["seed"],
+                            sweep_index=done,
+                            layout=c["layout"],
+                            sweep=c["sweep"],
+                            tempering=True,
+                            source="real_su2_scaling_scan",
+                        )
+                        chain["timer"].record("config_io", start)
+            actions = [res["action"] for res in results]
+            for k, accepted in propose_swaps(betas, actions, swap_rng, index % 2):
+                swaps_proposed[k] += 1
+                if accepted:
+                    swaps_accepted[k] += 1
+                    links[k], links[k + 1] = links[k + 1], links[k]
+
+    pairs = [
+        {
+            "beta_lo": betas[k],
+            "beta_hi": betas[k + 1],
+            "acceptance": swaps_accepted[k] / max(swaps_proposed[k], 1),
+            "proposed": swaps_proposed[k],
+        }
+        for k in range(len(slots) - 1)
+    ]
+    rows = [None] * len(cases)
+    for k, (c, chain, owner) in enumerate(zip(slots, chains, owners)):
+        if owner is None:
+            continue
+        chain.update(read_streams(*streams[k]))
+        chain["eps"] = eps[k]
+        chain["eps_trajectory"] = read_tuning(tunings[k])
+        with chain["timer"].phase("gauge_check"):
+            chain["gauge_abs_diff_max"] = gauge_check(links[k], rngs[k])
+        row = merge_chains(L, Lt, c["beta"], c["seed"], [chain], rngs[k], c["n_boot"])
+        # Acceptance of swaps with the next-higher slot (None for the highest one); the pairs
+        # list covers every swap up to the next case beta, rungs included.
+        row["swap_acceptance_up"] = pairs[k]["acceptance"] if k < len(pairs) else None
+        upper = next((n for n in range(k + 1, len(slots)) if owners[n] is not None), k)
+        row["swap_pairs"] = pairs[k:upper]
+        rows[owner] = row
+    return rows
+
+
+def iter_cases(cases: list[dict], workers: int, run=run_case) -> Iterator[tuple[int, object]]:
+    """Yield (case index, run(**case)) as cases finish; workers > 1 runs them in a process pool."""
+    if workers <= 1:
+        for i, kwargs in enumerate(cases):
+            yield i, run(**kwargs)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(run, **kwargs): i for i, kwargs in enumerate(cases)}
+        for fut in as_completed(futures):
+            yield futures[fut], fut.result()
+
+
 def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--time-extent-factor",
+        type=int,
+        default=1,
+        help="Run Lt x L^3 lattices with Lt = this factor times L; the fits stay in the spatial L.",
+    )
+    add_update_args(parser)
+    add_measurement_args(parser)
+    add_storage_args(parser)
+    parser.add_argument(
+        "--replicas",
+        type=int,
+        default=1,
+        help="Independent chains per case, each in its own process, merged before the fit.",
+    )
+    parser.add_argument(
+        "--tempering",
+        action="store_true",
+        help=(
+            "Run the betas of each L as one parallel-tempering ensemble: the chains advance"
+            " concurrently and swap configurations every sweeps_between sweeps (no checkpoints)."
+            " Swaps need neighbouring betas whose action distributions overlap, so the spacing"
+            " has to shrink as the volume grows (see --tempering-rungs)."
+        ),
+    )
+    parser.add_argument(
+        "--tempering-rungs",
+        type=int,
+        default=0,
+        help=(
+            "With --tempering, add N betas evenly spaced between each pair of neighbouring scan"
+            " betas; they are simulated to carry swaps but not measured or reported."
+        ),
+    )
+    parser.add_argument(
+        "--save-configs",
+        action="store_true",
+        help=f"Write every measured configuration to {CONFIG_DIR.relative_to(ROOT)}/.",
+    )
+    parser.add_argument(
+        "--checkpoint-every",
+        type=int,
+        default=10,
+        help=(
+            f"Checkpoint each chain to {CHECKPOINT_DIR.relative_to(ROOT)}/ every N thermalization"
+            " sweeps and every N measurements (0 disables)."
+        ),
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue every chain bit-exactly from its checkpoint, if it has one.",
+    )
+    parser.add_argument(
+        "--flush-every",
+        type=int,
+        default=10,
+        help=(
+            f"Flush each chain's per-config records in {STREAM_DIR.relative_to(ROOT)}/ to disk"
+            " every N measurements."
+        ),
+    )
+    parser.add_argument(
+        "--trace",
+        type=Path,
+        default=None,
+        help=(
+            "Also write every timed phase of every case as a Chrome trace-event file"
+            " (chrome://tracing, Perfetto), one process row per case."
+        ),
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Run independent (L, beta) cases in a pool of this many processes.",
+    )
+    args = parser.parse_args()
+    if args.tempering and (args.replicas > 1 or args.resume):
+        parser.error("--tempering does not combine with --replicas or --resume")
+    if args.tempering_rungs < 0 or (args.tempering_rungs and not args.tempering):
+        parser.error("--tempering-rungs needs --tempering and a non-negative count")
+
+    run_start = time.perf_counter()
     REPORTS.mkdir(parents=True, exist_ok=True)
-    L_values = [4, 6, 8]
-    betas = [2.1, 2.3]
-    rows = []
+    smearing = smearing_from_args(args)
+    hmc_options = hmc_options_from_args(args)
+    cases = []
     seed = 121
-    for L in L_values:
-        for b in betas:
-            # Keep runtime controlled as L grows.
-            if L <= 6:
-                cfg = 20
-                therm = 20
-                sep = 2
-            else:
-                cfg = 14
-                therm = 14
-                sep = 1
-            rows.append(
-                run_case(
-                    L,
-                    b,
+    for L in L_VALUES:
+        for b in BETAS:
+            therm, cfg, sep = chain_budget(L)
+            cases.append(
+                dict(
+                    L=L,
+                    Lt=args.time_extent_factor * L,
+                    beta=b,
                     seed=seed,
                     n_therm=therm,
                     n_cfg=cfg,
                     sweeps_between=sep,
                     n_boot=120,
+                    sweep=args.sweep,
+                    layout=args.links,
+                    precision=args.precision,
+                    reunitarize_every=args.reunitarize_every,
+                    n_overrelax=args.overrelax,
+                    hmc_options=hmc_options,
+                    loop_estimator=args.loop_estimator,
+                    multilevel_sub=args.multilevel_sub,
+                    smearing=smearing,
+                    eps=args.eps,
+                    target_acceptance=args.target_acceptance if args.adaptive_eps else None,
+                    n_replicas=args.replicas,
+                    config_dir=CONFIG_DIR if args.save_configs else None,
+                    checkpoint_dir=CHECKPOINT_DIR if args.checkpoint_every > 0 else None,
+                    checkpoint_every=args.checkpoint_every,
+                    resume=args.resume,
+                    stream_dir=STREAM_DIR,
+                    flush_every=args.flush_every,
+                    trace=args.trace is not None,
                 )
             )
             seed += 1
 
+    # Rows are streamed to the CSV in completion order, then rewritten in case order so
+    # the final table (and everything derived from it) does not depend on --workers.
+    results: list[dict | None] = [None] * len(cases)
+    replica_rows: list[list[dict]] = [[] for _ in cases]
+    eps_tuning: list[dict] = [{} for _ in cases]
+    timers: list[PhaseTimer] = [PhaseTimer() for _ in cases]
+    swap_pairs: list[list[dict]] = [[] for _ in cases]
+    with OUT_CSV.open("w", newline="") as f:
+        writer = None
+        if args.tempering:
+            # One job per L holding all its betas; its rows come back in case order.
+            groups = [[i for i, c in enumerate(cases) if c["L"] == L] for L in L_VALUES]
+            jobs = [{"cases": [cases[i] for i in group], "rungs": args.tempering_rungs} for group in groups]
+            finished = (
+                (groups[g][k], row)
+                for g, group_rows in iter_cases(jobs, args.workers, run_tempered)
+                for k, row in enumerate(group_rows)
+            )
+        else:
+            finished = iter_cases(cases, args.workers)
+        for done, (i, row) in enumerate(finished, start=1):
+            replica_rows[i] = [{"L": row["L"], "beta": row["beta"], **r} for r in row.pop("replicas")]
+            eps_tuning[i] = {
+                "L": row["L"],
+                "beta": row["beta"],
+                "tuned_eps": row["proposal_eps"],
+                "trajectories": row.pop("eps_trajectories"),
+            }
+            timers[i] = row.pop("timer")
+            swap_pairs[i] = row.pop("swap_pairs", [])
+            results[i] = row
+            if writer is None:
+                writer = csv.DictWriter(f, fieldnames=list(row.keys()))
+                writer.writeheader()
+            writer.writerow(row)
+            f.flush()
+            print(f"Finished case L={row['L']} beta={row['beta']} ({done}/{len(cases)})")
+    rows = [r for r in results if r is not None]
+    total_timer = PhaseTimer()
+    for timer in timers:
+        total_timer.merge(timer)
+
     with OUT_CSV.open("w", newline="") as f:
         writer = csv.DictWriter(f, fieldnames=list(rows[0].keys()))
         writer.writeheader()
         writer.writerows(rows)
+    if args.replicas > 1:
+        flat = [r for case_rows in replica_rows for r in case_rows]
+        with OUT_REPLICAS_CSV.open("w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=list(flat[0].keys()))
+            writer.writeheader()
+            writer.writerows(flat)
 
     mass_pos = sum(1 for r in rows if r["m_eff_positive"])
     max_gdiff = max(r["gauge_abs_diff_max"] for r in rows)
     by_beta = {}
-    for b in betas:
+    for b in BETAS:
         sub = [r for r in rows if abs(r["beta"] - b) < 1e-12]
         # Linear fit m(L) ~ m_inf + c/L
         x = np.array([1.0 / r["L"] for r in sub], dtype=float)
@@ -330,34 +983,100 @@ def main() -> None:
             "m_L_values": [float(r["m_boot_mean"]) for r in sub],
             "L_values": [int(r["L"]) for r in sub],
         }
+    # Replica-exchange acceptance between neighbouring ensemble betas (rungs included) at each L.
+    swap_acceptance = {}
+    tempering_warnings = []
+    if args.tempering:
+        for L in L_VALUES:
+            group = sorted((i for i, c in enumerate(cases) if c["L"] == L), key=lambda i: cases[i]["beta"])
+            swap_acceptance[str(L)] = {
+                f"{p['beta_lo']:g}-{p['beta_hi']:g}": p["acceptance"] for i in group for p in swap_pairs[i]
+            }
+            tempering_warnings += [
+                f"L={L}: no swaps accepted between beta {pair}; add --tempering-rungs or narrow the spacing"
+                for pair, acc in swap_acceptance[str(L)].items()
+                if acc == 0.0
+            ]
+        for warning in tempering_warnings:
+            print(f"WARNING: {warning}")
 
     summary = {
         "cases": len(rows),
+        "sweep": args.sweep,
+        "time_extent_factor": args.time_extent_factor,
+        "link_layout": args.links,
+        "precision": args.precision,
+        "reunitarize_every": args.reunitarize_every,
+        "n_overrelax": args.overrelax if args.sweep == "heatbath" else 0,
+        "hmc": hmc_options if args.sweep == "hmc" else None,
+        "loop_estimator": args.loop_estimator,
+        "multilevel_sub": args.multilevel_sub if args.loop_estimator == "multilevel" else 0,
+        "smearing": smearing,
+        "n_replicas": args.replicas,
+        "tempering": args.tempering,
+        "stream_dir": str(STREAM_DIR),
+        "flush_every": args.flush_every,
+        "tempering_rungs": args.tempering_rungs if args.tempering else 0,
+        "swap_acceptance": swap_acceptance,
+        "tempering_warnings": tempering_warnings,
         "mass_positive_cases": mass_pos,
         "max_gauge_abs_diff": max_gdiff,
+        "max_unitarity_drift": max(r["unitarity_drift_max"] for r in rows),
         "beta_fits": by_beta,
+        "tau_int_max": {k: max(r[k] for r in rows) for k in TAU_KEYS},
+        "adaptive_eps": args.adaptive_eps,
+        "target_acceptance": args.target_acceptance if args.adaptive_eps else None,
+        "eps_tuning": eps_tuning if args.adaptive_eps else [],
+        "sweeps_between": {str(c["L"]): c["sweeps_between"] for c in cases},
         "status": "PASS" if mass_pos == len(rows) and max_gdiff < 1e-10 else "MIXED",
     }
     OUT_JSON.write_text(json.dumps(summary, indent=2))
+    timing = {
+        "wall_time_s": time.perf_counter() - run_start,
+        "workers": args.workers,
+        # Summed over cases (and replicas), so concurrent workers add up to more than the wall time.
+        "timing_total": total_timer.summary(),
+        "timing": [{"L": c["L"], "beta": c["beta"], **t.summary()} for c, t in zip(cases, timers)],
+        "trace": None if args.trace is None else str(args.trace),
+    }
+    OUT_TIMING_JSON.write_text(json.dumps(timing, indent=2))
     lines = [
         "# Real SU(2) Scaling Scan Summary",
         "",
         f"- Cases: `{summary['cases']}`",
         f"- Positive mass cases: `{summary['mass_positive_cases']}`",
         f"- Max gauge-orbit |delta|: `{summary['max_gauge_abs_diff']:.3e}`",
+        f"- Max unitarity drift max|U^dag U - 1|: `{summary['max_unitarity_drift']:.3e}`"
+        f" (reunitarized every `{args.reunitarize_every}` sweeps)",
+        "- Max tau_int (configs): "
+        + ", ".join(f"{k.removesuffix('_tau_int')} `{v:.2f}`" for k, v in summary["tau_int_max"].items()),
+        *(
+            f"- Swap acceptance at L={L}: " + ", ".join(f"{pair} `{acc:.3f}`" for pair, acc in pairs.items())
+            for L, pairs in swap_acceptance.items()
+        ),
+        *(f"- Warning: {warning}" for warning in tempering_warnings),
         f"- Status: `{summary['status']}`",
         "",
-        f"Data table: `{OUT_CSV.name}`",
+        f"Data table: `{OUT_CSV.name}`; wall time and throughput per phase: `{OUT_TIMING_JSON.name}`",
         "",
         "## Finite-Size Extrapolation",
     ]
-    for b in betas:
+    for b in BETAS:
         fit = by_beta[str(b)]
         lines.append(f"- beta={b}: m_inf (linear in 1/L) = `{fit['m_inf_linear_1_over_L']}`")
     OUT_MD.write_text("\n".join(lines))
     print(f"Wrote: {OUT_CSV}")
+    if args.replicas > 1:
+        print(f"Wrote: {OUT_REPLICAS_CSV}")
     print(f"Wrote: {OUT_JSON}")
     print(f"Wrote: {OUT_MD}")
+    print(f"Wrote: {OUT_TIMING_JSON} (wall time {timing['wall_time_s']:.1f} s)")
+    if args.trace is not None:
+        # One trace process per case, whichever worker processes actually ran it.
+        events = [{**e, "pid": i} for i, timer in enumerate(timers) for e in timer.events]
+        labels = {i: f"L={c['L']} beta={c['beta']}" for i, c in enumerate(cases)}
+        write_chrome_trace(args.trace, events, labels)
+        print(f"Wrote: {args.trace}")
     print(f"Status: {summary['status']}")
 
 
@@ -0,0 +1,173 @@
+"""Shared SU(2) lattice-gauge kernels for the mass-gap audits.
+
+Every audit script imports from here, so each kernel has exactly one implementation.
+Scripts in audits/ put mass_gap_rebuild/ on sys.path and `import lattice`.
+"""
+
+from __future__ import annotations
+
+from .su2 import (
+    LAYOUTS,
+    PRECISIONS,
+    su2_from_quaternion,
+    quaternion_from_su2,
+    link_layout,
+    link_ndim,
+    as_layout,
+    link_dtype,
+    as_precision,
+    reunitarize,
+    unitarity_violation,
+    random_su2,
+    random_su2_near_identity,
+    random_su2_near_identity_batch,
+    dagger,
+    matmul2,
+    quat_mul,
+    quat_conj,
+    link_mul,
+    link_dag,
+    link_retr,
+    retrace_product,
+    link_identity,
+    link_norm,
+)
+from .links import (
+    direction,
+    lattice_shape,
+    lattice_extents,
+    shift_idx,
+    init_links,
+    flat_links,
+    neighbor_table,
+    parity_sites,
+    staple,
+    staple_sites,
+    gauge_transform,
+    random_gauge_field,
+)
+from .updates import (
+    metropolis_sweep,
+    metropolis_sweep_checkerboard,
+    kennedy_pendleton_x0,
+    heatbath_links,
+    overrelax_links,
+    heatbath_sweep,
+    SWEEPS,
+    TUNABLE_SWEEPS,
+    EPS_RANGE,
+    make_sweep,
+    tune_eps,
+)
+from .hmc import (
+    INTEGRATORS,
+    OMELYAN_LAMBDA,
+    wilson_action,
+    su2_vector_part,
+    hmc_force,
+    exp_su2,
+    md_trajectory,
+    hamiltonian,
+    hmc_sweep,
+    hmc_reversibility,
+    HMCLog,
+    hmc_diagnostics,
+)
+from .observables import (
+    plaquette_trace,
+    plaquette_field,
+    avg_plaquette,
+    line_products,
+    plane_wilson_loop,
+    wilson_loop,
+    wilson_loop_plane01,
+    wilson_loop_table,
+    polyakov_loop_field,
+    polyakov_loop,
+    polyakov_correlator,
+    radial_average,
+    creutz_ratios,
+    momentum_label,
+    timeslice_operators,
+    timeslice_spatial_plaquette_sum,
+)
+from .noise_reduction import (
+    LOOP_ESTIMATORS,
+    bessel_ratio_i2_i1,
+    multihit_links,
+    multihit_wilson_loop_table,
+    slab_active_mask,
+    multilevel_wilson_loop_table,
+    measure_wilson_loops,
+)
+from .smearing import (
+    SMEARINGS,
+    spatial_staple_sum,
+    smear_step,
+    smear_links,
+    smeared_timeslice_operators,
+)
+from .precision import (
+    plaquette_chain,
+    precision_agreement,
+)
+from .tempering import (
+    plaquette_action,
+    swap_probability,
+    propose_swaps,
+)
+from .online import (
+    Welford,
+    BinningAccumulator,
+    RecordLog,
+    read_record_column,
+    read_records,
+    ArrayLog,
+)
+from .timing import (
+    PhaseTimer,
+    write_chrome_trace,
+)
+from .analysis import (
+    timeslice_autocorrelations,
+    connected_correlator_from_ensemble,
+    effective_mass_cosh,
+    plateau_mass,
+    mass_from_ops,
+    bootstrap_mass,
+    timeslice_cross_correlations,
+    correlator_matrix,
+    gevp,
+    gevp_masses,
+    bootstrap_gevp_masses,
+    autocorrelation,
+    integrated_autocorr,
+    integrated_autocorr_time,
+    max_autocorr_time,
+    block_size,
+    blocked_jackknife,
+)
+from .config_store import (
+    MAGIC,
+    HEADER_BYTES,
+    SUFFIX,
+    CHECKPOINT_SUFFIX,
+    lattice_label,
+    config_path,
+    payload_checksum,
+    write_config,
+    read_header,
+    load_config,
+    list_configs,
+    checkpoint_path,
+    save_checkpoint,
+    load_checkpoint,
+    stream_path,
+)
+from .cli import (
+    add_update_args,
+    add_measurement_args,
+    add_storage_args,
+    hmc_options_from_args,
+    smearing_from_args,
+)
@@ -0,0 +1,201 @@
+"""Ensemble analysis: connected correlators, effective masses, bootstrap, autocorrelation."""
+
+from __future__ import annotations
+
+import math
+
+import numpy as np
+
+
+def timeslice_autocorrelations(ops: np.ndarray) -> np.ndarray:
+    """A[..., dt] = mean_t ops[..., t] ops[..., t + dt] (periodic), via an FFT along the last axis."""
+    Lt = ops.shape[-1]
+    f = np.fft.rfft(ops, axis=-1)
+    return np.fft.irfft(f * np.conj(f), n=Lt, axis=-1) / Lt
+
+
+def connected_correlator_from_ensemble(ops: np.ndarray) -> np.ndarray:
+    """C(dt) = <(O(t) - <O>)(O(t + dt) - <O>)> over configs and t, for ops of shape (n_cfg, Lt)."""
+    return timeslice_autocorrelations(ops - np.mean(ops)).mean(axis=0)
+
+
+def effective_mass_cosh(C: np.ndarray) -> np.ndarray:
+    """arccosh((C(t-1) + C(t+1)) / 2C(t)) for t = 1..Lt-2 along the last axis; NaN where undefined."""
+    C = np.asarray(C, dtype=float)
+    mid = C[..., 1:-1]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        arg = (C[..., :-2] + C[..., 2:]) / (2.0 * mid)
+        return np.where((mid > 0) & (arg >= 1.0), np.arccosh(np.maximum(arg, 1.0)), np.nan)
+
+
+def plateau_mass(meff: np.ndarray) -> np.ndarray:
+    """Mean of the finite effective masses along the last axis (NaN if there are none)."""
+    valid = np.isfinite(meff)
+    n = valid.sum(axis=-1)
+    total = np.where(valid, meff, 0.0).sum(axis=-1)
+    with np.errstate(invalid="ignore"):
+        return np.where(n > 0, total / np.maximum(n, 1), np.nan)
+
+
+def mass_from_ops(ops: np.ndarray) -> float:
+    return float(plateau_mass(effective_mass_cosh(connected_correlator_from_ensemble(ops))))
+
+
+def bootstrap_mass(
+    ops: np.ndarray, rng: np.random.Generator, n_boot: int = 100, block: int = 1
+) -> tuple[float, float, float]:
+    """Bootstrap mean, std and 68% half-width of `mass_from_ops` over config resamples.
+
+    Resamples draw whole blocks of `block` consecutive configs (a trailing partial block
+    is dropped), so autocorrelated chains are not treated as independent; choose it with
+    `block_size`. All resamples are drawn at once and stored as multiplicities, so each
+    resampled correlator is a weighted average of per-config autocorrelations computed
+    once: C_b(dt) = <A_c(dt)>_b - <s_c>_b^2 with s_c the config's timeslice mean.
+    """
+    n_blocks = ops.shape[0] // block
+    ops = ops[: n_blocks * block]
+    ops = ops - np.mean(ops)  # C is shift invariant; centering avoids cancellation below
+    A = timeslice_autocorrelations(ops)
+    s = ops.mean(axis=1)
+    idx = rng.integers(0, n_blocks, size=(n_boot, n_blocks))
+    rows = np.repeat(np.arange(n_boot), n_blocks)
+    counts = np.bincount(rows * n_blocks + idx.ravel(), minlength=n_boot * n_blocks).reshape(n_boot, n_blocks)
+    weights = np.repeat(counts, block, axis=1) / (n_blocks * block)
+    C = weights @ A - (weights @ s)[:, None] ** 2
+    arr = plateau_mass(effective_mass_cosh(C))
+    arr = arr[np.isfinite(arr)]
+    if not arr.size:
+        return float("nan"), float("nan"), float("nan")
+    lo, hi = np.quantile(arr, [0.16, 0.84])
+    return float(np.mean(arr)), float(np.std(arr)), float(0.5 * (hi - lo))
+
+
+def timeslice_cross_correlations(ops: np.ndarray) -> np.ndarray:
+    """A[..., i, j, dt] = mean_t ops[..., i, t] ops[..., j, t + dt] (periodic), via one FFT."""
+    Lt = ops.shape[-1]
+    f = np.fft.rfft(ops, axis=-1)
+    return np.fft.irfft(np.conj(f)[..., :, None, :] * f[..., None, :, :], n=Lt, axis=-1) / Lt
+
+
+def correlator_matrix(ops: np.ndarray) -> np.ndarray:
+    """Symmetrized connected C_ij(dt), shape (Lt, n_ops, n_ops), for ops of shape (n_cfg, n_ops, Lt)."""
+    ops = ops - ops.mean(axis=(0, 2), keepdims=True)
+    C = np.moveaxis(timeslice_cross_correlations(ops).mean(axis=0), -1, 0)
+    return 0.5 * (C + np.swapaxes(C, -1, -2))
+
+
+def gevp(C: np.ndarray, t0: int = 1) -> np.ndarray:
+    """Principal correlators lambda_n(t) of C(t) v = lambda(t) C(t0) v, shape (..., n, Lt).
+
+    C has shape (..., Lt, n, n), and every t (and every bootstrap sample in the leading
+    axes) is solved in one batched eigvalsh call on M(t) = C(t0)^{-1/2} C(t) C(t0)^{-1/2}.
+    Eigenvalues are sorted per t, largest (lightest state) first, and lambda_n(t0) = 1.
+    Directions where C(t0) is not positive (noise) are projected out; they give lambda = 0
+    and hence a NaN effective mass.
+    """
+    w, V = np.linalg.eigh(C[..., t0, :, :])
+    keep = w > 1e-12 * np.max(np.abs(w), axis=-1, keepdims=True)
+    inv_sqrt = np.where(keep, 1.0 / np.sqrt(np.where(keep, w, 1.0)), 0.0)
+    R = (V * inv_sqrt[..., None, :])[..., None, :, :]
+    M = np.swapaxes(R, -1, -2) @ C @ R
+    lam = np.linalg.eigvalsh(M)[..., ::-1]
+    return np.swapaxes(lam, -1, -2)
+
+
+def gevp_masses(C: np.ndarray, t0: int = 1) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Principal correlators, their cosh effective masses and plateau masses, one per state.
+
+    meff[..., t - 1] belongs to timeslice t; plateaus only use t > t0, since the window
+    around t0 mixes in lambda(t0 - 1).
+    """
+    lam = gevp(C, t0)
+    meff = effective_mass_cosh(lam)
+    return lam, meff, plateau_mass(meff[..., t0:])
+
+
+def bootstrap_gevp_masses(
+    ops: np.ndarray, rng: np.random.Generator, n_boot: int = 100, block: int = 1, t0: int = 1
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Per-state bootstrap mean, std and 68% half-width of the GEVP plateau masses.
+
+    ops has shape (n_cfg, n_ops, Lt). Resampling works as in `bootstrap_mass`: per-config
+    cross-correlations are computed once and every resampled correlator matrix is a
+    weighted average of them, after which all n_boot GEVPs are solved in one batch.
+    """
+    n_blocks = ops.shape[0] // block
+    ops = ops[: n_blocks * block]
+    ops = ops - ops.mean(axis=(0, 2), keepdims=True)
+    A = timeslice_cross_correlations(ops)  # (n_cfg, n, n, Lt)
+    s = ops.mean(axis=2)  # (n_cfg, n)
+    idx = rng.integers(0, n_blocks, size=(n_boot, n_blocks))
+    rows = np.repeat(np.arange(n_boot), n_blocks)
+    counts = np.bincount(rows * n_blocks + idx.ravel(), minlength=n_boot * n_blocks).reshape(n_boot, n_blocks)
+    weights = np.repeat(counts, block, axis=1) / (n_blocks * block)
+    mean_s = weights @ s
+    C = np.einsum("bc,cijt->btij", weights, A) - (mean_s[:, :, None] * mean_s[:, None, :])[:, None]
+    C = 0.5 * (C + np.swapaxes(C, -1, -2))
+    masses = gevp_masses(C, t0)[2]  # (n_boot, n_states)
+    out = np.full((3, masses.shape[1]), np.nan)
+    for n, arr in enumerate(masses.T):
+        arr = arr[np.isfinite(arr)]
+        if arr.size:
+            lo, hi = np.quantile(arr, [0.16, 0.84])
+            out[:, n] = np.mean(arr), np.std(arr), 0.5 * (hi - lo)
+    return out[0], out[1], out[2]
+
+
+def autocorrelation(x: np.ndarray) -> np.ndarray:
+    """Normalized autocorrelation rho(t), t = 0..n-1, from one zero-padded FFT.
+
+    rho(t) = mean_i(dx_i dx_{i+t}) / var with the (n - t)-term average at each lag.
+    """
+    x = np.asarray(x, dtype=float) - np.mean(x)
+    n = x.size
+    f = np.fft.rfft(x, n=2 * n)
+    acov = np.fft.irfft(f * np.conj(f), n=2 * n)[:n] / np.arange(n, 0, -1)
+    return acov / acov[0]
+
+
+def integrated_autocorr(x: np.ndarray, c: float = 6.0) -> tuple[float, float, int]:
+    """Madras-Sokal windowed (tau_int, its error, window W) of a Monte Carlo time series.
+
+    tau_int(W) = 1/2 + sum_{t<=W} rho(t), with W the first lag satisfying W >= c tau_int(W);
+    the error estimate is tau_int sqrt(2 (2W + 1) / n). tau_int is clamped below at 1/2
+    (uncorrelated), which short noisy series can otherwise undershoot.
+    """
+    x = np.asarray(x, dtype=float)
+    n = x.size
+    if n < 2 or np.var(x) <= 0.0:
+        return 0.5, 0.0, 0
+    tau = 0.5 + np.cumsum(autocorrelation(x)[1:])
+    lags = np.arange(1, n)
+    hit = np.flatnonzero(lags >= c * tau)
+    W = int(lags[hit[0]]) if hit.size else n - 1
+    tau_w = max(float(tau[W - 1]), 0.5)
+    return tau_w, tau_w * math.sqrt(2.0 * (2 * W + 1) / n), W
+
+
+def integrated_autocorr_time(x: np.ndarray, c: float = 6.0) -> float:
+    return integrated_autocorr(x, c)[0]
+
+
+def max_autocorr_time(series: np.ndarray, c: float = 6.0) -> float:
+    """Largest tau_int over the columns of an (n, k) series, e.g. the timeslices of ops."""
+    series = np.asarray(series, dtype=float).reshape(len(series), -1)
+    return max(integrated_autocorr_time(col, c) for col in series.T)
+
+
+def block_size(tau_int: float, n: int) -> int:
+    """Block length ceil(2 tau_int) for blocked resampling, keeping at least two blocks."""
+    return max(1, min(math.ceil(2.0 * tau_int), n // 2))
+
+
+def blocked_jackknife(x: np.ndarray, block: int = 1) -> tuple[float, float]:
+    """Mean of x and its delete-one-block jackknife error over blocks of `block` samples."""
+    x = np.asarray(x, dtype=float)
+    n_blocks = x.size // block
+    if n_blocks < 2:
+        return float(np.mean(x)), float("nan")
+    means = x[: n_blocks * block].reshape(n_blocks, block).mean(axis=1)
+    jk = (means.sum() - means) / (n_blocks - 1)
+    return float(np.mean(x)), float(math.sqrt((n_blocks - 1) * np.mean((jk - jk.mean()) ** 2)))
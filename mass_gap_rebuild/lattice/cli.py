@@ -0,0 +1,140 @@
+"""Command-line options shared by the audit drivers.
+
+Each `add_*_args` function adds one group of options to an argparse parser, with the same
+names, defaults and help texts in every driver; the `*_from_args` helpers turn the parsed
+options into the keyword dictionaries the kernels take.
+"""
+
+from __future__ import annotations
+
+import argparse
+
+from .hmc import INTEGRATORS
+from .noise_reduction import LOOP_ESTIMATORS
+from .smearing import SMEARINGS
+from .su2 import LAYOUTS, PRECISIONS
+from .updates import SWEEPS
+
+
+def add_update_args(parser: argparse.ArgumentParser) -> None:
+    """Link update: sweep kind, heatbath/HMC settings and the Metropolis proposal width."""
+    parser.add_argument(
+        "--sweep",
+        choices=sorted(SWEEPS),
+        default="site",
+        help=(
+            "Link update: per-site or checkerboard Metropolis, checkerboard"
+            " Kennedy-Pendleton heatbath plus overrelaxation, or whole-lattice HMC."
+        ),
+    )
+    parser.add_argument(
+        "--overrelax",
+        type=int,
+        default=1,
+        help="Overrelaxation sweeps per heatbath sweep (heatbath only).",
+    )
+    parser.add_argument(
+        "--hmc-step",
+        type=float,
+        default=0.1,
+        help="HMC molecular-dynamics step size (hmc only).",
+    )
+    parser.add_argument(
+        "--hmc-steps",
+        type=int,
+        default=10,
+        help="Molecular-dynamics steps per HMC trajectory; trajectory length is their product.",
+    )
+    parser.add_argument(
+        "--integrator",
+        choices=INTEGRATORS,
+        default="omelyan",
+        help="HMC integrator: leapfrog or second-order minimum-norm (Omelyan).",
+    )
+    parser.add_argument(
+        "--eps",
+        type=float,
+        default=0.25,
+        help="Metropolis proposal width (initial value with --adaptive-eps).",
+    )
+    parser.add_argument(
+        "--adaptive-eps",
+        action="store_true",
+        help="Tune eps after every thermalization sweep toward --target-acceptance, then freeze it.",
+    )
+    parser.add_argument(
+        "--target-acceptance",
+        type=float,
+        default=0.5,
+        help="Acceptance rate aimed for by --adaptive-eps.",
+    )
+
+
+def add_measurement_args(parser: argparse.ArgumentParser) -> None:
+    """Wilson-loop estimator and the smearing of the glueball operator basis."""
+    parser.add_argument(
+        "--loop-estimator",
+        choices=LOOP_ESTIMATORS,
+        default="plain",
+        help=(
+            "Wilson-loop estimator: plain links, multi-hit integrated T-sides (R >= 2), or the"
+            " two-level scheme averaging time-slab tensors over --multilevel-sub sub-updates."
+        ),
+    )
+    parser.add_argument(
+        "--multilevel-sub",
+        type=int,
+        default=10,
+        help="Heatbath sub-updates per slab for --loop-estimator multilevel.",
+    )
+    parser.add_argument(
+        "--smear",
+        choices=SMEARINGS,
+        default="ape",
+        help="Spatial smearing applied to a copy of the links before glueball operators are built.",
+    )
+    parser.add_argument(
+        "--smear-alpha",
+        type=float,
+        default=0.5,
+        help="Smearing strength; each spatial staple enters with weight alpha / 4.",
+    )
+    parser.add_argument(
+        "--smear-levels",
+        type=int,
+        nargs="+",
+        default=[0],
+        help="Smearing levels of the operator basis; the highest one drives the mass estimate.",
+    )
+
+
+def add_storage_args(parser: argparse.ArgumentParser) -> None:
+    """Link layout and precision, and how often links are projected back onto SU(2)."""
+    parser.add_argument(
+        "--links",
+        choices=LAYOUTS,
+        default="matrix",
+        help="Link storage: 2x2 complex128 matrices or 4-real quaternions (half the memory).",
+    )
+    parser.add_argument(
+        "--precision",
+        choices=PRECISIONS,
+        default="double",
+        help="Link storage precision for the updates; observables are always measured in float64.",
+    )
+    parser.add_argument(
+        "--reunitarize-every",
+        type=int,
+        default=10,
+        help="Project links back onto SU(2) every N sweeps, at either precision (0 disables).",
+    )
+
+
+def hmc_options_from_args(args: argparse.Namespace) -> dict:
+    """step_size, n_steps and integrator for `make_sweep` and the "hmc" sweep."""
+    return {"step_size": args.hmc_step, "n_steps": args.hmc_steps, "integrator": args.integrator}
+
+
+def smearing_from_args(args: argparse.Namespace) -> dict:
+    """method, alpha and the sorted distinct levels of the operator basis."""
+    return {"method": args.smear, "alpha": args.smear_alpha, "levels": sorted(set(args.smear_levels))}
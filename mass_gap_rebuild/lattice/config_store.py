@@ -0,0 +1,187 @@
+"""On-disk SU(2) gauge-configuration format shared by the real SU(2) audits.
+
+File layout (little-endian, one configuration per file):
+- bytes [0, 8): magic `SU2CFG01`
+- bytes [8, HEADER_BYTES): UTF-8 JSON header padded with spaces, ending in a newline
+  (L, beta, seed, sweep index, array shape/dtype, CRC32 of the payload, extras); L is one
+  extent for hypercubic lattices and the list (Lt, Lx, ...) otherwise
+- bytes [HEADER_BYTES, ...): the raw C-ordered link array
+
+The payload starts at a fixed offset, so a configuration reloads as a read-only
+`np.memmap` without copying the link array into memory.
+
+Checkpoints of a running Markov chain are a JSON file (run parameters, RNG bit-generator
+state, counters, measurements so far) naming a config file that holds the links. The JSON
+is replaced last, so a run killed mid-write still resumes from the previous checkpoint.
+Per-configuration measurements are streamed to record files tagged like the checkpoint
+(see lattice.online), which a resumed run truncates back to the checkpointed count.
+"""
+
+from __future__ import annotations
+
+import json
+import zlib
+from pathlib import Path
+
+import numpy as np
+
+
+MAGIC = b"SU2CFG01"
+HEADER_BYTES = 512
+SUFFIX = ".su2cfg"
+CHECKPOINT_SUFFIX = ".ckpt.json"
+
+
+def lattice_label(L: int | tuple[int, ...]) -> str:
+    """File-name tag: "8" for an 8^d lattice (given as 8 or (8, 8, 8, 8)), else e.g. "24x8x8x8"."""
+    extents = [int(n) for n in np.atleast_1d(L)]
+    return str(extents[0]) if len(set(extents)) == 1 else "x".join(map(str, extents))
+
+
+def _extent_header(L: int | tuple[int, ...]) -> int | list[int]:
+    extents = [int(n) for n in np.atleast_1d(L)]
+    return extents[0] if len(set(extents)) == 1 else extents
+
+
+def config_path(
+    directory: Path, L: int | tuple[int, ...], beta: float, seed: int, sweep_index: int, replica: int = 0
+) -> Path:
+    name = f"su2_L{lattice_label(L)}_b{beta:g}_s{seed}_r{replica}_sw{sweep_index:07d}{SUFFIX}"
+    return Path(directory) / name
+
+
+def payload_checksum(buf: np.ndarray) -> int:
+    return zlib.crc32(np.ascontiguousarray(buf).reshape(-1).view(np.uint8)) & 0xFFFFFFFF
+
+
+def write_config(
+    path: Path,
+    U: np.ndarray,
+    *,
+    L: int | tuple[int, ...],
+    beta: float,
+    seed: int,
+    sweep_index: int,
+    **extra: object,
+) -> Path:
+    """Write one link array with its header; extra keyword arguments go into the header."""
+    U = np.ascontiguousarray(U)
+    header = {
+        "format": MAGIC.decode(),
+        "L": _extent_header(L),
+        "beta": float(beta),
+        "seed": int(seed),
+        "sweep_index": int(sweep_index),
+        "shape": list(U.shape),
+        "dtype": U.dtype.str,
+        "checksum_crc32": payload_checksum(U),
+        **extra,
+    }
+    blob = json.dumps(header, sort_keys=True).encode()
+    room = HEADER_BYTES - len(MAGIC) - 1
+    if len(blob) > room:
+        raise ValueError(f"Config header too large ({len(blob)} > {room} bytes)")
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    with tmp.open("wb") as f:
+        f.write(MAGIC + blob.ljust(room) + b"\n")
+        f.write(U.reshape(-1).view(np.uint8))
+    tmp.replace(path)
+    return path
+
+
+def read_header(path: Path) -> dict:
+    with Path(path).open("rb") as f:
+        head = f.read(HEADER_BYTES)
+    if len(head) < HEADER_BYTES or not head.startswith(MAGIC):
+        raise ValueError(f"Not an SU(2) config file: {path}")
+    return json.loads(head[len(MAGIC) :].decode())
+
+
+def load_config(path: Path, verify: bool = True) -> tuple[np.memmap, dict]:
+    """Memory-map the link array of one configuration; optionally check its CRC32."""
+    header = read_header(path)
+    U = np.memmap(
+        path,
+        dtype=np.dtype(header["dtype"]),
+        mode="r",
+        offset=HEADER_BYTES,
+        shape=tuple(header["shape"]),
+    )
+    if verify and payload_checksum(U) != header["checksum_crc32"]:
+        raise ValueError(f"Checksum mismatch in config file: {path}")
+    return U, header
+
+
+def list_configs(directory: Path) -> list[Path]:
+    return sorted(Path(directory).rglob(f"*{SUFFIX}"))
+
+
+def checkpoint_path(
+    directory: Path, run: str, L: int | tuple[int, ...], beta: float, seed: int, replica: int = 0
+) -> Path:
+    return Path(directory) / f"{run}_L{lattice_label(L)}_b{beta:g}_s{seed}_r{replica}{CHECKPOINT_SUFFIX}"
+
+
+def save_checkpoint(
+    path: Path,
+    U: np.ndarray,
+    rng: np.random.Generator,
+    *,
+    params: dict,
+    L: int | tuple[int, ...],
+    beta: float,
+    seed: int,
+    sweep_index: int,
+    **state: object,
+) -> Path:
+    """Checkpoint links, RNG state and the JSON-serializable chain `state` at `sweep_index`.
+
+    `params` identifies the run; `load_checkpoint` refuses to resume under different ones.
+    """
+    path = Path(path)
+    stem = path.name.removesuffix(CHECKPOINT_SUFFIX)
+    links = write_config(
+        path.with_name(f"{stem}_sw{sweep_index:07d}{SUFFIX}"),
+        U,
+        L=L,
+        beta=beta,
+        seed=seed,
+        sweep_index=sweep_index,
+        checkpoint=True,
+    )
+    previous = json.loads(path.read_text())["links"] if path.exists() else None
+    doc = {
+        "params": params,
+        "links": links.name,
+        "sweep_index": int(sweep_index),
+        "rng_state": rng.bit_generator.state,
+        **state,
+    }
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_text(json.dumps(doc))
+    tmp.replace(path)
+    if previous is not None and previous != links.name:
+        path.with_name(previous).unlink(missing_ok=True)
+    return path
+
+
+def load_checkpoint(path: Path, params: dict) -> tuple[np.ndarray, dict]:
+    """Return a writable copy of the checkpointed links and the checkpoint document.
+
+    Restore the chain's generator with `rng.bit_generator.state = doc["rng_state"]`.
+    """
+    path = Path(path)
+    doc = json.loads(path.read_text())
+    if doc["params"] != params:
+        raise ValueError(f"Checkpoint {path} was written with different run parameters: {doc['params']}")
+    U, _ = load_config(path.with_name(doc["links"]))
+    return np.array(U), doc
+
+
+def stream_path(
+    directory: Path, run: str, L: int | tuple[int, ...], beta: float, seed: int, name: str, replica: int = 0
+) -> Path:
+    """Per-configuration record file `name` (e.g. "obs.csv") of a run, tagged like its checkpoint."""
+    return Path(directory) / f"{run}_L{lattice_label(L)}_b{beta:g}_s{seed}_r{replica}_{name}"
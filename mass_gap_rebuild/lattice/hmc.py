@@ -0,0 +1,221 @@
+"""Hybrid Monte Carlo for the SU(2) Wilson action, vectorized over the whole lattice.
+
+Momenta are real 3-vectors pi_mu(x) for the su(2) generators i sigma_a, with kinetic term
+1/2 sum pi^2. Molecular dynamics moves every link as U -> exp(i eps pi.sigma) U, and the
+force follows from the staple sums V of `staple_sites`: with U V = w0 + i w.sigma,
+F = -dS/domega = -beta w. Both link layouts are supported.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+from .links import lattice_shape, neighbor_table, staple_sites
+from .observables import avg_plaquette
+from .online import Welford
+from .su2 import as_layout, link_layout, link_mul, link_ndim
+
+INTEGRATORS = ("leapfrog", "omelyan")
+# Second-order minimum-norm (Omelyan) parameter.
+OMELYAN_LAMBDA = 0.1931833275037836
+
+
+def wilson_action(U: np.ndarray, beta: float) -> float:
+    """S = beta sum_P (1 - Re tr(U_P) / 2)."""
+    shape = lattice_shape(U)
+    dims = len(shape)
+    n_plaq = int(np.prod(shape)) * dims * (dims - 1) // 2
+    return beta * n_plaq * (1.0 - avg_plaquette(U))
+
+
+def su2_vector_part(W: np.ndarray) -> np.ndarray:
+    """w for W = w0 + i w.sigma (real multiples or sums of SU(2) elements), either layout."""
+    if not np.iscomplexobj(W):
+        return W[..., 1:]
+    return np.stack([W[..., 0, 1].imag, W[..., 0, 1].real, W[..., 0, 0].imag], axis=-1)
+
+
+def hmc_force(U: np.ndarray, beta: float, nbr: np.ndarray) -> np.ndarray:
+    """-dS/domega for every link, shape lattice_shape + (dims, 3)."""
+    shape = lattice_shape(U)
+    dims = len(shape)
+    sites = np.arange(int(np.prod(shape)))
+    links = U.reshape((-1, dims) + U.shape[U.ndim - link_ndim(U) :])
+    F = np.empty((len(sites), dims, 3))
+    for mu in range(dims):
+        V = staple_sites(U, mu, sites, nbr)
+        F[:, mu] = -beta * su2_vector_part(link_mul(links[:, mu], V))
+    return F.reshape(shape + (dims, 3))
+
+
+def exp_su2(omega: np.ndarray, layout: str) -> np.ndarray:
+    """exp(i omega.sigma) = cos|omega| + i sin|omega| omega_hat.sigma for stacks of 3-vectors."""
+    theta = np.sqrt(np.einsum("...i,...i->...", omega, omega))
+    q = np.empty(omega.shape[:-1] + (4,))
+    q[..., 0] = np.cos(theta)
+    q[..., 1:] = omega * (np.sinc(theta / np.pi))[..., None]
+    return as_layout(q, layout)
+
+
+def md_trajectory(
+    U: np.ndarray,
+    P: np.ndarray,
+    beta: float,
+    step_size: float,
+    n_steps: int,
+    integrator: str = "omelyan",
+) -> tuple[np.ndarray, np.ndarray]:
+    """Integrate the molecular-dynamics equations for n_steps; returns new (U, P)."""
+    if integrator not in INTEGRATORS:
+        raise ValueError(f"Unknown integrator {integrator!r}; choose from {INTEGRATORS}")
+    nbr = neighbor_table(lattice_shape(U))
+    layout = link_layout(U)
+    U = U.copy()
+    P = P.copy()
+
+    def drift(h: float) -> None:
+        U[...] = link_mul(exp_su2(h * P, layout), U)
+
+    def kick(h: float) -> None:
+        P[...] += h * hmc_force(U, beta, nbr)
+
+    # The closing kick of one step and the opening kick of the next are merged into one
+    # force evaluation: 1 per step for leapfrog, 2 per step for Omelyan.
+    eps = step_size
+    edge = 0.5 if integrator == "leapfrog" else OMELYAN_LAMBDA
+    kick(edge * eps)
+    for step in range(n_steps):
+        if integrator == "leapfrog":
+            drift(eps)
+        else:
+            drift(0.5 * eps)
+            kick((1.0 - 2.0 * OMELYAN_LAMBDA) * eps)
+            drift(0.5 * eps)
+        kick((edge if step == n_steps - 1 else 2.0 * edge) * eps)
+    return U, P
+
+
+def hamiltonian(U: np.ndarray, P: np.ndarray, beta: float) -> float:
+    return 0.5 * float(np.sum(P * P)) + wilson_action(U, beta)
+
+
+def hmc_sweep(
+    U: np.ndarray,
+    beta: float,
+    eps: float,
+    rng: np.random.Generator,
+    step_size: float = 0.1,
+    n_steps: int = 10,
+    integrator: str = "omelyan",
+    log: list | HMCLog | None = None,
+    accept_reject: bool = True,
+) -> tuple[int, int]:
+    """One HMC trajectory of length step_size * n_steps with a Metropolis accept/reject.
+
+    `eps` is unused and only kept so every entry of SWEEPS shares one signature. With
+    `log` (a list, or an HMCLog for constant memory), each trajectory appends
+    {"dH", "accepted"} to it for dH diagnostics.
+    `accept_reject=False` keeps every trajectory; this is only meant for thermalization,
+    since far from equilibrium (e.g. a cold start) dH grows with the volume and nearly
+    every trajectory would be rejected.
+    """
+    P = rng.normal(size=U.shape[: U.ndim - link_ndim(U)] + (3,))
+    H0 = hamiltonian(U, P, beta)
+    U_new, P_new = md_trajectory(U, P, beta, step_size, n_steps, integrator)
+    dH = hamiltonian(U_new, P_new, beta) - H0
+    accepted = bool(not accept_reject or dH <= 0.0 or rng.uniform() < np.exp(-dH))
+    if accepted:
+        U[...] = U_new
+    if log is not None:
+        log.append({"dH": float(dH), "accepted": accepted})
+    return int(accepted), 1
+
+
+def hmc_reversibility(
+    U: np.ndarray,
+    beta: float,
+    rng: np.random.Generator,
+    step_size: float = 0.1,
+    n_steps: int = 10,
+    integrator: str = "omelyan",
+) -> dict:
+    """Integrate forward, flip the momenta, integrate back; report how far U and H moved.
+
+    Both deviations should sit at rounding level; growth with the trajectory length
+    signals an instability of the integrator at this step size.
+    """
+    P = rng.normal(size=U.shape[: U.ndim - link_ndim(U)] + (3,))
+    H0 = hamiltonian(U, P, beta)
+    U1, P1 = md_trajectory(U, P, beta, step_size, n_steps, integrator)
+    U2, P2 = md_trajectory(U1, -P1, beta, step_size, n_steps, integrator)
+    return {
+        "dH_forward": hamiltonian(U1, P1, beta) - H0,
+        "dH_roundtrip": hamiltonian(U2, P2, beta) - H0,
+        "max_link_deviation": float(np.max(np.abs(U2 - U))),
+        "max_momentum_deviation": float(np.max(np.abs(P2 + P))),
+    }
+
+
+class HMCLog:
+    """Running dH, exp(-dH) and acceptance statistics of HMC trajectories in O(1) memory.
+
+    Takes the place of the `log` list of `hmc_sweep`; `state()` / `from_state()` round-trip
+    it through checkpoints.
+    """
+
+    def __init__(self) -> None:
+        self.dH = Welford()
+        self.exp_minus_dH = Welford()
+        self.accepted = Welford()
+        self.dH_abs_max = 0.0
+
+    def append(self, entry: dict) -> None:
+        self.dH.push(entry["dH"])
+        self.exp_minus_dH.push(np.exp(-entry["dH"]))
+        self.accepted.push(float(entry["accepted"]))
+        self.dH_abs_max = max(self.dH_abs_max, abs(entry["dH"]))
+
+    def __len__(self) -> int:
+        return self.dH.n
+
+    def merge(self, other: HMCLog) -> None:
+        self.dH.merge(other.dH)
+        self.exp_minus_dH.merge(other.exp_minus_dH)
+        self.accepted.merge(other.accepted)
+        self.dH_abs_max = max(self.dH_abs_max, other.dH_abs_max)
+
+    def state(self) -> dict:
+        return {
+            "dH": self.dH.state(),
+            "exp_minus_dH": self.exp_minus_dH.state(),
+            "accepted": self.accepted.state(),
+            "dH_abs_max": self.dH_abs_max,
+        }
+
+    @classmethod
+    def from_state(cls, state: dict) -> HMCLog:
+        log = cls()
+        log.dH = Welford.from_state(state["dH"])
+        log.exp_minus_dH = Welford.from_state(state["exp_minus_dH"])
+        log.accepted = Welford.from_state(state["accepted"])
+        log.dH_abs_max = state["dH_abs_max"]
+        return log
+
+
+def hmc_diagnostics(log: list[dict] | HMCLog) -> dict:
+    """Acceptance, <dH>, <exp(-dH)> (should be 1 within errors) and max |dH| of a run."""
+    if not isinstance(log, HMCLog):
+        entries, log = log, HMCLog()
+        for entry in entries:
+            log.append(entry)
+    n = len(log)
+    if not n:
+        return {}
+    return {
+        "hmc_trajectories": n,
+        "hmc_acceptance": float(log.accepted.mean),
+        "hmc_dH_mean": float(log.dH.mean),
+        "hmc_exp_minus_dH_mean": float(log.exp_minus_dH.mean),
+        "hmc_exp_minus_dH_err": float(log.exp_minus_dH.std / np.sqrt(n)),
+        "hmc_dH_abs_max": float(log.dH_abs_max),
+    }
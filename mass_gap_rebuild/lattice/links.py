@@ -0,0 +1,138 @@
+"""Link arrays on periodic lattices: indexing, neighbours, staples, gauge orbits.
+
+A configuration has shape lattice_shape + (dims,) + link, with one lattice axis per
+direction, so every kernel here works in any number of dimensions and for any extents.
+Lattice sizes are given either as one extent L (an L^dims hypercube) or as a shape
+(Lt, Lx, Ly, ...) with time first.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+from .su2 import link_dag, link_identity, link_layout, link_mul, link_ndim, random_su2
+
+
+def direction(U: np.ndarray, mu: int) -> np.ndarray:
+    """View of all links U_mu(x), lattice axes first."""
+    return U[(Ellipsis, mu) + (slice(None),) * link_ndim(U)]
+
+
+def lattice_shape(U: np.ndarray) -> tuple[int, ...]:
+    """Site-grid shape of a link array (its leading axes, one per direction)."""
+    return U.shape[: U.ndim - 1 - link_ndim(U)]
+
+
+def lattice_extents(L: int | tuple[int, ...], dims: int = 4) -> tuple[int, ...]:
+    """(L,) * dims for a hypercubic extent, otherwise the shape itself (its length wins over dims)."""
+    return (int(L),) * dims if np.ndim(L) == 0 else tuple(int(n) for n in L)
+
+
+def shift_idx(x: tuple[int, ...], mu: int, step: int, L: int | tuple[int, ...]) -> tuple[int, ...]:
+    y = list(x)
+    y[mu] = (y[mu] + step) % (L if np.ndim(L) == 0 else L[mu])
+    return tuple(y)
+
+
+def init_links(
+    L: int | tuple[int, ...], layout: str = "matrix", dims: int = 4, precision: str = "double"
+) -> np.ndarray:
+    """Cold start: every link of the lattice set to the identity, stored at `precision`."""
+    shape = lattice_extents(L, dims)
+    return link_identity(shape + (len(shape),), layout, precision)
+
+
+def flat_links(U: np.ndarray) -> np.ndarray:
+    """(V*dims, *link) view of the link array; writes through it land in U."""
+    if not U.flags.c_contiguous:
+        raise ValueError("Link array must be C-contiguous for flat link access")
+    return U.reshape((-1,) + U.shape[U.ndim - link_ndim(U) :])
+
+
+def neighbor_table(shape: tuple[int, ...]) -> np.ndarray:
+    """nbr[mu, 0, s] / nbr[mu, 1, s]: flat index of site s shifted by +mu / -mu (periodic)."""
+    sites = np.arange(int(np.prod(shape))).reshape(shape)
+    return np.stack(
+        [
+            np.stack([np.roll(sites, -1, axis=mu).ravel(), np.roll(sites, 1, axis=mu).ravel()])
+            for mu in range(len(shape))
+        ]
+    )
+
+
+def parity_sites(shape: tuple[int, ...], parity: int) -> np.ndarray:
+    """Flat indices of the even (0) or odd (1) checkerboard sites."""
+    if any(n % 2 for n in shape):
+        raise ValueError(f"Checkerboard updates need even lattice extents, got {shape}")
+    return np.flatnonzero(np.indices(shape).sum(axis=0).ravel() % 2 == parity)
+
+
+def staple(U: np.ndarray, x: tuple[int, ...], mu: int, L: int | tuple[int, ...]) -> np.ndarray:
+    st = np.zeros_like(U[x + (mu,)])
+    for nu in range(len(x)):
+        if nu == mu:
+            continue
+        # forward staple: Re tr(U_mu(x) term_f) is the (mu, nu) plaquette at x
+        x_nu = shift_idx(x, nu, +1, L)
+        x_mu = shift_idx(x, mu, +1, L)
+        term_f = link_mul(
+            link_mul(U[x_mu + (nu,)], link_dag(U[x_nu + (mu,)])),
+            link_dag(U[x + (nu,)]),
+        )
+
+        # backward staple: closes the (mu, nu) plaquette at x - nu
+        x_mnu = shift_idx(x, nu, -1, L)
+        x_mnu_mu = shift_idx(x_mnu, mu, +1, L)
+        term_b = link_mul(
+            link_mul(link_dag(U[x_mnu_mu + (nu,)]), link_dag(U[x_mnu + (mu,)])),
+            U[x_mnu + (nu,)],
+        )
+        st += term_f + term_b
+    return st
+
+
+def staple_sites(U: np.ndarray, mu: int, sites: np.ndarray, nbr: np.ndarray) -> np.ndarray:
+    """Staple sums for links U_mu(s), s in `sites` (flat indices); same convention as `staple`.
+
+    Links are gathered from the flat (V*dims, *link) view with `np.take`, so the cost is
+    proportional to len(sites) rather than to the lattice volume.
+    """
+    dims = nbr.shape[0]
+    links = flat_links(U)
+
+    def gather(s: np.ndarray, d: int) -> np.ndarray:
+        return np.take(links, s * dims + d, axis=0)
+
+    x_mu = nbr[mu, 0, sites]
+    st = np.zeros((len(sites),) + links.shape[1:], dtype=U.dtype)
+    for nu in range(dims):
+        if nu == mu:
+            continue
+        x_nu = nbr[nu, 0, sites]
+        x_mnu = nbr[nu, 1, sites]
+        x_mnu_mu = nbr[mu, 0, x_mnu]
+        # forward staple: U_nu(x+mu) U_mu(x+nu)^dag U_nu(x)^dag
+        st += link_mul(
+            link_mul(gather(x_mu, nu), link_dag(gather(x_nu, mu))),
+            link_dag(gather(sites, nu)),
+        )
+        # backward staple: U_nu(x-nu+mu)^dag U_mu(x-nu)^dag U_nu(x-nu)
+        st += link_mul(
+            link_mul(link_dag(gather(x_mnu_mu, nu)), link_dag(gather(x_mnu, mu))),
+            gather(x_mnu, nu),
+        )
+    return st
+
+
+def gauge_transform(U: np.ndarray, G: np.ndarray) -> np.ndarray:
+    """U_mu(x) -> G(x) U_mu(x) G(x+mu)^dagger, one rolled whole-lattice product per direction."""
+    out = np.empty_like(U)
+    for mu in range(len(lattice_shape(U))):
+        direction(out, mu)[...] = link_mul(link_mul(G, direction(U, mu)), link_dag(np.roll(G, -1, axis=mu)))
+    return out
+
+
+def random_gauge_field(
+    L: int | tuple[int, ...], rng: np.random.Generator, layout: str = "matrix", dims: int = 4
+) -> np.ndarray:
+    return random_su2(rng, layout, lattice_extents(L, dims))
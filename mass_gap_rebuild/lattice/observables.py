@@ -0,0 +1,178 @@
+"""Gauge-invariant observables: plaquettes, Wilson loops, Creutz ratios, timeslice operators,
+Polyakov loops and their correlators."""
+
+from __future__ import annotations
+
+import numpy as np
+
+from .links import direction, lattice_shape, shift_idx
+from .su2 import link_dag, link_mul, link_retr, retrace_product
+
+
+def plaquette_trace(U: np.ndarray, x: tuple[int, ...], mu: int, nu: int, L: int | tuple[int, ...]) -> float:
+    """Re tr of the (mu, nu) plaquette at site x."""
+    x_mu = shift_idx(x, mu, +1, L)
+    x_nu = shift_idx(x, nu, +1, L)
+    return float(
+        retrace_product(
+            link_mul(U[x + (mu,)], U[x_mu + (nu,)]),
+            link_mul(link_dag(U[x_nu + (mu,)]), link_dag(U[x + (nu,)])),
+        )
+    )
+
+
+def plaquette_field(U: np.ndarray, mu: int, nu: int) -> np.ndarray:
+    """Re tr(U_P)/2 of the (mu, nu) plaquette at every site, from one shifted whole-lattice product."""
+    Umu = direction(U, mu)
+    Unu = direction(U, nu)
+    left = link_mul(Umu, np.roll(Unu, -1, axis=mu))
+    right = link_mul(link_dag(np.roll(Umu, -1, axis=nu)), link_dag(Unu))
+    return retrace_product(left, right) / 2.0
+
+
+def avg_plaquette(U: np.ndarray) -> float:
+    """Average Re tr(U_P)/2 over all plaquettes."""
+    dims = len(lattice_shape(U))
+    vals = [np.mean(plaquette_field(U, mu, nu)) for mu in range(dims) for nu in range(mu + 1, dims)]
+    return float(np.mean(vals))
+
+
+def line_products(U: np.ndarray, mu: int, n_max: int) -> list[np.ndarray]:
+    """Straight Wilson lines U_mu(x) U_mu(x+mu) ... U_mu(x+(n-1)mu) for n = 1..n_max, entry n-1."""
+    Umu = direction(U, mu)
+    lines = [Umu]
+    for n in range(1, n_max):
+        lines.append(link_mul(lines[-1], np.roll(Umu, -n, axis=mu)))
+    return lines
+
+
+def plane_wilson_loop(lines: dict[int, list[np.ndarray]], mu: int, nu: int, R: int, T: int) -> float:
+    """Lattice-averaged R x T loop with R along mu and T along nu, built from `line_products`."""
+    side_mu, side_nu = lines[mu][R - 1], lines[nu][T - 1]
+    # Loop = (lower-right path) (upper-left path)^dagger, both running from x to x + R mu + T nu.
+    lower = link_mul(side_mu, np.roll(side_nu, -R, axis=mu))
+    upper = link_mul(side_nu, np.roll(side_mu, -T, axis=nu))
+    return float(np.mean(retrace_product(lower, link_dag(upper)))) / 2.0
+
+
+def wilson_loop(U: np.ndarray, R: int, T: int, mu: int, nu: int) -> float:
+    """Lattice-averaged R x T Wilson loop with R along mu and T along nu."""
+    lines = {mu: line_products(U, mu, R), nu: line_products(U, nu, T)}
+    return plane_wilson_loop(lines, mu, nu, R, T)
+
+
+def wilson_loop_plane01(U: np.ndarray, R: int, T: int) -> float:
+    return wilson_loop(U, R, T, 1, 0)
+
+
+def wilson_loop_table(U: np.ndarray, R_max: int, T_max: int | None = None) -> np.ndarray:
+    """W(R, T) for all 1 <= R <= R_max, 1 <= T <= T_max at entry [R-1, T-1].
+
+    Each entry is averaged over sites and over every ordered pair of directions, so both
+    orientations of each plane contribute. Straight lines are built once per direction.
+    """
+    T_max = R_max if T_max is None else T_max
+    dims = len(lattice_shape(U))
+    lines = {mu: line_products(U, mu, max(R_max, T_max)) for mu in range(dims)}
+    W = np.zeros((R_max, T_max))
+    planes = [(mu, nu) for mu in range(dims) for nu in range(dims) if mu != nu]
+    for mu, nu in planes:
+        for R in range(1, R_max + 1):
+            for T in range(1, T_max + 1):
+                W[R - 1, T - 1] += plane_wilson_loop(lines, mu, nu, R, T)
+    return W / len(planes)
+
+
+def polyakov_loop_field(U: np.ndarray) -> np.ndarray:
+    """tr(U_0(0, x) U_0(1, x) ... U_0(Lt - 1, x)) / 2 at every spatial site x (real for SU(2)).
+
+    The ordered product over time is reduced pairwise, so it takes log2(Lt) whole-lattice
+    multiplications rather than Lt.
+    """
+    lines = direction(U, 0)
+    while lines.shape[0] > 1:
+        paired = link_mul(lines[0:-1:2], lines[1::2])
+        lines = np.concatenate([paired, lines[-1:]]) if lines.shape[0] % 2 else paired
+    return link_retr(lines[0]) / 2.0
+
+
+def polyakov_loop(U: np.ndarray) -> float:
+    """Spatial average of `polyakov_loop_field`; its modulus is the deconfinement order parameter."""
+    return float(np.mean(polyakov_loop_field(U)))
+
+
+def polyakov_correlator(U: np.ndarray) -> np.ndarray:
+    """mean_x P(x) P(x + r) for every spatial separation r at once, from one real FFT.
+
+    Entry [r_1, r_2, ...] holds separation r (periodic). For SU(2) P is real, so this is
+    <P(x) P^dag(x + r)>; -log(C(r)) / Lt is the static potential up to a constant.
+    """
+    P = polyakov_loop_field(U)
+    f = np.fft.rfftn(P)
+    return np.fft.irfftn(f * np.conj(f), s=P.shape, axes=range(P.ndim)) / P.size
+
+
+def radial_average(C: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Average a function of periodic separations over shells of equal minimal-image |r|.
+
+    Returns (r, C(r)) with r ascending, starting at r = 0.
+    """
+    r2 = np.zeros(C.shape, dtype=int)
+    for axis, n in enumerate(C.shape):
+        d = np.minimum(np.arange(n), n - np.arange(n))
+        r2 += (d**2).reshape((-1,) + (1,) * (C.ndim - axis - 1))
+    shells, inverse = np.unique(r2, return_inverse=True)
+    sums = np.bincount(inverse.ravel(), weights=C.ravel())
+    counts = np.bincount(inverse.ravel())
+    return np.sqrt(shells), sums / counts
+
+
+def creutz_ratios(W: np.ndarray) -> np.ndarray:
+    """chi(R, T) = -log(W(R,T) W(R-1,T-1) / (W(R,T-1) W(R-1,T))) at [R-1, T-1]; NaN for R or T = 1."""
+    chi = np.full(W.shape, np.nan)
+    ratio = (W[1:, 1:] * W[:-1, :-1]) / np.maximum(W[1:, :-1] * W[:-1, 1:], 1e-15)
+    chi[1:, 1:] = -np.log(np.maximum(np.abs(ratio), 1e-15))
+    return chi
+
+
+def momentum_label(n: tuple[int, ...]) -> str:
+    return "p" + "_".join(str(k) for k in n)
+
+
+def timeslice_operators(U: np.ndarray, momenta: tuple[tuple[int, ...], ...] = ()) -> dict[str, np.ndarray]:
+    """Spatial-plaquette operators on every timeslice (axis 0), all from one pass over the lattice.
+
+    Returns arrays of length Lt keyed by
+    - "plaq_{i}{j}": timeslice mean of the (i, j) spatial plaquette, one per orientation;
+    - "plaq_sum": mean over all spatial planes, the zero-momentum 0++ operator;
+    - "<momentum_label(n)>_re" / "_im": real and imaginary part of mean_x exp(-i p.x) P(x, t)
+      for each integer spatial momentum n in `momenta`, p_i = 2 pi n_i / L_i, where P is the
+      plane-averaged plaquette. Re<O_p(t) O_p(t+dt)^*> is the sum of the two parts' correlators.
+    """
+    shape = lattice_shape(U)
+    spatial = tuple(range(1, len(shape)))
+    if len(spatial) < 2:
+        raise ValueError(f"Need at least two spatial directions, got lattice shape {shape}")
+    ops = {}
+    total = np.zeros(shape)
+    n_planes = 0
+    for i in spatial:
+        for j in range(i + 1, len(shape)):
+            P = plaquette_field(U, i, j)
+            ops[f"plaq_{i}{j}"] = P.mean(axis=spatial)
+            total += P
+            n_planes += 1
+    total /= n_planes
+    ops["plaq_sum"] = total.mean(axis=spatial)
+    if momenta:
+        ft = np.fft.fftn(total, axes=spatial) / np.prod(shape[1:])
+        for n in momenta:
+            proj = ft[(slice(None),) + tuple(k % L for k, L in zip(n, shape[1:]))]
+            ops[momentum_label(n) + "_re"] = proj.real.copy()
+            ops[momentum_label(n) + "_im"] = proj.imag.copy()
+    return ops
+
+
+def timeslice_spatial_plaquette_sum(U: np.ndarray, t: int) -> float:
+    """Mean Re tr/2 of the spatial plaquettes on timeslice t; prefer `timeslice_operators` for all t."""
+    return float(timeslice_operators(U)["plaq_sum"][t])
@@ -0,0 +1,214 @@
+"""Streaming statistics and append-only per-configuration records for long Monte Carlo runs.
+
+Accumulators hold O(1) (Welford) or O(log n) (binning) state, so a run with any number of
+measurements keeps constant memory; `state()` / `from_state()` round-trip them through
+JSON checkpoints. Per-configuration data goes to disk instead of lists: `RecordLog` appends
+CSV rows and `ArrayLog` raw float64 arrays, both flushed every `flush_every` records so the
+files can be read while the run is still going. Reopening either with `keep=n` truncates it
+to its first n records, which is how a resumed chain drops measurements made after its last
+checkpoint.
+"""
+
+from __future__ import annotations
+
+import csv
+import math
+from pathlib import Path
+
+import numpy as np
+
+
+class Welford:
+    """Running mean and (population) variance of scalar or fixed-shape array samples."""
+
+    def __init__(self) -> None:
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def push(self, x: float | np.ndarray) -> None:
+        x = np.asarray(x, dtype=float)
+        self.n += 1
+        delta = x - self.mean
+        self.mean = self.mean + delta / self.n
+        self.m2 = self.m2 + delta * (x - self.mean)
+
+    def merge(self, other: Welford) -> None:
+        """Fold in the samples of another accumulator (Chan et al. pairwise update)."""
+        if other.n == 0:
+            return
+        n = self.n + other.n
+        delta = np.asarray(other.mean) - self.mean
+        self.mean = self.mean + delta * other.n / n
+        self.m2 = self.m2 + other.m2 + delta**2 * self.n * other.n / n
+        self.n = n
+
+    @property
+    def variance(self) -> float | np.ndarray:
+        return self.m2 / self.n if self.n else math.nan
+
+    @property
+    def std(self) -> float | np.ndarray:
+        return np.sqrt(self.variance)
+
+    def state(self) -> dict:
+        return {"n": self.n, "mean": np.asarray(self.mean).tolist(), "m2": np.asarray(self.m2).tolist()}
+
+    @classmethod
+    def from_state(cls, state: dict) -> Welford:
+        acc = cls()
+        acc.n = state["n"]
+        acc.mean = np.asarray(state["mean"], dtype=float) if np.ndim(state["mean"]) else float(state["mean"])
+        acc.m2 = np.asarray(state["m2"], dtype=float) if np.ndim(state["m2"]) else float(state["m2"])
+        return acc
+
+
+class BinningAccumulator:
+    """Log2 blocking of a scalar series: level k accumulates means of 2^k consecutive samples.
+
+    The naive error of the mean grows with k until the blocks are longer than the
+    autocorrelation time and then plateaus; `error` takes the largest level that still has
+    `min_blocks` blocks, and `tau_int` = (error / naive error)^2 / 2.
+    """
+
+    def __init__(self) -> None:
+        self.levels: list[Welford] = []
+        self.pending: list[float | None] = []
+
+    def push(self, x: float) -> None:
+        value = float(x)
+        k = 0
+        while True:
+            if k == len(self.levels):
+                self.levels.append(Welford())
+                self.pending.append(None)
+            self.levels[k].push(value)
+            if self.pending[k] is None:
+                self.pending[k] = value
+                return
+            value = 0.5 * (self.pending[k] + value)
+            self.pending[k] = None
+            k += 1
+
+    @property
+    def n(self) -> int:
+        return self.levels[0].n if self.levels else 0
+
+    @property
+    def mean(self) -> float:
+        return float(self.levels[0].mean) if self.levels else math.nan
+
+    def level_errors(self) -> np.ndarray:
+        """Error of the mean from the blocks of each level, sqrt(var_k / (n_k - 1))."""
+        return np.array(
+            [math.sqrt(acc.variance / (acc.n - 1)) if acc.n > 1 else math.nan for acc in self.levels]
+        )
+
+    def error(self, min_blocks: int = 32) -> float:
+        errors = self.level_errors()
+        usable = [k for k, acc in enumerate(self.levels) if acc.n >= min_blocks]
+        if not usable:
+            return float(errors[0]) if errors.size else math.nan
+        return float(errors[usable[-1]])
+
+    def tau_int(self, min_blocks: int = 32) -> float:
+        naive = self.level_errors()[0] if self.levels else math.nan
+        if not naive > 0:
+            return 0.5
+        return max(0.5, 0.5 * (self.error(min_blocks) / naive) ** 2)
+
+    def state(self) -> dict:
+        return {"levels": [acc.state() for acc in self.levels], "pending": self.pending}
+
+    @classmethod
+    def from_state(cls, state: dict) -> BinningAccumulator:
+        acc = cls()
+        acc.levels = [Welford.from_state(s) for s in state["levels"]]
+        acc.pending = list(state["pending"])
+        return acc
+
+
+class RecordLog:
+    """Append-only CSV of per-configuration rows, flushed every `flush_every` rows."""
+
+    def __init__(self, path: Path, fieldnames: list[str], flush_every: int = 10, keep: int = 0) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.flush_every = max(1, flush_every)
+        if keep:
+            with self.path.open(newline="") as f:
+                lines = f.readlines()[: keep + 1]
+            self.path.write_text("".join(lines))
+        else:
+            with self.path.open("w", newline="") as f:
+                csv.DictWriter(f, fieldnames=fieldnames).writeheader()
+        self.count = keep
+        self._file = self.path.open("a", newline="")
+        self._writer = csv.DictWriter(self._file, fieldnames=fieldnames)
+
+    def append(self, row: dict) -> None:
+        self._writer.writerow(row)
+        self.count += 1
+        if self.count % self.flush_every == 0:
+            self._file.flush()
+
+    def flush(self) -> None:
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+
+def read_record_column(path: Path, name: str) -> np.ndarray:
+    """One column of a `RecordLog` file as floats (the rows flushed so far)."""
+    with Path(path).open(newline="") as f:
+        return np.array([float(row[name]) for row in csv.DictReader(f)])
+
+
+def read_records(path: Path) -> list[dict[str, float]]:
+    """All rows of a `RecordLog` file with every field as a float (the rows flushed so far)."""
+    with Path(path).open(newline="") as f:
+        return [{key: float(value) for key, value in row.items()} for row in csv.DictReader(f)]
+
+
+class ArrayLog:
+    """Append-only raw float64 arrays of one shape per record, flushed every `flush_every`."""
+
+    def __init__(self, path: Path, row_shape: tuple[int, ...], flush_every: int = 10, keep: int = 0) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.row_shape = tuple(row_shape)
+        self.flush_every = max(1, flush_every)
+        row_bytes = 8 * math.prod(self.row_shape)
+        if keep:
+            with self.path.open("r+b") as f:
+                f.truncate(keep * row_bytes)
+        else:
+            self.path.write_bytes(b"")
+        self.count = keep
+        self._buffer: list[np.ndarray] = []
+        self._file = self.path.open("ab")
+
+    def append(self, row: np.ndarray) -> None:
+        self._buffer.append(np.asarray(row, dtype=np.float64).reshape(self.row_shape))
+        self.count += 1
+        if len(self._buffer) >= self.flush_every:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._buffer:
+            self._file.write(np.stack(self._buffer).tobytes())
+            self._buffer.clear()
+        self._file.flush()
+
+    def load(self) -> np.ndarray:
+        """All records as a read-only (count, *row_shape) array mapped from disk (flushes first)."""
+        self.flush()
+        if self.count == 0:
+            return np.empty((0,) + self.row_shape)
+        shape = (self.count,) + self.row_shape
+        return np.asarray(np.memmap(self.path, dtype=np.float64, mode="r", shape=shape))
+
+    def close(self) -> None:
+        self.flush()
+        self._file.close()
@@ -0,0 +1,217 @@
+"""SU(2) group elements in the two link layouts and their batched algebra.
+
+"matrix" links are complex128 arrays (..., 2, 2); "quaternion" links are float64 arrays
+(..., 4) holding (a, b, c, d) for a + i(b, c, d).sigma. The dtype tells them apart, so
+every helper here accepts either layout and any leading batch shape. In "single"
+precision the same layouts are stored as complex64 / float32.
+"""
+
+from __future__ import annotations
+
+import math
+
+import numpy as np
+
+
+LAYOUTS = ("matrix", "quaternion")
+PRECISIONS = ("double", "single")
+_DTYPES = {
+    ("matrix", "double"): np.complex128,
+    ("matrix", "single"): np.complex64,
+    ("quaternion", "double"): np.float64,
+    ("quaternion", "single"): np.float32,
+}
+
+
+def su2_from_quaternion(q: np.ndarray) -> np.ndarray:
+    """Map quaternion(s) q[..., (a,b,c,d)] to SU(2) matrices of shape (..., 2, 2)."""
+    a, b, c, d = np.moveaxis(np.asarray(q, dtype=float), -1, 0)
+    out = np.empty(a.shape + (2, 2), dtype=np.complex128)
+    out[..., 0, 0] = a + 1j * d
+    out[..., 0, 1] = c + 1j * b
+    out[..., 1, 0] = -c + 1j * b
+    out[..., 1, 1] = a - 1j * d
+    return out
+
+
+def quaternion_from_su2(M: np.ndarray) -> np.ndarray:
+    """Inverse of `su2_from_quaternion` for matrices of the form a + i(b, c, d).sigma."""
+    q = np.empty(M.shape[:-2] + (4,), dtype=float)
+    q[..., 0] = M[..., 0, 0].real
+    q[..., 1] = M[..., 0, 1].imag
+    q[..., 2] = M[..., 0, 1].real
+    q[..., 3] = M[..., 0, 0].imag
+    return q
+
+
+def link_layout(U: np.ndarray) -> str:
+    """Links are 2x2 complex128 matrices ("matrix") or real 4-vectors ("quaternion")."""
+    return "matrix" if np.iscomplexobj(U) else "quaternion"
+
+
+def link_ndim(U: np.ndarray) -> int:
+    """Number of trailing array axes holding one link."""
+    return 2 if np.iscomplexobj(U) else 1
+
+
+def as_layout(q: np.ndarray, layout: str) -> np.ndarray:
+    return su2_from_quaternion(q) if layout == "matrix" else np.asarray(q, dtype=float)
+
+
+def link_dtype(layout: str = "matrix", precision: str = "double") -> np.dtype:
+    return np.dtype(_DTYPES[layout, precision])
+
+
+def as_precision(U: np.ndarray, precision: str) -> np.ndarray:
+    """U stored at `precision`; returns U itself (no copy) when it already is."""
+    return U.astype(link_dtype(link_layout(U), precision), copy=False)
+
+
+def reunitarize(U: np.ndarray) -> np.ndarray:
+    """Project every link back onto SU(2) in place and return U.
+
+    Quaternions are renormalized to unit length; matrices are rebuilt from their
+    normalized first row (u, v) as [[u, v], [-v*, u*]].
+    """
+    if not np.iscomplexobj(U):
+        U /= np.sqrt(np.einsum("...i,...i->...", U, U))[..., None]
+        return U
+    row = U[..., 0, :]
+    row /= np.sqrt(np.abs(row[..., 0]) ** 2 + np.abs(row[..., 1]) ** 2)[..., None]
+    U[..., 1, 0] = -np.conj(row[..., 1])
+    U[..., 1, 1] = np.conj(row[..., 0])
+    return U
+
+
+def unitarity_violation(U: np.ndarray) -> float:
+    """max |U^dag U - 1| over all links and matrix entries, evaluated in float64.
+
+    For a quaternion q, U^dag U = |q|^2 1, so this is max ||q|^2 - 1|.
+    """
+    if not np.iscomplexobj(U):
+        q = U.astype(np.float64, copy=False)
+        return float(np.max(np.abs(np.einsum("...i,...i->...", q, q) - 1.0), initial=0.0))
+    M = U.astype(np.complex128, copy=False)
+    u00, u01, u10, u11 = M[..., 0, 0], M[..., 0, 1], M[..., 1, 0], M[..., 1, 1]
+    diag0 = np.abs(u00) ** 2 + np.abs(u10) ** 2 - 1.0
+    diag1 = np.abs(u01) ** 2 + np.abs(u11) ** 2 - 1.0
+    off = np.abs(np.conj(u00) * u01 + np.conj(u10) * u11)
+    return float(max(np.max(np.abs(d), initial=0.0) for d in (diag0, diag1, off)))
+
+
+def random_su2(rng: np.random.Generator, layout: str = "matrix", shape: tuple[int, ...] = ()) -> np.ndarray:
+    """Haar-random SU(2) element(s) of the given batch shape, from one normal draw."""
+    q = rng.normal(size=shape + (4,))
+    q = q / np.linalg.norm(q, axis=-1, keepdims=True)
+    return as_layout(q, layout)
+
+
+def random_su2_near_identity(rng: np.random.Generator, eps: float, layout: str = "matrix") -> np.ndarray:
+    v = rng.normal(size=3)
+    n = np.linalg.norm(v)
+    if n < 1e-12:
+        axis = np.array([1.0, 0.0, 0.0])
+    else:
+        axis = v / n
+    theta = eps * rng.uniform(-1.0, 1.0)
+    a = math.cos(theta)
+    s = math.sin(theta)
+    b, c, d = axis * s
+    return as_layout(np.array([a, b, c, d]), layout)
+
+
+def random_su2_near_identity_batch(
+    rng: np.random.Generator, eps: float, n: int, layout: str = "matrix"
+) -> np.ndarray:
+    """Draw n proposals with the same distribution as `random_su2_near_identity`."""
+    v = rng.normal(size=(n, 3))
+    norm = np.sqrt(np.einsum("ij,ij->i", v, v))
+    tiny = norm < 1e-12
+    v[tiny] = (1.0, 0.0, 0.0)
+    norm[tiny] = 1.0
+    theta = eps * rng.uniform(-1.0, 1.0, size=n)
+    q = np.empty((n, 4))
+    q[:, 0] = np.cos(theta)
+    q[:, 1:] = v * (np.sin(theta) / norm)[:, None]
+    return as_layout(q, layout)
+
+
+def dagger(M: np.ndarray) -> np.ndarray:
+    return np.conj(np.swapaxes(M, -1, -2))
+
+
+def matmul2(A: np.ndarray, B: np.ndarray) -> np.ndarray:
+    """Batched 2x2 product written out per component (much faster than `@` on stacks)."""
+    shape = A.shape if A.shape == B.shape else np.broadcast_shapes(A.shape, B.shape)
+    out = np.empty(shape, dtype=A.dtype)
+    a00, a01, a10, a11 = A[..., 0, 0], A[..., 0, 1], A[..., 1, 0], A[..., 1, 1]
+    b00, b01, b10, b11 = B[..., 0, 0], B[..., 0, 1], B[..., 1, 0], B[..., 1, 1]
+    out[..., 0, 0] = a00 * b00 + a01 * b10
+    out[..., 0, 1] = a00 * b01 + a01 * b11
+    out[..., 1, 0] = a10 * b00 + a11 * b10
+    out[..., 1, 1] = a10 * b01 + a11 * b11
+    return out
+
+
+def quat_mul(A: np.ndarray, B: np.ndarray) -> np.ndarray:
+    """Quaternion product matching su2_from_quaternion(A) @ su2_from_quaternion(B)."""
+    shape = A.shape if A.shape == B.shape else np.broadcast_shapes(A.shape, B.shape)
+    out = np.empty(shape, dtype=A.dtype)
+    a0, a1, a2, a3 = A[..., 0], A[..., 1], A[..., 2], A[..., 3]
+    b0, b1, b2, b3 = B[..., 0], B[..., 1], B[..., 2], B[..., 3]
+    out[..., 0] = a0 * b0 - a1 * b1 - a2 * b2 - a3 * b3
+    out[..., 1] = a0 * b1 + a1 * b0 - a2 * b3 + a3 * b2
+    out[..., 2] = a0 * b2 + a2 * b0 - a3 * b1 + a1 * b3
+    out[..., 3] = a0 * b3 + a3 * b0 - a1 * b2 + a2 * b1
+    return out
+
+
+def quat_conj(A: np.ndarray) -> np.ndarray:
+    out = -A
+    out[..., 0] = A[..., 0]
+    return out
+
+
+def link_mul(A: np.ndarray, B: np.ndarray) -> np.ndarray:
+    return matmul2(A, B) if np.iscomplexobj(A) else quat_mul(A, B)
+
+
+def link_dag(A: np.ndarray) -> np.ndarray:
+    return dagger(A) if np.iscomplexobj(A) else quat_conj(A)
+
+
+def link_retr(A: np.ndarray) -> np.ndarray:
+    """Re tr(A) for stacks of links in either layout."""
+    if np.iscomplexobj(A):
+        return np.real(A[..., 0, 0] + A[..., 1, 1])
+    return 2.0 * A[..., 0]
+
+
+def retrace_product(A: np.ndarray, B: np.ndarray) -> np.ndarray:
+    """Re tr(A B) for stacks of links in either layout."""
+    if not np.iscomplexobj(A):
+        return 2.0 * (
+            A[..., 0] * B[..., 0] - A[..., 1] * B[..., 1] - A[..., 2] * B[..., 2] - A[..., 3] * B[..., 3]
+        )
+    return np.real(
+        A[..., 0, 0] * B[..., 0, 0]
+        + A[..., 0, 1] * B[..., 1, 0]
+        + A[..., 1, 0] * B[..., 0, 1]
+        + A[..., 1, 1] * B[..., 1, 1]
+    )
+
+
+def link_identity(shape: tuple[int, ...], layout: str = "matrix", precision: str = "double") -> np.ndarray:
+    out = np.zeros(shape + ((2, 2) if layout == "matrix" else (4,)), dtype=link_dtype(layout, precision))
+    if layout == "matrix":
+        out[...] = np.eye(2)
+    else:
+        out[..., 0] = 1.0
+    return out
+
+
+def link_norm(V: np.ndarray) -> np.ndarray:
+    """sqrt(det V) for sums of SU(2) elements (real multiples of SU(2) in either layout)."""
+    if np.iscomplexobj(V):
+        return np.sqrt(np.abs(V[..., 0, 0]) ** 2 + np.abs(V[..., 0, 1]) ** 2)
+    return np.sqrt(np.einsum("...i,...i->...", V, V))
@@ -0,0 +1,36 @@
+"""Replica exchange (parallel tempering) between chains at neighbouring beta.
+
+Chains at beta_0 < beta_1 < ... evolve independently; between segments, neighbouring
+pairs (k, k + 1) propose to exchange their configurations, even k and odd k in turn.
+With the Wilson action S = beta A, A = sum_P (1 - Re tr(U_P) / 2), a swap is accepted
+with probability min(1, exp((beta_k - beta_{k+1}) (A_k - A_{k+1}))), so the ensemble at
+every beta stays exact while configurations diffuse between the betas.
+"""
+
+from __future__ import annotations
+
+import math
+
+import numpy as np
+
+from .hmc import wilson_action
+
+
+def plaquette_action(U: np.ndarray) -> float:
+    """A = sum_P (1 - Re tr(U_P) / 2), the Wilson action at beta = 1."""
+    return wilson_action(U, 1.0)
+
+
+def swap_probability(beta_a: float, beta_b: float, action_a: float, action_b: float) -> float:
+    """Acceptance of exchanging the configurations (actions A_a, A_b) held at beta_a and beta_b."""
+    return math.exp(min(0.0, (beta_a - beta_b) * (action_a - action_b)))
+
+
+def propose_swaps(
+    betas: list[float], actions: list[float], rng: np.random.Generator, parity: int
+) -> list[tuple[int, bool]]:
+    """Metropolis decisions (k, accepted) for the pairs (k, k + 1), k = parity, parity + 2, ..."""
+    return [
+        (k, bool(rng.uniform() < swap_probability(betas[k], betas[k + 1], actions[k], actions[k + 1])))
+        for k in range(parity, len(betas) - 1, 2)
+    ]
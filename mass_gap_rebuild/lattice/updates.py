@@ -0,0 +1,192 @@
+"""Markov-chain link updates: per-site and checkerboard Metropolis, heatbath with overrelaxation.
+
+HMC lives in hmc.py and is registered here as "hmc".
+
+Every sweep has the signature sweep(U, beta, eps, rng) -> (accepted, proposed), updates
+U in place, and is registered in SWEEPS.
+"""
+
+from __future__ import annotations
+
+import functools
+import math
+
+import numpy as np
+
+from .hmc import hmc_sweep
+from .links import flat_links, lattice_shape, neighbor_table, parity_sites, staple, staple_sites
+from .su2 import (
+    as_layout,
+    link_dag,
+    link_layout,
+    link_mul,
+    link_ndim,
+    link_norm,
+    random_su2_near_identity,
+    random_su2_near_identity_batch,
+    retrace_product,
+)
+
+
+def metropolis_sweep(U: np.ndarray, beta: float, eps: float, rng: np.random.Generator) -> tuple[int, int]:
+    shape = lattice_shape(U)
+    layout = link_layout(U)
+    accepted = 0
+    total = 0
+    for x in np.ndindex(shape):
+        for mu in range(len(shape)):
+            old = U[x + (mu,)]
+            V = staple(U, x, mu, shape)
+            R = random_su2_near_identity(rng, eps, layout)
+            cand = link_mul(R, old)
+            dS = -(beta / 2.0) * retrace_product(cand - old, V)
+            total += 1
+            if dS <= 0.0 or rng.uniform() < np.exp(-dS):
+                U[x + (mu,)] = cand
+                accepted += 1
+    return accepted, total
+
+
+def metropolis_sweep_checkerboard(
+    U: np.ndarray, beta: float, eps: float, rng: np.random.Generator
+) -> tuple[int, int]:
+    """Metropolis sweep updating all even, then all odd, links of each direction at once.
+
+    Links of one direction and parity share no staple, so each half-lattice step is an
+    exact simultaneous single-link update with the same proposal as `metropolis_sweep`.
+    """
+    layout = link_layout(U)
+    shape = lattice_shape(U)
+    dims = len(shape)
+    links = flat_links(U)
+    nbr = neighbor_table(shape)
+    halves = [parity_sites(shape, p) for p in (0, 1)]
+    accepted = 0
+    total = 0
+    for mu in range(dims):
+        for sites in halves:
+            V = staple_sites(U, mu, sites, nbr)
+            old = np.take(links, sites * dims + mu, axis=0)
+            n = len(sites)
+            R = random_su2_near_identity_batch(rng, eps, n, layout).astype(U.dtype, copy=False)
+            cand = link_mul(R, old)
+            dS = -(beta / 2.0) * retrace_product(cand - old, V)
+            accept = rng.uniform(size=n) < np.exp(np.minimum(-dS, 0.0))
+            links[sites[accept] * dims + mu] = cand[accept]
+            accepted += int(np.count_nonzero(accept))
+            total += n
+    return accepted, total
+
+
+def kennedy_pendleton_x0(rng: np.random.Generator, alpha: np.ndarray) -> tuple[np.ndarray, int]:
+    """Sample x0 with density sqrt(1 - x0^2) exp(alpha x0) on [-1, 1] (Kennedy-Pendleton).
+
+    Returns the samples and the total number of trials it took to accept all of them.
+    """
+    n = alpha.shape[0]
+    x0 = np.empty(n)
+    pending = np.arange(n)
+    trials = 0
+    while pending.size:
+        a = alpha[pending]
+        r1, r2, r3, r4 = 1.0 - rng.uniform(size=(4, pending.size))
+        lam2 = -(np.log(r1) + np.cos(2.0 * np.pi * r2) ** 2 * np.log(r3)) / (2.0 * a)
+        ok = r4**2 <= 1.0 - lam2
+        trials += pending.size
+        x0[pending[ok]] = 1.0 - 2.0 * lam2[ok]
+        pending = pending[~ok]
+    return x0, trials
+
+
+def heatbath_links(V: np.ndarray, beta: float, rng: np.random.Generator) -> tuple[np.ndarray, int]:
+    """Draw new links U from exp((beta/2) Re tr(U V)) given their staple sums V."""
+    k = np.maximum(link_norm(V), 1e-300)
+    x0, trials = kennedy_pendleton_x0(rng, beta * k)
+    v = rng.normal(size=(x0.shape[0], 3))
+    v *= (np.sqrt(np.maximum(1.0 - x0**2, 0.0)) / np.linalg.norm(v, axis=1))[:, None]
+    X = as_layout(np.concatenate([x0[:, None], v], axis=1), link_layout(V))
+    # U = X Vhat^dag with Vhat = V / k, so Re tr(U V) = k Re tr(X) = 2 k x0.
+    scale = (1.0 / k).reshape(k.shape + (1,) * link_ndim(V))
+    return link_mul(X, link_dag(V) * scale), trials
+
+
+def overrelax_links(U_old: np.ndarray, V: np.ndarray) -> np.ndarray:
+    """Microcanonical reflection U -> Vhat^dag U^dag Vhat^dag; leaves Re tr(U V) unchanged."""
+    k = np.maximum(link_norm(V), 1e-300)
+    Vh_dag = link_dag(V) * (1.0 / k).reshape(k.shape + (1,) * link_ndim(V))
+    return link_mul(link_mul(Vh_dag, link_dag(U_old)), Vh_dag)
+
+
+def heatbath_sweep(
+    U: np.ndarray,
+    beta: float,
+    eps: float,
+    rng: np.random.Generator,
+    n_overrelax: int = 1,
+    active: np.ndarray | None = None,
+) -> tuple[int, int]:
+    """One checkerboard heatbath sweep followed by `n_overrelax` overrelaxation sweeps.
+
+    `eps` is unused and only kept so every entry of SWEEPS shares one signature. Every link
+    is replaced, so the returned (updated, trials) is the Kennedy-Pendleton acceptance.
+    With a boolean `active` mask of shape lattice_shape + (dims,), only those links are
+    updated and the rest stay frozen (used for the multilevel sub-updates).
+    """
+    shape = lattice_shape(U)
+    dims = len(shape)
+    links = flat_links(U)
+    nbr = neighbor_table(shape)
+    halves = [parity_sites(shape, p) for p in (0, 1)]
+    updated = 0
+    trials = 0
+    for step in range(1 + n_overrelax):
+        for mu in range(dims):
+            for sites in halves:
+                if active is not None:
+                    sites = sites[active.reshape(-1, dims)[sites, mu]]
+                V = staple_sites(U, mu, sites, nbr)
+                idx = sites * dims + mu
+                if step == 0:
+                    new, n_try = heatbath_links(V, beta, rng)
+                    updated += len(sites)
+                    trials += n_try
+                else:
+                    new = overrelax_links(np.take(links, idx, axis=0), V)
+                links[idx] = new
+    return updated, trials
+
+
+SWEEPS = {
+    "site": metropolis_sweep,
+    "checkerboard": metropolis_sweep_checkerboard,
+    "heatbath": heatbath_sweep,
+    "hmc": hmc_sweep,
+}
+
+
+# Sweeps whose acceptance is controlled by the proposal width eps.
+TUNABLE_SWEEPS = ("site", "checkerboard")
+EPS_RANGE = (1e-3, math.pi)
+
+
+def make_sweep(name: str, n_overrelax: int = 1, **hmc_options):
+    """Look up a sweep by name, binding the overrelaxation count for the heatbath.
+
+    `hmc_options` (step_size, n_steps, integrator, log, accept_reject) are bound for "hmc"
+    only and ignored otherwise.
+    """
+    if name == "heatbath":
+        return functools.partial(heatbath_sweep, n_overrelax=n_overrelax)
+    if name == "hmc":
+        return functools.partial(hmc_sweep, **hmc_options)
+    return SWEEPS[name]
+
+
+def tune_eps(eps: float, acceptance: float, target: float = 0.5, gain: float = 1.0) -> float:
+    """One adaptive step for the Metropolis proposal width, for use during thermalization.
+
+    eps is scaled by exp(gain * (acceptance - target)), so too many acceptances widen the
+    proposal and too few narrow it, then clipped to EPS_RANGE (proposal angles beyond pi
+    only repeat rotations).
+    """
+    return float(np.clip(eps * math.exp(gain * (acceptance - target)), *EPS_RANGE))
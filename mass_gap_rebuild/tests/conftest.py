@@ -0,0 +1,33 @@
+"""Put mass_gap_rebuild/ (for `import lattice`) and audits/ (for the drivers) on sys.path.
+
+Also provides `thermalized`, a small heatbath-thermalized lattice in each link layout; a
+module or test fixes the layout with `pytest.mark.parametrize("thermalized", [...], indirect=True)`.
+"""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+for path in (ROOT, ROOT / "audits"):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+from lattice import LAYOUTS, heatbath_sweep, init_links  # noqa: E402
+
+THERMALIZED_SHAPE = (4, 4, 2, 2)
+THERMALIZED_BETA = 2.3
+
+
+@pytest.fixture(params=LAYOUTS)
+def thermalized(request) -> np.ndarray:
+    """Fresh (4, 4, 2, 2) links after four heatbath sweeps at beta = 2.3 from a cold start."""
+    U = init_links(THERMALIZED_SHAPE, request.param)
+    rng = np.random.default_rng(0)
+    for _ in range(4):
+        heatbath_sweep(U, THERMALIZED_BETA, 0.0, rng)
+    return U
@@ -0,0 +1,117 @@
+"""FFT correlators, cosh effective masses, the batched bootstrap and autocorrelation errors."""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from lattice import (
+    autocorrelation,
+    block_size,
+    blocked_jackknife,
+    bootstrap_mass,
+    connected_correlator_from_ensemble,
+    effective_mass_cosh,
+    integrated_autocorr,
+    mass_from_ops,
+    plateau_mass,
+    timeslice_autocorrelations,
+)
+
+LT = 12
+
+
+def correlated_ops(n_cfg: int, mass: float = 0.6, seed: int = 0) -> np.ndarray:
+    """Timeslice operators whose connected correlator falls off like cosh(mass (t - Lt/2))."""
+    rng = np.random.default_rng(seed)
+    d = np.minimum(np.arange(LT), LT - np.arange(LT))
+    kernel = np.exp(-mass * d)
+    noise = rng.normal(size=(n_cfg, LT))
+    smooth = np.fft.irfft(np.fft.rfft(noise, axis=1) * np.fft.rfft(kernel), n=LT, axis=1)
+    return 1.0 + 0.1 * smooth
+
+
+def test_fft_autocorrelations_match_the_direct_sum():
+    ops = correlated_ops(5)
+    direct = np.array([[np.mean(o * np.roll(o, -dt)) for dt in range(LT)] for o in ops])
+    np.testing.assert_allclose(timeslice_autocorrelations(ops), direct, atol=1e-14)
+    centered = ops - ops.mean()
+    expected = np.mean([[np.mean(o * np.roll(o, -dt)) for dt in range(LT)] for o in centered], axis=0)
+    np.testing.assert_allclose(connected_correlator_from_ensemble(ops), expected, atol=1e-14)
+
+
+def test_effective_mass_of_a_cosh_is_exact():
+    t = np.arange(LT)
+    C = np.cosh(0.7 * (t - LT / 2))
+    np.testing.assert_allclose(effective_mass_cosh(C), 0.7, atol=1e-12)
+    assert plateau_mass(np.array([np.nan, 0.5, 0.7])) == pytest.approx(0.6)
+    assert np.isnan(plateau_mass(np.full(3, np.nan)))
+
+
+def loop_bootstrap(ops: np.ndarray, rng: np.random.Generator, n_boot: int, block: int) -> np.ndarray:
+    """Reference bootstrap: resample whole blocks with the same draws, one correlator at a time."""
+    n_blocks = ops.shape[0] // block
+    idx = rng.integers(0, n_blocks, size=(n_boot, n_blocks))
+    masses = []
+    for draw in idx:
+        rows = (draw[:, None] * block + np.arange(block)).ravel()
+        masses.append(mass_from_ops(ops[rows]))
+    return np.array(masses)
+
+
+@pytest.mark.parametrize("block", [1, 3])
+def test_batched_bootstrap_matches_a_loop(block):
+    ops = correlated_ops(40)  # 40 is not a multiple of 3: the partial block is dropped
+    mean, std, halfwidth = bootstrap_mass(ops, np.random.default_rng(1), n_boot=50, block=block)
+    masses = loop_bootstrap(ops, np.random.default_rng(1), 50, block)
+    masses = masses[np.isfinite(masses)]
+    lo, hi = np.quantile(masses, [0.16, 0.84])
+    assert mean == pytest.approx(np.mean(masses), rel=1e-10)
+    assert std == pytest.approx(np.std(masses), rel=1e-8)
+    assert halfwidth == pytest.approx(0.5 * (hi - lo), rel=1e-8)
+
+
+def ar1(n: int, rho: float, seed: int = 0) -> np.ndarray:
+    """x_i = rho x_{i-1} + noise, whose exact tau_int is (1 + rho) / (2 (1 - rho))."""
+    noise = np.random.default_rng(seed).normal(size=n)
+    x = np.empty(n)
+    x[0] = noise[0] / np.sqrt(1.0 - rho**2)
+    for i in range(1, n):
+        x[i] = rho * x[i - 1] + noise[i]
+    return x
+
+
+def test_autocorrelation_matches_the_direct_sum():
+    x = ar1(200, 0.5)
+    dx = x - x.mean()
+    direct = [np.mean(dx[: x.size - t] * dx[t:]) / np.mean(dx * dx) for t in range(20)]
+    np.testing.assert_allclose(autocorrelation(x)[:20], direct, atol=1e-12)
+
+
+def test_integrated_autocorr_of_an_ar1_series():
+    tau, err, window = integrated_autocorr(ar1(100_000, 0.8))
+    assert tau == pytest.approx(4.5, abs=3.0 * err)
+    assert err > 0.0 and window >= 6.0 * tau
+    # Alternating series undershoot 1/2 and are clamped there; constant ones carry no signal.
+    assert integrated_autocorr(ar1(10_000, -0.8))[0] == 0.5
+    assert integrated_autocorr(np.ones(10)) == (0.5, 0.0, 0)
+
+
+def test_block_size_keeps_two_blocks():
+    assert block_size(4.5, 1000) == 9
+    assert block_size(0.5, 1000) == 1
+    assert block_size(40.0, 30) == 15
+    assert block_size(3.0, 1) == 1
+
+
+def test_blocked_jackknife():
+    x = ar1(1005, 0.0, seed=1)
+    mean, err = blocked_jackknife(x)
+    assert mean == pytest.approx(np.mean(x))
+    assert err == pytest.approx(np.std(x, ddof=1) / np.sqrt(x.size), rel=1e-12)
+    # Blocks of 10 (the trailing 5 samples dropped) behave like 100 samples of block means.
+    means = x[:1000].reshape(100, 10).mean(axis=1)
+    assert blocked_jackknife(x, 10)[1] == pytest.approx(np.std(means, ddof=1) / 10.0, rel=1e-12)
+    # Fewer than two blocks give no error estimate.
+    mean, err = blocked_jackknife(x[:15], 10)
+    assert mean == pytest.approx(np.mean(x[:15])) and np.isnan(err)
@@ -0,0 +1,71 @@
+"""Checkpointed chains resume bit-exactly and reproduce the scan's report row."""
+
+from __future__ import annotations
+
+import json
+
+import numpy as np
+import pytest
+
+import run_real_su2_scaling_scan as scan
+from lattice import init_links, load_checkpoint, save_checkpoint
+
+HMC = {"step_size": 0.1, "n_steps": 5, "integrator": "omelyan"}
+RUNS = {
+    "checkerboard": {"sweep": "checkerboard", "target_acceptance": 0.6},
+    "heatbath": {"sweep": "heatbath", "layout": "quaternion"},
+    "hmc": {"sweep": "hmc", "hmc_options": HMC},
+}
+
+
+def chain(tmp_path, resume: bool = False, **kwargs) -> dict:
+    options = dict(L=4, beta=2.3, n_therm=10, n_cfg=6, sweeps_between=1, checkpoint_every=4, seed=5)
+    options.update(kwargs)
+    return scan.run_chain(
+        rng=np.random.default_rng(5),
+        checkpoint=tmp_path / "chain.ckpt.json",
+        resume=resume,
+        stream_dir=tmp_path / "streams",
+        **options,
+    )
+
+
+def report_row(c: dict) -> str:
+    """The scan's CSV/JSON row for this chain, serialized so NaN entries compare equal."""
+    row = scan.merge_chains(4, 4, 2.3, 5, [c], np.random.default_rng(0), 20)
+    for key in ("timer", "replicas"):
+        row.pop(key)
+    return json.dumps(row, default=float)
+
+
+@pytest.mark.parametrize("run", RUNS)
+# Killed during thermalization, or one measurement past the checkpoint at 4 measurements
+# (the resumed run has to drop that record again).
+@pytest.mark.parametrize("stop", [0, 5])
+def test_resumed_chain_reproduces_the_report(tmp_path, run, stop):
+    full = chain(tmp_path / "full", **RUNS[run])
+    # A shorter run leaves its last checkpoint behind, like a run killed at that point.
+    chain(tmp_path / "cut", n_cfg=stop, **RUNS[run])
+    resumed = chain(tmp_path / "cut", resume=True, **RUNS[run])
+    for key in ("plaquettes", "creutz", "polyakov_abs", "ts_ops"):
+        np.testing.assert_array_equal(resumed[key], full[key])
+    for key in ("accepted", "proposed", "therm_accepted", "therm_proposed", "eps", "eps_trajectory"):
+        assert resumed[key] == full[key]
+    assert resumed["hmc_log"].state() == full["hmc_log"].state()
+    assert report_row(resumed) == report_row(full)
+
+
+def test_checkpoint_refuses_other_run_parameters(tmp_path):
+    U = init_links((2, 2, 2, 2), "matrix")
+    rng = np.random.default_rng(0)
+    path = tmp_path / "run.ckpt.json"
+    save_checkpoint(path, U, rng, params={"beta": 2.3}, L=2, beta=2.3, seed=0, sweep_index=4, n_measured=1)
+    links, doc = load_checkpoint(path, {"beta": 2.3})
+    np.testing.assert_array_equal(links, U)
+    assert doc["sweep_index"] == 4 and doc["n_measured"] == 1
+    assert doc["rng_state"] == rng.bit_generator.state
+    with pytest.raises(ValueError):
+        load_checkpoint(path, {"beta": 2.4})
+    # Only the newest link file is kept next to the checkpoint.
+    save_checkpoint(path, U, rng, params={"beta": 2.3}, L=2, beta=2.3, seed=0, sweep_index=8)
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["run.ckpt.json", "run_sw0000008.su2cfg"]
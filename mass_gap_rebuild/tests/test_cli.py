@@ -0,0 +1,32 @@
+"""Command-line options shared by the drivers."""
+
+from __future__ import annotations
+
+import argparse
+
+from lattice import (
+    add_measurement_args,
+    add_storage_args,
+    add_update_args,
+    hmc_options_from_args,
+    make_sweep,
+    smearing_from_args,
+)
+
+
+def parser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser()
+    add_update_args(p)
+    add_measurement_args(p)
+    add_storage_args(p)
+    return p
+
+
+def test_parsed_options_become_kernel_keywords():
+    args = parser().parse_args(
+        ["--sweep", "hmc", "--hmc-steps", "4", "--smear", "stout", "--smear-levels", "2", "0", "2"]
+    )
+    assert hmc_options_from_args(args) == {"step_size": 0.1, "n_steps": 4, "integrator": "omelyan"}
+    assert smearing_from_args(args) == {"method": "stout", "alpha": 0.5, "levels": [0, 2]}
+    assert (args.links, args.precision, args.reunitarize_every) == ("matrix", "double", 10)
+    make_sweep(args.sweep, args.overrelax, **hmc_options_from_args(args))
@@ -0,0 +1,47 @@
+"""Binary configuration files: header, memory-mapped reload and checksum."""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from lattice import (
+    HEADER_BYTES,
+    LAYOUTS,
+    config_path,
+    list_configs,
+    load_config,
+    random_su2,
+    read_header,
+    write_config,
+)
+
+
+@pytest.mark.parametrize("layout", LAYOUTS)
+def test_config_round_trips_through_a_memory_map(tmp_path, layout):
+    U = random_su2(np.random.default_rng(0), layout, (4, 2, 2, 2, 4))
+    path = config_path(tmp_path, (4, 2, 2, 2), 2.3, 7, 120, replica=1)
+    write_config(path, U, L=(4, 2, 2, 2), beta=2.3, seed=7, sweep_index=120, layout=layout)
+    assert path.name == "su2_L4x2x2x2_b2.3_s7_r1_sw0000120.su2cfg"
+    assert path.stat().st_size == HEADER_BYTES + U.nbytes
+    V, header = load_config(path)
+    assert isinstance(V, np.memmap)
+    np.testing.assert_array_equal(V, U)
+    assert header["L"] == [4, 2, 2, 2] and header["layout"] == layout and header["sweep_index"] == 120
+    assert read_header(path) == header
+    assert list_configs(tmp_path) == [path]
+
+
+def test_corrupted_payload_fails_the_checksum(tmp_path):
+    U = random_su2(np.random.default_rng(1), "matrix", (2, 2, 2, 2, 4))
+    path = write_config(tmp_path / "cfg.su2cfg", U, L=2, beta=2.0, seed=0, sweep_index=1)
+    assert read_header(path)["L"] == 2
+    data = bytearray(path.read_bytes())
+    data[-1] ^= 0xFF
+    path.write_bytes(bytes(data))
+    with pytest.raises(ValueError):
+        load_config(path)
+    load_config(path, verify=False)
+    (tmp_path / "junk.su2cfg").write_bytes(b"not a config")
+    with pytest.raises(ValueError):
+        read_header(tmp_path / "junk.su2cfg")
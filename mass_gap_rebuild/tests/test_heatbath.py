@@ -0,0 +1,68 @@
+"""Kennedy-Pendleton heatbath and overrelaxation."""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from lattice import (
+    LAYOUTS,
+    heatbath_links,
+    heatbath_sweep,
+    init_links,
+    kennedy_pendleton_x0,
+    link_norm,
+    overrelax_links,
+    random_su2,
+    retrace_product,
+    slab_active_mask,
+    unitarity_violation,
+)
+
+
+def x0_mean(alpha: float) -> float:
+    """<x0> under sqrt(1 - x0^2) exp(alpha x0) on [-1, 1], by quadrature."""
+    x = np.linspace(-1.0, 1.0, 200001)
+    w = np.sqrt(1.0 - x**2) * np.exp(alpha * (x - 1.0))
+    return float(np.sum(x * w) / np.sum(w))
+
+
+@pytest.mark.parametrize("alpha", [0.5, 2.0, 8.0])
+def test_kennedy_pendleton_samples_the_x0_density(alpha):
+    x0, trials = kennedy_pendleton_x0(np.random.default_rng(0), np.full(200_000, alpha))
+    assert trials >= x0.size
+    assert np.all(np.abs(x0) <= 1.0)
+    assert np.mean(x0) == pytest.approx(x0_mean(alpha), abs=3e-3)
+
+
+@pytest.mark.parametrize("layout", LAYOUTS)
+def test_heatbath_links_are_su2_with_the_right_action(layout):
+    rng = np.random.default_rng(1)
+    # Staple sums are real multiples of SU(2) elements: k V with |V| = 1.
+    V = 1.5 * random_su2(rng, layout, (100_000,))
+    U, _ = heatbath_links(V, 2.0, rng)
+    assert unitarity_violation(U) < 1e-12
+    k = link_norm(V)
+    assert np.mean(retrace_product(U, V) / (2.0 * k)) == pytest.approx(x0_mean(2.0 * 1.5), abs=3e-3)
+
+
+@pytest.mark.parametrize("layout", LAYOUTS)
+def test_overrelaxation_keeps_the_local_action(layout):
+    rng = np.random.default_rng(2)
+    U = random_su2(rng, layout, (1000,))
+    V = random_su2(rng, layout, (1000,)) + random_su2(rng, layout, (1000,))
+    new = overrelax_links(U, V)
+    assert unitarity_violation(new) < 1e-12
+    np.testing.assert_allclose(retrace_product(new, V), retrace_product(U, V), atol=1e-12)
+    np.testing.assert_allclose(overrelax_links(new, V), U, atol=1e-12)
+
+
+def test_heatbath_sweep_updates_only_active_links():
+    U = init_links((4, 2, 2, 2), "matrix")
+    active = slab_active_mask((4, 2, 2, 2), 2)
+    before = U.copy()
+    updated, trials = heatbath_sweep(U, 2.3, 0.0, np.random.default_rng(3), n_overrelax=2, active=active)
+    assert updated == int(active.sum()) and trials >= updated
+    changed = np.any(U != before, axis=(-2, -1))
+    assert np.all(changed[active]) and not np.any(changed[~active])
+    assert unitarity_violation(U) < 1e-12
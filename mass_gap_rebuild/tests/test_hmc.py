@@ -0,0 +1,90 @@
+"""HMC force, integrators, reversibility and the dH bookkeeping."""
+
+from __future__ import annotations
+
+import json
+
+import numpy as np
+import pytest
+
+from lattice import (
+    INTEGRATORS,
+    HMCLog,
+    exp_su2,
+    hamiltonian,
+    hmc_diagnostics,
+    hmc_force,
+    hmc_reversibility,
+    hmc_sweep,
+    lattice_shape,
+    link_layout,
+    link_mul,
+    md_trajectory,
+    neighbor_table,
+    wilson_action,
+)
+
+BETA = 2.3
+
+
+def test_force_is_minus_the_action_gradient(thermalized):
+    U = thermalized
+    layout = link_layout(U)
+    F = hmc_force(U, BETA, neighbor_table(lattice_shape(U)))
+    h = 1e-5
+    for site, mu, a in [((0, 0, 0, 0), 0, 0), ((1, 0, 1, 0), 2, 1), ((3, 1, 1, 1), 3, 2)]:
+        omega = np.zeros(3)
+        omega[a] = h
+        actions = []
+        for sign in (1.0, -1.0):
+            V = U.copy()
+            V[site + (mu,)] = link_mul(exp_su2(sign * omega, layout), U[site + (mu,)])
+            actions.append(wilson_action(V, BETA))
+        assert -(actions[0] - actions[1]) / (2 * h) == pytest.approx(F[site + (mu, a)], abs=1e-6)
+
+
+@pytest.mark.parametrize("integrator", INTEGRATORS)
+def test_trajectories_are_reversible(thermalized, integrator):
+    check = hmc_reversibility(thermalized, BETA, np.random.default_rng(1), 0.05, 10, integrator)
+    assert check["max_link_deviation"] < 1e-10
+    assert check["max_momentum_deviation"] < 1e-10
+    assert abs(check["dH_roundtrip"]) < 1e-9
+
+
+@pytest.mark.parametrize("integrator", INTEGRATORS)
+def test_energy_violation_is_second_order_in_the_step(thermalized, integrator):
+    U = thermalized
+    P = np.random.default_rng(2).normal(size=lattice_shape(U) + (4, 3))
+    H0 = hamiltonian(U, P, BETA)
+    dH = [abs(hamiltonian(*md_trajectory(U, P, BETA, 0.4 / n, n, integrator), BETA) - H0) for n in (8, 16)]
+    assert dH[0] / dH[1] == pytest.approx(4.0, rel=0.25)
+
+
+def test_sweep_accepts_everything_only_without_accept_reject(thermalized):
+    U = thermalized
+    rng = np.random.default_rng(3)
+    log = HMCLog()
+    # A huge step size makes dH large, so the Metropolis test rejects and U stays put.
+    before = U.copy()
+    assert hmc_sweep(U, BETA, 0.0, rng, step_size=1.0, n_steps=5, log=log) == (0, 1)
+    np.testing.assert_array_equal(U, before)
+    assert hmc_sweep(U, BETA, 0.0, rng, step_size=1.0, n_steps=5, log=log, accept_reject=False) == (1, 1)
+    assert not np.array_equal(U, before)
+    assert len(log) == 2
+
+
+def test_hmc_log_merges_and_round_trips():
+    rng = np.random.default_rng(4)
+    entries = [{"dH": float(dH), "accepted": bool(dH < 0.3)} for dH in rng.normal(0.0, 0.5, size=40)]
+    whole, first, second = HMCLog(), HMCLog(), HMCLog()
+    for n, entry in enumerate(entries):
+        whole.append(entry)
+        (first if n < 15 else second).append(entry)
+    first.merge(second)
+    restored = HMCLog.from_state(json.loads(json.dumps(first.state())))
+    expected = hmc_diagnostics(entries)
+    for log in (whole, restored):
+        assert hmc_diagnostics(log) == pytest.approx(expected, rel=1e-12)
+    assert expected["hmc_trajectories"] == 40
+    assert expected["hmc_dH_abs_max"] == max(abs(e["dH"]) for e in entries)
+    assert hmc_diagnostics([]) == {}
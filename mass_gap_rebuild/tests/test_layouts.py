@@ -0,0 +1,67 @@
+"""Matrix and quaternion links describe the same SU(2) elements and the same Markov chains."""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from lattice import (
+    LAYOUTS,
+    SWEEPS,
+    as_layout,
+    avg_plaquette,
+    init_links,
+    link_dag,
+    link_mul,
+    link_retr,
+    make_sweep,
+    matmul2,
+    polyakov_loop,
+    quat_mul,
+    quaternion_from_su2,
+    random_su2,
+    su2_from_quaternion,
+    unitarity_violation,
+    wilson_loop_table,
+)
+
+
+def test_quaternion_product_matches_matrix_product():
+    rng = np.random.default_rng(0)
+    A, B = random_su2(rng, "quaternion", (50,)), random_su2(rng, "quaternion", (50,))
+    expected = matmul2(su2_from_quaternion(A), su2_from_quaternion(B))
+    np.testing.assert_allclose(su2_from_quaternion(quat_mul(A, B)), expected, atol=1e-14)
+    np.testing.assert_allclose(quaternion_from_su2(su2_from_quaternion(A)), A, atol=1e-14)
+
+
+def test_link_helpers_agree_across_layouts():
+    rng = np.random.default_rng(1)
+    q = random_su2(rng, "quaternion", (20,))
+    r = random_su2(rng, "quaternion", (20,))
+    M, N = as_layout(q, "matrix"), as_layout(r, "matrix")
+    product = quaternion_from_su2(link_mul(M, link_dag(N)))
+    np.testing.assert_allclose(product, link_mul(q, link_dag(r)), atol=1e-14)
+    np.testing.assert_allclose(link_retr(M), link_retr(q), atol=1e-14)
+    assert unitarity_violation(M) < 1e-14
+    assert unitarity_violation(q) < 1e-14
+
+
+def test_observables_agree_across_layouts():
+    q = random_su2(np.random.default_rng(2), "quaternion", (4, 2, 2, 2, 4))
+    M = as_layout(q, "matrix")
+    assert avg_plaquette(M) == pytest.approx(avg_plaquette(q), abs=1e-14)
+    assert polyakov_loop(M) == pytest.approx(polyakov_loop(q), abs=1e-14)
+    np.testing.assert_allclose(wilson_loop_table(M, 2), wilson_loop_table(q, 2), atol=1e-14)
+
+
+@pytest.mark.parametrize("name", SWEEPS)
+def test_sweeps_give_the_same_chain_in_both_layouts(name):
+    chains = {}
+    for layout in LAYOUTS:
+        U = init_links((4, 2, 2, 2), layout)
+        rng = np.random.default_rng(3)
+        update = make_sweep(name, 1)
+        counts = [update(U, 2.3, 0.3, rng) for _ in range(2)]
+        chains[layout] = (quaternion_from_su2(U) if layout == "matrix" else U, counts)
+    np.testing.assert_allclose(chains["matrix"][0], chains["quaternion"][0], atol=1e-12)
+    assert chains["matrix"][1] == chains["quaternion"][1]
@@ -0,0 +1,33 @@
+"""Per-site and checkerboard Metropolis sample the same distribution."""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from lattice import LAYOUTS, SWEEPS, avg_plaquette, blocked_jackknife, init_links
+
+SHAPE = (2, 2, 2, 2)
+BETA, EPS = 2.3, 1.0
+
+
+def chain(name: str, layout: str, n_therm: int = 20, n: int = 150) -> tuple[np.ndarray, np.ndarray]:
+    """Per-sweep acceptance rate and average plaquette after a cold start."""
+    U = init_links(SHAPE, layout)
+    rng = np.random.default_rng(7)
+    acc, plaq = [], []
+    for i in range(n_therm + n):
+        accepted, proposed = SWEEPS[name](U, BETA, EPS, rng)
+        if i >= n_therm:
+            acc.append(accepted / proposed)
+            plaq.append(avg_plaquette(U))
+    return np.array(acc), np.array(plaq)
+
+
+@pytest.mark.parametrize("layout", LAYOUTS)
+def test_checkerboard_matches_the_site_sweep(layout):
+    site, checkerboard = chain("site", layout), chain("checkerboard", layout)
+    for a, b in zip(site, checkerboard):
+        # The plaquette decorrelates over ~5 sweeps, so blocks of 15 are independent.
+        (mean_a, err_a), (mean_b, err_b) = blocked_jackknife(a, 15), blocked_jackknife(b, 15)
+        assert abs(mean_a - mean_b) < 4.0 * np.hypot(err_a, err_b)
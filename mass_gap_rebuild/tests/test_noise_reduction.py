@@ -0,0 +1,68 @@
+"""Multi-hit and multilevel Wilson-loop estimators."""
+
+from __future__ import annotations
+
+import math
+
+import numpy as np
+import pytest
+
+from lattice import (
+    bessel_ratio_i2_i1,
+    heatbath_links,
+    link_dag,
+    link_norm,
+    measure_wilson_loops,
+    multilevel_wilson_loop_table,
+    random_su2,
+    wilson_loop,
+    wilson_loop_table,
+)
+
+
+def bessel_i(n: int, x: float) -> float:
+    return sum((x / 2) ** (2 * m + n) / (math.factorial(m) * math.factorial(m + n)) for m in range(60))
+
+
+@pytest.mark.parametrize("x", [0.1, 1.0, 4.6, 12.0])
+def test_bessel_ratio_matches_the_series(x):
+    assert bessel_ratio_i2_i1(np.array([x]))[0] == pytest.approx(bessel_i(2, x) / bessel_i(1, x), rel=1e-12)
+
+
+def test_multihit_mean_is_the_heatbath_average():
+    rng = np.random.default_rng(1)
+    V = np.broadcast_to(1.5 * random_su2(rng, "quaternion"), (200_000, 4))
+    U, _ = heatbath_links(V, 2.0, rng)
+    k = link_norm(V[:1])
+    expected = link_dag(V[0]) * bessel_ratio_i2_i1(2.0 * k)[0] / k[0]
+    np.testing.assert_allclose(U.mean(axis=0), expected, atol=5e-3)
+
+
+def test_multilevel_without_sub_updates_is_the_plain_estimator(thermalized):
+    U = thermalized
+    before = U.copy()
+    table = multilevel_wilson_loop_table(U, 2.3, 2, 4, n_sub=0)
+    for R in (1, 2):
+        for T in range(1, 5):
+            plain = np.mean([wilson_loop(U, R, T, i, 0) for i in range(1, 4)])
+            assert table[R - 1, T - 1] == pytest.approx(plain, abs=1e-12)
+    np.testing.assert_array_equal(U, before)
+    # Thicker slabs only give loops whose T is a multiple of the slab.
+    table = multilevel_wilson_loop_table(U, 2.3, 2, 4, n_sub=0, slab=2)
+    assert np.all(np.isnan(table[:, 0::2])) and np.all(np.isfinite(table[:, 1::2]))
+
+
+def test_multilevel_leaves_the_links_untouched(thermalized):
+    U = thermalized
+    before = U.copy()
+    rng = np.random.default_rng(2)
+    table = measure_wilson_loops(U, 2, estimator="multilevel", beta=2.3, rng=rng, n_sub=3)
+    np.testing.assert_array_equal(U, before)
+    assert np.all(np.isfinite(table))
+    with pytest.raises(ValueError):
+        multilevel_wilson_loop_table(U, 2.3, 2, n_sub=3)
+
+
+def test_plain_estimator_is_the_wilson_loop_table(thermalized):
+    U = thermalized
+    np.testing.assert_array_equal(measure_wilson_loops(U, 2), wilson_loop_table(U, 2))
@@ -0,0 +1,67 @@
+"""Wilson loops and timeslice operators against direct per-site evaluation."""
+
+from __future__ import annotations
+
+import itertools
+
+import numpy as np
+import pytest
+
+from lattice import LAYOUTS, as_layout, momentum_label, random_su2, timeslice_operators, wilson_loop_table
+
+SHAPE = (4, 4, 3, 3)
+
+
+def random_quaternions(seed: int = 0) -> np.ndarray:
+    return random_su2(np.random.default_rng(seed), "quaternion", SHAPE + (len(SHAPE),))
+
+
+def walked_loop(U: np.ndarray, x: tuple[int, ...], mu: int, nu: int, R: int, T: int) -> float:
+    """Re tr / 2 of the R x T loop at x, multiplying link matrices along the closed path."""
+    site = np.array(x)
+    P = np.eye(2, dtype=complex)
+    for step, n in ((mu, R), (nu, T), (-mu - 1, R), (-nu - 1, T)):
+        for _ in range(n):
+            if step >= 0:  # forward: U_step(site), then move
+                P = P @ U[tuple(site % SHAPE) + (step,)]
+                site[step] += 1
+            else:  # backward along d: move, then U_d(site)^dagger
+                d = -step - 1
+                site[d] -= 1
+                P = P @ U[tuple(site % SHAPE) + (d,)].conj().T
+    return P.trace().real / 2.0
+
+
+@pytest.mark.parametrize("layout", LAYOUTS)
+def test_wilson_loop_table_matches_a_path_walk(layout):
+    q = random_quaternions()
+    U = as_layout(q, "matrix")
+    R_max, T_max = 2, 3
+    planes = [(mu, nu) for mu in range(4) for nu in range(4) if mu != nu]
+    expected = np.zeros((R_max, T_max))
+    for R, T in itertools.product(range(1, R_max + 1), range(1, T_max + 1)):
+        loops = [walked_loop(U, x, mu, nu, R, T) for x in np.ndindex(SHAPE) for mu, nu in planes]
+        expected[R - 1, T - 1] = np.mean(loops)
+    np.testing.assert_allclose(wilson_loop_table(as_layout(q, layout), R_max, T_max), expected, atol=1e-13)
+
+
+def test_timeslice_operators_match_direct_sums():
+    U = as_layout(random_quaternions(1), "matrix")
+    momenta = ((1, 0, 0), (0, 1, 1), (-1, 0, 2))
+    ops = timeslice_operators(U, momenta)
+    planes = [(i, j) for i in range(1, 4) for j in range(i + 1, 4)]
+    P = {plane: np.zeros(SHAPE) for plane in planes}
+    for x in np.ndindex(SHAPE):
+        for i, j in planes:
+            P[i, j][x] = walked_loop(U, x, i, j, 1, 1)
+    for i, j in planes:
+        np.testing.assert_allclose(ops[f"plaq_{i}{j}"], P[i, j].mean(axis=(1, 2, 3)), atol=1e-13)
+    np.testing.assert_allclose(ops["plaq_sum"], np.mean([ops[f"plaq_{i}{j}"] for i, j in planes], axis=0))
+    average = np.mean([P[plane] for plane in planes], axis=0)
+    for n in momenta:
+        phase = np.zeros(SHAPE[1:])
+        for x in np.ndindex(SHAPE[1:]):
+            phase[x] = sum(2.0 * np.pi * k * xi / L for k, xi, L in zip(n, x, SHAPE[1:]))
+        projected = np.array([np.mean(np.exp(-1j * phase) * average[t]) for t in range(SHAPE[0])])
+        np.testing.assert_allclose(ops[momentum_label(n) + "_re"], projected.real, atol=1e-13)
+        np.testing.assert_allclose(ops[momentum_label(n) + "_im"], projected.imag, atol=1e-13)
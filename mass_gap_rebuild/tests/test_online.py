@@ -0,0 +1,100 @@
+"""Streaming accumulators and append-only record files."""
+
+from __future__ import annotations
+
+import json
+
+import numpy as np
+import pytest
+
+from lattice import ArrayLog, BinningAccumulator, RecordLog, Welford, read_record_column, read_records
+
+
+def round_trip(state: dict) -> dict:
+    return json.loads(json.dumps(state))
+
+
+def test_welford_matches_numpy_for_scalars_and_arrays():
+    rng = np.random.default_rng(0)
+    x = rng.normal(3.0, 2.0, size=(500, 3))
+    scalar, vector = Welford(), Welford()
+    for row in x:
+        scalar.push(row[0])
+        vector.push(row)
+    assert scalar.mean == pytest.approx(np.mean(x[:, 0]), rel=1e-12)
+    assert scalar.variance == pytest.approx(np.var(x[:, 0]), rel=1e-10)
+    np.testing.assert_allclose(vector.mean, x.mean(axis=0), rtol=1e-12)
+    np.testing.assert_allclose(vector.std, x.std(axis=0), rtol=1e-10)
+
+
+def test_welford_merge_and_state_round_trip():
+    x = np.random.default_rng(1).normal(size=300)
+    parts = [Welford(), Welford(), Welford()]
+    for n, value in enumerate(x):
+        parts[n * 3 // len(x)].push(value)
+    merged = Welford.from_state(round_trip(parts[0].state()))
+    for part in parts[1:]:
+        merged.merge(Welford.from_state(round_trip(part.state())))
+    merged.merge(Welford())
+    assert merged.n == x.size
+    assert merged.mean == pytest.approx(np.mean(x), rel=1e-12)
+    assert merged.variance == pytest.approx(np.var(x), rel=1e-10)
+
+
+def test_binning_error_and_tau_int():
+    rng = np.random.default_rng(2)
+    iid = rng.normal(size=4096)
+    acc = BinningAccumulator()
+    for value in iid:
+        acc.push(value)
+    assert acc.mean == pytest.approx(np.mean(iid))
+    assert acc.level_errors()[0] == pytest.approx(np.std(iid) / np.sqrt(iid.size - 1), rel=1e-10)
+    assert acc.tau_int() < 1.0
+
+    # AR(1) with rho = 0.8 has tau_int = (1 + rho) / (2 (1 - rho)) = 4.5.
+    ar = np.empty(2**15)
+    ar[0] = 0.0
+    for n in range(1, ar.size):
+        ar[n] = 0.8 * ar[n - 1] + rng.normal()
+    acc = BinningAccumulator()
+    for value in ar:
+        acc.push(value)
+    assert acc.tau_int() == pytest.approx(4.5, rel=0.3)
+    restored = BinningAccumulator.from_state(round_trip(acc.state()))
+    assert restored.error() == acc.error() and restored.n == acc.n
+
+
+def test_record_log_appends_flushes_and_truncates(tmp_path):
+    path = tmp_path / "obs.csv"
+    log = RecordLog(path, ["cfg_index", "plaquette"], flush_every=2)
+    for n in range(5):
+        log.append({"cfg_index": n, "plaquette": 0.5 + n})
+        if n == 1:
+            # Readable while the run goes on, up to the last flush.
+            assert read_record_column(path, "plaquette").tolist() == [0.5, 1.5]
+    log.close()
+    log = RecordLog(path, ["cfg_index", "plaquette"], keep=3)
+    assert log.count == 3
+    log.append({"cfg_index": 3, "plaquette": -1.0})
+    log.close()
+    assert read_records(path) == [
+        {"cfg_index": 0.0, "plaquette": 0.5},
+        {"cfg_index": 1.0, "plaquette": 1.5},
+        {"cfg_index": 2.0, "plaquette": 2.5},
+        {"cfg_index": 3.0, "plaquette": -1.0},
+    ]
+
+
+def test_array_log_loads_and_truncates(tmp_path):
+    path = tmp_path / "ops.f64"
+    rows = np.random.default_rng(3).normal(size=(7, 2, 3))
+    log = ArrayLog(path, (2, 3), flush_every=3)
+    for row in rows:
+        log.append(row)
+    np.testing.assert_array_equal(log.load(), rows)
+    log.close()
+    log = ArrayLog(path, (2, 3), keep=4)
+    log.append(rows[0])
+    np.testing.assert_array_equal(log.load(), np.concatenate([rows[:4], rows[:1]]))
+    log.close()
+    assert ArrayLog(tmp_path / "empty.f64", (2, 3)).load().shape == (0, 2, 3)
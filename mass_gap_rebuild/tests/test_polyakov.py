@@ -0,0 +1,70 @@
+"""Polyakov loops and their correlator."""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from lattice import (
+    LAYOUTS,
+    gauge_transform,
+    init_links,
+    link_mul,
+    link_retr,
+    polyakov_correlator,
+    polyakov_loop,
+    polyakov_loop_field,
+    radial_average,
+    random_gauge_field,
+    random_su2,
+)
+
+# Odd Lt exercises the pairwise reduction's leftover line; unequal spatial extents the FFT.
+SHAPE = (5, 2, 4, 2)
+
+
+def random_links(layout: str, seed: int = 0) -> np.ndarray:
+    return random_su2(np.random.default_rng(seed), layout, SHAPE + (4,))
+
+
+@pytest.mark.parametrize("layout", LAYOUTS)
+def test_polyakov_field_is_the_ordered_temporal_product(layout):
+    U = random_links(layout)
+    expected = np.empty(SHAPE[1:])
+    for x in np.ndindex(SHAPE[1:]):
+        line = U[(0,) + x + (0,)]
+        for t in range(1, SHAPE[0]):
+            line = link_mul(line, U[(t,) + x + (0,)])
+        expected[x] = link_retr(line) / 2.0
+    np.testing.assert_allclose(polyakov_loop_field(U), expected, atol=1e-13)
+
+
+def test_polyakov_loop_of_the_cold_start_is_one():
+    assert polyakov_loop(init_links(SHAPE, "quaternion")) == pytest.approx(1.0)
+
+
+@pytest.mark.parametrize("layout", LAYOUTS)
+def test_polyakov_loop_is_gauge_invariant(layout):
+    U = random_links(layout)
+    G = random_gauge_field(SHAPE, np.random.default_rng(1), layout)
+    np.testing.assert_allclose(polyakov_loop_field(gauge_transform(U, G)), polyakov_loop_field(U), atol=1e-13)
+
+
+def test_correlator_matches_the_direct_average():
+    U = random_links("matrix")
+    P = polyakov_loop_field(U)
+    C = polyakov_correlator(U)
+    assert C.shape == SHAPE[1:]
+    for r in np.ndindex(SHAPE[1:]):
+        shifted = np.roll(P, tuple(-n for n in r), axis=(0, 1, 2))
+        assert C[r] == pytest.approx(np.mean(P * shifted), abs=1e-13)
+    assert C[0, 0, 0] == pytest.approx(np.mean(P**2))
+
+
+def test_radial_average_groups_minimal_image_shells():
+    C = np.arange(16.0).reshape(4, 4)
+    r, avg = radial_average(C)
+    np.testing.assert_allclose(r, [0.0, 1.0, np.sqrt(2.0), 2.0, np.sqrt(5.0), np.sqrt(8.0)])
+    assert avg[0] == 0.0
+    assert avg[1] == pytest.approx(np.mean([C[1, 0], C[3, 0], C[0, 1], C[0, 3]]))
+    assert avg[-1] == C[2, 2]
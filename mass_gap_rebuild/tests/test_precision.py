@@ -0,0 +1,44 @@
+"""Single- vs double-precision plaquette chains and their agreement test."""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from lattice import LAYOUTS, PRECISIONS, heatbath_sweep, link_dtype, plaquette_chain, precision_agreement
+
+
+def chain(layout: str, precision: str, dtypes: set | None = None) -> np.ndarray:
+    def sweep(U, beta, eps, rng):
+        if dtypes is not None:
+            dtypes.add(U.dtype)
+        return heatbath_sweep(U, beta, eps, rng)
+
+    return plaquette_chain(
+        (4, 2, 2, 2), 2.3, sweep, np.random.default_rng(3), n_therm=5, n_meas=40,
+        layout=layout, precision=precision, reunitarize_every=5,
+    )
+
+
+@pytest.mark.parametrize("precision", PRECISIONS)
+@pytest.mark.parametrize("layout", LAYOUTS)
+def test_chain_runs_at_the_requested_precision(layout, precision):
+    dtypes: set = set()
+    plaquettes = chain(layout, precision, dtypes)
+    assert dtypes == {link_dtype(layout, precision)}
+    assert plaquettes.dtype == np.float64 and plaquettes.shape == (40,)
+
+
+def test_identical_seed_chains_agree_across_precisions():
+    double, single = chain("matrix", "double"), chain("matrix", "single")
+    assert not np.array_equal(double, single)
+    check = precision_agreement(single, double)
+    assert check["agree"] and check["z"] < 1.0
+    assert check["err"] > 0.0 and check["reference_mean"] == pytest.approx(np.mean(double))
+
+
+def test_shifted_series_fails_the_agreement_test():
+    x = chain("quaternion", "double")
+    check = precision_agreement(x + 0.05, x)
+    assert not check["agree"] and check["z"] > check["n_sigma"]
+    assert check["abs_diff"] == pytest.approx(0.05)
@@ -0,0 +1,42 @@
+"""Merging independent replicas of one (L, beta) case."""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+import run_real_su2_scaling_scan as scan
+from lattice import block_size, bootstrap_mass
+
+
+@pytest.fixture(scope="module")
+def chains(tmp_path_factory):
+    stream_dir = tmp_path_factory.mktemp("streams")
+    return [
+        scan.run_chain(
+            4, 2.3, np.random.default_rng([9, r]), n_therm=4, n_cfg=11, sweeps_between=1,
+            sweep="heatbath", seed=9, replica=r, stream_dir=stream_dir,
+        )
+        for r in range(2)
+    ]
+
+
+def test_bootstrap_blocks_stay_within_replicas(chains):
+    # Repeating each measurement correlates the series, so the bootstrap blocks are longer
+    # than one sample and neither replica divides into whole blocks.
+    chains = [dict(c, ts_ops=np.repeat(c["ts_ops"], 3, axis=0)[:31]) for c in chains]
+    row = scan.merge_chains(4, 4, 2.3, 9, chains, np.random.default_rng(0), 30)
+    block = row["boot_block_size"]
+    assert block == block_size(max(r["timeslice_tau_int"] for r in row["replicas"]), 31)
+    assert block > 1 and 31 % block
+    pooled = np.concatenate([c["ts_ops"][: 31 // block * block] for c in chains])
+    expected = bootstrap_mass(pooled, np.random.default_rng(0), n_boot=30, block=block)
+    assert (row["m_boot_mean"], row["m_boot_std"], row["m_boot_ci68_halfwidth"]) == pytest.approx(expected)
+    assert row["n_cfg"] == 62
+
+
+def test_merged_counters_and_replica_rows(chains):
+    row = scan.merge_chains(4, 4, 2.3, 9, chains, np.random.default_rng(0), 30)
+    assert len(row["replicas"]) == 2
+    assert row["plaquette_mean"] == pytest.approx(np.mean([c["plaquettes"] for c in chains]))
+    assert row["acceptance_rate"] == sum(c["accepted"] for c in chains) / sum(c["proposed"] for c in chains)
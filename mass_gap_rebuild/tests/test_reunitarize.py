@@ -0,0 +1,35 @@
+"""Projection back onto SU(2) and the unitarity-drift measurement."""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+import run_real_su2_scaling_scan as scan
+from lattice import LAYOUTS, as_precision, link_dtype, random_su2, reunitarize, unitarity_violation
+
+# Largest violation left by a projection at each storage precision.
+BOUNDS = {"double": 1e-15, "single": 1e-6}
+
+
+@pytest.mark.parametrize("precision", BOUNDS)
+@pytest.mark.parametrize("layout", LAYOUTS)
+def test_reunitarize_removes_a_perturbation(layout, precision):
+    rng = np.random.default_rng(0)
+    U = random_su2(rng, layout, (500,))
+    U = as_precision(U + 1e-3 * rng.normal(size=U.shape), precision)
+    assert 1e-4 < unitarity_violation(U) < 1e-2
+    assert reunitarize(U) is U
+    assert unitarity_violation(U) < BOUNDS[precision]
+    assert U.dtype == link_dtype(layout, precision)
+
+
+@pytest.mark.parametrize("every, calls", [(0, 0), (1, 8), (3, 2)])
+def test_chain_reunitarizes_on_schedule(tmp_path, every, calls):
+    chain = scan.run_chain(
+        4, 2.3, np.random.default_rng(1), n_therm=4, n_cfg=2, sweeps_between=2, sweep="heatbath",
+        precision="single", reunitarize_every=every, stream_dir=tmp_path,
+    )
+    assert chain["timer"].calls.get("reunitarize", 0) == calls
+    # float32 updates drift by rounding only, whether or not links are projected.
+    assert 0.0 < chain["unitarity_drift_max"] < 1e-5
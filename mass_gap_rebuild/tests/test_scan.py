@@ -0,0 +1,38 @@
+"""The scaling scan's reports do not depend on how its cases are scheduled."""
+
+from __future__ import annotations
+
+import sys
+
+import pytest
+
+import run_real_su2_scaling_scan as scan
+
+OUTPUTS = ("OUT_CSV", "OUT_JSON", "OUT_MD")
+
+
+@pytest.fixture
+def tiny_scan(tmp_path, monkeypatch):
+    """Point the scan at tmp_path and shrink it to short chains at L = 4 and 6."""
+    monkeypatch.setattr(scan, "ROOT", tmp_path)
+    monkeypatch.setattr(scan, "REPORTS", tmp_path / "reports")
+    for name in ("CONFIG_DIR", "CHECKPOINT_DIR", "STREAM_DIR"):
+        monkeypatch.setattr(scan, name, tmp_path / "data" / name.lower())
+    for name in (*OUTPUTS, "OUT_REPLICAS_CSV", "OUT_TIMING_JSON"):
+        monkeypatch.setattr(scan, name, tmp_path / "reports" / getattr(scan, name).name)
+    monkeypatch.setattr(scan, "L_VALUES", (4, 6))
+    monkeypatch.setattr(scan, "chain_budget", lambda L: (3, 4, 1))
+
+    def run(*args: str) -> dict[str, bytes]:
+        argv = ["run_real_su2_scaling_scan.py", "--sweep", "checkerboard", "--checkpoint-every", "0"]
+        monkeypatch.setattr(sys, "argv", argv + list(args))
+        scan.main()
+        return {name: getattr(scan, name).read_bytes() for name in OUTPUTS}
+
+    return run
+
+
+def test_workers_reproduce_the_serial_reports(tiny_scan):
+    serial = tiny_scan()
+    assert tiny_scan("--workers", "2") == serial
+    assert serial["OUT_CSV"].count(b"\n") == 5
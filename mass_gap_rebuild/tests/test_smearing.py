@@ -0,0 +1,64 @@
+"""Spatial APE and stout smearing."""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from lattice import (
+    SMEARINGS,
+    as_layout,
+    gauge_transform,
+    lattice_shape,
+    quaternion_from_su2,
+    random_gauge_field,
+    smear_links,
+    smeared_timeslice_operators,
+    timeslice_operators,
+    unitarity_violation,
+)
+
+# The checks index the matrix components directly.
+pytestmark = pytest.mark.parametrize("thermalized", ["matrix"], indirect=True)
+
+
+@pytest.mark.parametrize("method", SMEARINGS)
+def test_smearing_keeps_su2_and_temporal_links(thermalized, method):
+    U = thermalized
+    S = smear_links(U, method, 0.5, levels=3)
+    assert unitarity_violation(S) < 1e-12
+    np.testing.assert_array_equal(S[..., 0, :, :], U[..., 0, :, :])
+    assert not np.allclose(S[..., 1:, :, :], U[..., 1:, :, :])
+
+
+@pytest.mark.parametrize("method", SMEARINGS)
+def test_smearing_is_gauge_covariant(thermalized, method):
+    U = thermalized
+    G = random_gauge_field(lattice_shape(U), np.random.default_rng(1))
+    smeared_then_rotated = gauge_transform(smear_links(U, method, 0.4, levels=2), G)
+    rotated_then_smeared = smear_links(gauge_transform(U, G), method, 0.4, levels=2)
+    np.testing.assert_allclose(rotated_then_smeared, smeared_then_rotated, atol=1e-12)
+
+
+@pytest.mark.parametrize("method", SMEARINGS)
+def test_smearing_agrees_across_layouts(thermalized, method):
+    U = thermalized
+    S = smear_links(U, method, 0.5, levels=2)
+    Q = smear_links(as_layout(quaternion_from_su2(U), "quaternion"), method, 0.5, levels=2)
+    np.testing.assert_allclose(quaternion_from_su2(S), Q, atol=1e-12)
+
+
+def test_zero_alpha_leaves_the_links_unchanged(thermalized):
+    U = thermalized
+    for method in SMEARINGS:
+        np.testing.assert_allclose(smear_links(U, method, 0.0, levels=2), U, atol=1e-14)
+
+
+def test_smearing_basis_levels_match_direct_smearing(thermalized):
+    U = thermalized
+    basis = smeared_timeslice_operators(U, levels=(0, 1, 3), method="stout", alpha=0.3)
+    for level, ops in zip((0, 1, 3), basis):
+        expected = timeslice_operators(smear_links(U, "stout", 0.3, levels=level))
+        assert ops.keys() == expected.keys()
+        for key in ops:
+            np.testing.assert_allclose(ops[key], expected[key], atol=1e-12)
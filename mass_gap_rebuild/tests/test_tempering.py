@@ -0,0 +1,60 @@
+"""Replica-exchange swaps and the scan's tempering mode."""
+
+from __future__ import annotations
+
+import inspect
+import math
+
+import numpy as np
+import pytest
+
+import run_real_su2_scaling_scan as scan
+from lattice import init_links, plaquette_action, propose_swaps, swap_probability, wilson_action
+
+
+def test_swap_probability_satisfies_detailed_balance():
+    beta_a, beta_b, action_a, action_b = 2.1, 2.3, 120.0, 110.0
+    forward = swap_probability(beta_a, beta_b, action_a, action_b)
+    backward = swap_probability(beta_a, beta_b, action_b, action_a)
+    # Boltzmann weights exp(-beta A) of the two joint states.
+    before = math.exp(-beta_a * action_a - beta_b * action_b)
+    after = math.exp(-beta_a * action_b - beta_b * action_a)
+    assert before * forward == pytest.approx(after * backward)
+    assert max(forward, backward) == 1.0
+    assert swap_probability(2.2, 2.2, action_a, action_b) == 1.0
+
+
+def test_plaquette_action_is_the_wilson_action_at_beta_one():
+    U = init_links((2, 2, 2, 2), "matrix")
+    assert plaquette_action(U) == pytest.approx(0.0, abs=1e-12)
+    rng = np.random.default_rng(0)
+    U = init_links((2, 2, 2, 2), "quaternion")
+    U[...] = rng.normal(size=U.shape)
+    U /= np.linalg.norm(U, axis=-1, keepdims=True)
+    assert wilson_action(U, 2.5) == pytest.approx(2.5 * plaquette_action(U))
+
+
+def test_swaps_alternate_between_even_and_odd_pairs():
+    betas = [1.9, 2.0, 2.1, 2.2, 2.3]
+    actions = [100.0] * 5  # equal actions always swap
+    rng = np.random.default_rng(1)
+    assert propose_swaps(betas, actions, rng, 0) == [(0, True), (2, True)]
+    assert propose_swaps(betas, actions, rng, 1) == [(1, True), (3, True)]
+
+
+def test_tempered_scan_simulates_rungs_without_reporting_them(tmp_path):
+    params = inspect.signature(scan.run_case).parameters.values()
+    defaults = {p.name: p.default for p in params if p.default is not p.empty}
+    for name in ("n_replicas", "checkpoint_dir", "checkpoint_every", "resume"):
+        defaults.pop(name)
+    base = dict(defaults, L=4, n_therm=2, n_cfg=4, sweep="heatbath", stream_dir=tmp_path, n_boot=10)
+    cases = [dict(base, beta=2.3, seed=2), dict(base, beta=2.1, seed=1)]
+    rows = scan.run_tempered(cases, rungs=2)
+    assert [row["beta"] for row in rows] == [2.3, 2.1]
+    pairs = rows[1].pop("swap_pairs")
+    assert [p["beta_lo"] for p in pairs] == pytest.approx([2.1, 2.1 + 0.2 / 3, 2.1 + 0.4 / 3])
+    assert pairs[-1]["beta_hi"] == 2.3 and all(p["proposed"] > 0 for p in pairs)
+    assert rows[1]["swap_acceptance_up"] == pairs[0]["acceptance"]
+    assert rows[0]["swap_pairs"] == [] and rows[0]["swap_acceptance_up"] is None
+    # Only the case betas are measured and streamed.
+    assert {p.name.split("_b")[1].split("_s")[0] for p in tmp_path.iterdir()} == {"2.1", "2.3"}
@@ -0,0 +1,57 @@
+"""Per-phase timers and the Chrome trace-event file."""
+
+from __future__ import annotations
+
+import json
+import os
+import time
+
+import pytest
+
+from lattice import PhaseTimer, write_chrome_trace
+
+
+def test_phase_totals_and_throughput():
+    timer = PhaseTimer()
+    now = time.perf_counter()
+    timer.record("updates", now - 2.0, link_updates=1000)
+    timer.record("updates", now - 1.0, link_updates=500)
+    with timer.phase("measure"):
+        pass
+    other = PhaseTimer()
+    other.record("updates", time.perf_counter() - 1.0, link_updates=500)
+    other.record("checkpoint", time.perf_counter() - 0.5)
+    timer.merge(other)
+    summary = timer.summary()
+    assert list(summary) == ["updates", "measure", "checkpoint"]
+    updates = summary["updates"]
+    assert updates["calls"] == 3 and updates["link_updates"] == 2000
+    assert updates["wall_s"] == pytest.approx(4.0, abs=0.05)
+    assert updates["link_updates_per_s"] == pytest.approx(500.0, rel=0.02)
+    assert summary["measure"]["calls"] == 1 and summary["measure"]["link_updates_per_s"] is None
+    assert summary["checkpoint"]["wall_s"] == pytest.approx(0.5, abs=0.05)
+    assert timer.events == []
+
+
+def test_trace_file_holds_one_event_per_timed_block(tmp_path):
+    timers = [PhaseTimer(trace=True, tid=tid) for tid in (0, 1)]
+    for timer in timers:
+        with timer.phase("thermalization", 64):
+            pass
+        with timer.phase("updates", 64):
+            pass
+    timers[0].merge(timers[1])
+    path = tmp_path / "trace" / "run.json"
+    write_chrome_trace(path, timers[0].events, {os.getpid(): "L4 beta2.3"})
+    doc = json.loads(path.read_text())
+    assert doc["displayTimeUnit"] == "ms"
+    meta = [e for e in doc["traceEvents"] if e["ph"] == "M"]
+    spans = [e for e in doc["traceEvents"] if e["ph"] == "X"]
+    assert meta == [{"name": "process_name", "ph": "M", "pid": os.getpid(), "args": {"name": "L4 beta2.3"}}]
+    assert len(spans) == 4 == len(doc["traceEvents"]) - 1
+    assert [(e["name"], e["tid"]) for e in spans] == [
+        ("thermalization", 0), ("updates", 0), ("thermalization", 1), ("updates", 1)
+    ]
+    for event in spans:
+        assert event["pid"] == os.getpid() and event["dur"] >= 0.0
+    assert spans[1]["ts"] >= spans[0]["ts"] + spans[0]["dur"]
@@ -0,0 +1,52 @@
+"""Adaptive Metropolis proposal width."""
+
+from __future__ import annotations
+
+import math
+
+import numpy as np
+import pytest
+
+import run_real_su2_scaling_scan as scan
+from lattice import EPS_RANGE, make_sweep, tune_eps
+
+
+def test_eps_follows_the_acceptance():
+    assert tune_eps(0.3, 0.8, target=0.5) > 0.3
+    assert tune_eps(0.3, 0.2, target=0.5) < 0.3
+    assert tune_eps(0.3, 0.5, target=0.5) == pytest.approx(0.3)
+    assert tune_eps(0.3, 0.7, target=0.5, gain=2.0) == pytest.approx(0.3 * math.exp(0.4))
+
+
+def test_eps_is_clipped_to_its_range():
+    assert EPS_RANGE == (1e-3, math.pi)
+    assert tune_eps(3.1, 1.0, target=0.0, gain=5.0) == math.pi
+    assert tune_eps(2e-3, 0.0, target=1.0, gain=5.0) == 1e-3
+
+
+def test_eps_is_frozen_after_thermalization(tmp_path, monkeypatch):
+    used = []
+
+    def recording_sweep(*args, **kwargs):
+        sweep = make_sweep(*args, **kwargs)
+
+        def run(U, beta, eps, rng):
+            used.append(eps)
+            return sweep(U, beta, eps, rng)
+
+        return run
+
+    monkeypatch.setattr(scan, "make_sweep", recording_sweep)
+    n_therm = 6
+    chain = scan.run_chain(
+        4, 2.3, np.random.default_rng(0), n_therm=n_therm, n_cfg=3, sweeps_between=2,
+        sweep="checkerboard", eps=0.05, target_acceptance=0.5, stream_dir=tmp_path,
+    )
+    trajectory = chain["eps_trajectory"]
+    assert [entry["sweep"] for entry in trajectory] == list(range(1, n_therm + 1))
+    assert [entry["eps"] for entry in trajectory] == used[:n_therm]
+    # Tiny proposals are almost always accepted, so eps widens during thermalization.
+    assert used[n_therm - 1] > used[0] == 0.05
+    last = trajectory[-1]
+    assert chain["eps"] == tune_eps(last["eps"], last["acceptance"], 0.5)
+    assert used[n_therm:] == [chain["eps"]] * 6